@@ -1,70 +1,84 @@
-import time
-from heapq import heappush, heappop
+from algorithms.engine import INF, SearchResult, OPEN, CLOSED, trace_path, run_visual, unreachable
+from algorithms.frontier import PriorityFrontier
 
-def manhattan_distance(point1, point2):
-    """Calculate Manhattan distance."""
-    x1, y1 = point1
-    x2, y2 = point2
-    return abs(x1 - x2) + abs(y1 - y2)
 
-def reconstruct_path(came_from, current, draw):
-    """Reconstructs the path and returns its length."""
-    path_length = 0
-    while current in came_from:
-        current = came_from[current]
-        current.make_path()
-        draw()
-        path_length += 1
-    return path_length
-
-
-def a_star(draw, grid, start, end):
-    start_time = time.time()
+def a_star_search(grid_map, start, end, observer=None, landmarks=None, stats=None):
+    """
+    - Headless A* over a GridMap, honoring its terrain costs and movement mode.
+    - The heuristic is the Manhattan distance (octile or Chebyshev on an 8-connected map) times the cheapest
+      step cost, which never overestimates.
+    - With `landmarks`, a LandmarkTable built for the map (see algorithms/landmarks.py), the heuristic is the
+      best of that and the landmarks' triangle-inequality bounds (ALT).
+    - `start` and `end` are (row, col) positions; `observer(index, state)` and `stats`, a SearchStats
+      (see algorithms/stats.py), are optional.
+    - Returns a SearchResult with the path, its cost and the number of expanded nodes, not counting the goal.
+    """
+    source = grid_map.index(start)
+    target = grid_map.index(end)
+    if unreachable(grid_map, source, target):
+        return SearchResult(None, None, 0)
+    if landmarks is not None:
+        landmarks.check(grid_map)
+        heuristic = landmarks.heuristic(source, target)
+    cols = grid_map.cols
+    end_row, end_col = end
+    neighbors = grid_map.neighbors
+    costs = grid_map.costs
+    min_cost = grid_map.cost_range()[0]
+    diagonal = grid_map.diagonal
+    # Octile distance is d_row + d_col + (diagonal_cost - 2) * min(d_row, d_col); Chebyshev when diagonals cost 1.
+    saving = grid_map.diagonal_cost - 2
     nodes_traversed = 0
 
-    count = 0
-    open_set = []
-    heappush(open_set, (0, count, start))
+    open_set = PriorityFrontier()
+    if stats is not None:
+        open_set, observer = stats.attach(grid_map, open_set, observer)
+    open_set.push(source, 0)
     came_from = {}
-    g_score = {spot: float("inf") for row in grid for spot in row}
-    g_score[start] = 0
-    f_score = {spot: float("inf") for row in grid for spot in row}
-    f_score[start] = manhattan_distance(start.get_pos(), end.get_pos())
-
-    open_set_hash = {start}
+    g_score = {source: 0}  # Filled in lazily; a missing cell has an infinite g-score
 
     while open_set:
-        current = heappop(open_set)[2]
-        open_set_hash.remove(current)
+        current = open_set.pop()[1]
 
-        if current == end:
-            path_length = reconstruct_path(came_from, end, draw)
-            reconstruct_path(came_from, end, draw)
-            end.make_end()
-            end_time = time.time()
-            print(f"Time taken: {end_time - start_time:.2f} seconds")
-            print(f"Nodes traversed: {nodes_traversed}")
-            print(f"Path length: {path_length}")
-            return (end_time - start_time, nodes_traversed, path_length)
+        if current == target:
+            path = trace_path(grid_map, came_from, source, target, observer)
+            if stats is not None:
+                stats.finish(nodes_traversed)
+            return SearchResult(path, g_score[target], nodes_traversed)
 
-        for neighbor in current.neighbors:
-            temp_g_score = g_score[current] + 1
+        if diagonal:
+            current_row, current_col = divmod(current, cols)
+        for neighbor in neighbors(current):
+            step = 1 if costs is None else costs[neighbor]
+            if diagonal:
+                row, col = divmod(neighbor, cols)
+                if row != current_row and col != current_col:
+                    step *= grid_map.diagonal_cost
+            temp_g_score = g_score[current] + step
 
-            if temp_g_score < g_score[neighbor]:
+            if temp_g_score < g_score.get(neighbor, INF):
                 came_from[neighbor] = current
                 g_score[neighbor] = temp_g_score
-                f_score[neighbor] = temp_g_score + manhattan_distance(neighbor.get_pos(), end.get_pos())
-                if neighbor not in open_set_hash:
-                    count += 1
-                    heappush(open_set, (f_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    neighbor.make_open()
+                row, col = divmod(neighbor, cols)
+                d_row, d_col = abs(row - end_row), abs(col - end_col)
+                if landmarks is not None:
+                    open_set.push(neighbor, temp_g_score + heuristic(neighbor))
+                elif diagonal:
+                    open_set.push(neighbor, temp_g_score + min_cost * (d_row + d_col + saving * min(d_row, d_col)))
+                else:
+                    open_set.push(neighbor, temp_g_score + min_cost * (d_row + d_col))
+                if observer is not None:
+                    observer(neighbor, OPEN)
 
-        draw()
-
-        if current != start:
-            current.make_closed()
+        if observer is not None:
+            observer(current, CLOSED)
         nodes_traversed += 1
 
-    print("There's no path :(")
-    return (None, None, None)
+    if stats is not None:
+        stats.finish(nodes_traversed)
+    return SearchResult(None, None, nodes_traversed)
+
+
+def a_star(draw, grid, start, end):
+    """Visual A*: runs a_star_search on a Grid and animates it through `draw`."""
+    return run_visual(a_star_search, draw, grid, start, end)
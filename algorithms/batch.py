@@ -0,0 +1,88 @@
+"""
+Batch queries: many (start, end) pairs answered on one map, spread over a process pool.
+
+The grid, and its terrain layer if it has one, is copied once into a shared memory block. Each worker attaches to it when it starts and builds
+its own GridMap over the shared bytes, so the tasks only carry the endpoints and never the map itself.
+Results come back in the order of the queries, each with its own timing.
+"""
+import os
+import time
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from algorithms.engine import GridMap
+from algorithms.registry import get_search
+
+BatchResult = namedtuple("BatchResult", ["start", "end", "path", "cost", "expansions", "time_ns"])
+BatchResult.__doc__ = """Outcome of one batch query: its endpoints, the SearchResult fields and the search time."""
+
+# Per-process state set up by _attach; a worker answers queries for one map and one search only.
+_worker = {}
+
+
+def _attach(name, rows, cols, cost_format, algorithm, movement):
+    """
+    - Pool initializer: maps the shared grid into this worker and looks up the search once.
+    - The terrain layer, when `cost_format` is not None, follows the cells in the block as an array of that
+      typecode, starting at the first multiple of 8 bytes.
+    """
+    memory = SharedMemory(name=name)
+    size = rows * cols
+    costs = None
+    if cost_format is not None:
+        offset = _cost_offset(size)
+        costs = memory.buf[offset:offset + size * array(cost_format).itemsize].cast(cost_format)
+    _worker["memory"] = memory
+    _worker["grid_map"] = GridMap(memory.buf[:size], rows, cols, costs, *movement)
+    _worker["search"] = get_search(algorithm)
+
+
+def _cost_offset(size):
+    """Where the terrain layer starts in the shared block: after `size` cells, aligned for any typecode."""
+    return -(-size // 8) * 8
+
+
+def _solve(query, grid_map=None, search=None):
+    if grid_map is None:
+        grid_map, search = _worker["grid_map"], _worker["search"]
+    start, end = query
+    start_time = time.perf_counter_ns()
+    path, cost, expansions = search(grid_map, start, end)
+    return BatchResult(start, end, path, cost, expansions, time.perf_counter_ns() - start_time)
+
+
+def solve_batch(grid_map, queries, algorithm="a_star", workers=None, chunksize=None):
+    """
+    - Answers every (start, end) pair in `queries` on `grid_map` with the named search (see the registry).
+    - Returns a list of BatchResult in the same order as `queries`.
+    - `workers` defaults to the number of CPUs; with one worker the queries run in this process and no
+      pool or shared memory is created.
+    - `chunksize` is how many queries a worker takes per round trip; by default the queries are split
+      into about four chunks per worker.
+    """
+    queries = list(queries)
+    search = get_search(algorithm)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(queries) <= 1:
+        return [_solve(query, grid_map, search) for query in queries]
+    if chunksize is None:
+        chunksize = max(1, len(queries) // (workers * 4))
+
+    size = grid_map.rows * grid_map.cols
+    costs = None if grid_map.costs is None else grid_map.costs.cast("B")
+    cost_format = None if costs is None else grid_map.costs.format
+    offset = _cost_offset(size)
+    memory = SharedMemory(create=True, size=max(size, 1) if costs is None else offset + len(costs))
+    try:
+        memory.buf[:size] = grid_map.cells
+        if costs is not None:
+            memory.buf[offset:offset + len(costs)] = costs
+        movement = (grid_map.diagonal, grid_map.corner_cutting, grid_map.diagonal_cost)
+        initargs = (memory.name, grid_map.rows, grid_map.cols, cost_format, algorithm, movement)
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=initargs) as executor:
+            return list(executor.map(_solve, queries, chunksize=chunksize))
+    finally:
+        memory.close()
+        memory.unlink()
@@ -1,60 +1,56 @@
-import pygame
-from queue import Queue
-import time
-
-def bfs(draw, grid, start, end):
-    start_time = time.time()  # Start timer
-    q = Queue()
-    q.put(start)
+from algorithms.engine import SearchResult, OPEN, CLOSED, trace_path, run_visual, unreachable
+from algorithms.frontier import FifoFrontier
+
+
+def bfs_search(grid_map, start, end, observer=None, stats=None):
+    """
+    - Headless breadth-first search over a GridMap, following its movement mode.
+    - Every step counts as 1, diagonal or not, so the cost is the number of moves; it ignores terrain.
+    - `start` and `end` are (row, col) positions; `observer(index, state)` and `stats`, a SearchStats
+      (see algorithms/stats.py), are optional.
+    - Returns a SearchResult with the path, its cost and the number of expanded nodes, not counting the goal.
+    """
+    source = grid_map.index(start)
+    target = grid_map.index(end)
+    if unreachable(grid_map, source, target):
+        return SearchResult(None, None, 0)
+    neighbors = grid_map.neighbors
+    q = FifoFrontier()
+    if stats is not None:
+        q, observer = stats.attach(grid_map, q, observer)
+    q.push(source)
     came_from = {}
-    visited = {start}
+    visited = {source}
 
     nodes_traversed = 0
 
-    while not q.empty():
-        nodes_traversed += 1  # Increment nodes traversed
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-
-        current = q.get()
-
-        if current == end:
-            path_length = reconstruct_path(came_from, end, draw)
-            end.make_end()
-            end_time = time.time()
-            print(f"Time taken: {end_time - start_time:.2f} seconds")
-            print(f"Nodes traversed: {nodes_traversed}")
-            print(f"Path length: {path_length}")
-            return (end_time - start_time, nodes_traversed, path_length)
+    while q:
+        current = q.pop()
 
+        if current == target:
+            path = trace_path(grid_map, came_from, source, target, observer)
+            if stats is not None:
+                stats.finish(nodes_traversed)
+            return SearchResult(path, len(path) - 1, nodes_traversed)
 
-        for neighbor in current.neighbors:
+        for neighbor in neighbors(current):
             if neighbor not in visited:
                 visited.add(neighbor)
-                q.put(neighbor)
+                q.push(neighbor)
                 came_from[neighbor] = current
-                neighbor.make_open()
+                if observer is not None:
+                    observer(neighbor, OPEN)
 
-        draw()
-
-        if current != start:
-            current.make_closed()
+        if observer is not None:
+            observer(current, CLOSED)
+        nodes_traversed += 1  # Increment nodes traversed
 
-    end_time = time.time()  # End timer
     #When there's no path
-    print(f"Time taken: {end_time - start_time:.2f} seconds")
-    print(f"Nodes traversed: {nodes_traversed}")
-    print("There's no path :(")
-    return (None, None, None)
-
-
-def reconstruct_path(came_from, current, draw):
-    """Reconstructs the path and returns its length."""
-    path_length = 0
-    while current in came_from:
-        current = came_from[current]
-        current.make_path()
-        draw()
-        path_length += 1
-    return path_length
+    if stats is not None:
+        stats.finish(nodes_traversed)
+    return SearchResult(None, None, nodes_traversed)
+
+
+def bfs(draw, grid, start, end):
+    """Visual BFS: runs bfs_search on a Grid and animates it through `draw`."""
+    return run_visual(bfs_search, draw, grid, start, end)
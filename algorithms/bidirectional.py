@@ -0,0 +1,180 @@
+"""
+Bidirectional variants of BFS, Dijkstra and A*.
+
+Each search grows one frontier from `start` and one from `end` and stops as soon as the best meeting point
+is provably optimal, which on open maps explores two small disks instead of one large one. The backward
+frontier is reported to observers as REVERSE_OPEN / REVERSE_CLOSED so both are visible in the visualizer.
+
+All three follow the map's movement mode and ignore terrain: a step costs 1, or the diagonal cost on a
+diagonal of an 8-connected map (BFS counts every step as 1).
+"""
+from algorithms.engine import INF, SearchResult, OPEN, CLOSED, finish_path, run_visual, unreachable
+from algorithms.frontier import PriorityFrontier
+from components.state import REVERSE_OPEN, REVERSE_CLOSED
+
+
+def join_paths(grid_map, parent_forward, parent_backward, source, target, meet, observer=None):
+    """Builds the start-to-end path through `meet` from the two parent maps."""
+    path = [meet]
+    current = meet
+    while current != source:
+        current = parent_forward[current]
+        path.append(current)
+    path.reverse()
+    current = meet
+    while current != target:
+        current = parent_backward[current]
+        path.append(current)
+    return finish_path(grid_map, path, observer)
+
+
+def bidirectional_bfs_search(grid_map, start, end, observer=None):
+    """
+    - Breadth-first search from both ends, one whole layer at a time, always growing the smaller frontier.
+    - The layer in which the two searches first touch contains the shortest meeting point, so the search
+      stops once that layer is finished.
+    """
+    source = grid_map.index(start)
+    target = grid_map.index(end)
+    if source == target:
+        return SearchResult([start], 0, 0)
+    if unreachable(grid_map, source, target):
+        return SearchResult(None, None, 0)
+    neighbors = grid_map.neighbors
+    sides = [
+        ({source: 0}, {}, [source], OPEN, CLOSED),
+        ({target: 0}, {}, [target], REVERSE_OPEN, REVERSE_CLOSED),
+    ]
+    best = INF
+    meet = None
+    nodes_traversed = 0
+
+    while sides[0][2] and sides[1][2]:
+        side = 0 if len(sides[0][2]) <= len(sides[1][2]) else 1
+        distance, parent, layer, open_state, closed_state = sides[side]
+        other_distance = sides[1 - side][0]
+        next_layer = []
+        for current in layer:
+            nodes_traversed += 1
+            for neighbor in neighbors(current):
+                if neighbor not in distance:
+                    distance[neighbor] = distance[current] + 1
+                    parent[neighbor] = current
+                    next_layer.append(neighbor)
+                    if observer is not None:
+                        observer(neighbor, open_state)
+                    if neighbor in other_distance and distance[neighbor] + other_distance[neighbor] < best:
+                        best = distance[neighbor] + other_distance[neighbor]
+                        meet = neighbor
+            if observer is not None:
+                observer(current, closed_state)
+        sides[side] = (distance, parent, next_layer, open_state, closed_state)
+        if meet is not None:
+            path = join_paths(grid_map, sides[0][1], sides[1][1], source, target, meet, observer)
+            return SearchResult(path, best, nodes_traversed)
+
+    return SearchResult(None, None, nodes_traversed)
+
+
+def bidirectional_search(grid_map, start, end, observer=None, potential=None):
+    """
+    - Bidirectional Dijkstra; with a `potential` it becomes bidirectional A*.
+    - The forward search orders cells by g + p(v) and the backward search by g - p(v), where
+      p(v) = (h(v, end) - h(start, v)) / 2 is the consistent average potential. With these keys the search
+      can stop as soon as the two smallest keys add up to the best path found so far.
+    """
+    source = grid_map.index(start)
+    target = grid_map.index(end)
+    if source == target:
+        return SearchResult([start], 0, 0)
+    if unreachable(grid_map, source, target):
+        return SearchResult(None, None, 0)
+    neighbors = grid_map.neighbors
+    cols = grid_map.cols
+    diagonal = grid_map.diagonal
+    if potential is None:
+        potential = lambda index: 0
+    forward = (PriorityFrontier(), {source: 0}, {}, 1, OPEN, CLOSED)
+    backward = (PriorityFrontier(), {target: 0}, {}, -1, REVERSE_OPEN, REVERSE_CLOSED)
+    forward[0].push(source, potential(source))
+    backward[0].push(target, -potential(target))
+    best = INF
+    meet = None
+    nodes_traversed = 0
+
+    while forward[0] and backward[0]:
+        if forward[0].peek() + backward[0].peek() >= best:
+            break
+        this, other = (forward, backward) if len(forward[0]) <= len(backward[0]) else (backward, forward)
+        open_set, g_score, came_from, sign, open_state, closed_state = this
+        other_g_score = other[1]
+
+        current = open_set.pop()[1]
+        nodes_traversed += 1
+        if diagonal:
+            current_row, current_col = divmod(current, cols)
+        for neighbor in neighbors(current):
+            temp_g_score = g_score[current] + 1
+            if diagonal and neighbor // cols != current_row and neighbor % cols != current_col:
+                temp_g_score += grid_map.diagonal_cost - 1
+            if temp_g_score < g_score.get(neighbor, INF):
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                open_set.push(neighbor, temp_g_score + sign * potential(neighbor))
+                if observer is not None:
+                    observer(neighbor, open_state)
+                if neighbor in other_g_score and temp_g_score + other_g_score[neighbor] < best:
+                    best = temp_g_score + other_g_score[neighbor]
+                    meet = neighbor
+        if observer is not None:
+            observer(current, closed_state)
+
+    if meet is None:
+        return SearchResult(None, None, nodes_traversed)
+    path = join_paths(grid_map, forward[2], backward[2], source, target, meet, observer)
+    return SearchResult(path, best, nodes_traversed)
+
+
+def bidirectional_dijkstra_search(grid_map, start, end, observer=None):
+    """Headless bidirectional Dijkstra; returns a SearchResult."""
+    return bidirectional_search(grid_map, start, end, observer)
+
+
+def bidirectional_a_star_search(grid_map, start, end, observer=None):
+    """
+    - Headless bidirectional A* with the Manhattan distance heuristic (octile or Chebyshev on an 8-connected
+      map); returns a SearchResult.
+    """
+    cols = grid_map.cols
+    start_row, start_col = start
+    end_row, end_col = end
+    source, target = grid_map.index(start), grid_map.index(end)
+
+    if grid_map.diagonal:
+        distance = grid_map.distance
+
+        def potential(index):
+            return (distance(index, target) - distance(source, index)) / 2
+    else:
+        def potential(index):
+            row, col = divmod(index, cols)
+            to_end = abs(row - end_row) + abs(col - end_col)
+            from_start = abs(row - start_row) + abs(col - start_col)
+            return (to_end - from_start) / 2
+
+    return bidirectional_search(grid_map, start, end, observer, potential)
+
+
+def bidirectional_bfs(draw, grid, start, end):
+    """Visual bidirectional BFS: runs bidirectional_bfs_search on a Grid and animates it through `draw`."""
+    return run_visual(bidirectional_bfs_search, draw, grid, start, end)
+
+
+def bidirectional_dijkstra(draw, grid, start, end):
+    """Visual bidirectional Dijkstra: runs bidirectional_dijkstra_search on a Grid and animates it through `draw`."""
+    return run_visual(bidirectional_dijkstra_search, draw, grid, start, end)
+
+
+def bidirectional_a_star(draw, grid, start, end):
+    """Visual bidirectional A*: runs bidirectional_a_star_search on a Grid and animates it through `draw`."""
+    return run_visual(bidirectional_a_star_search, draw, grid, start, end)
@@ -0,0 +1,149 @@
+"""
+Cache of search results for one GridMap, kept valid across barrier edits.
+
+A search only reads the cells it expands and their neighbors, so an edit anywhere else can only change its
+result through map-wide values it depends on. Each entry remembers which cells its search expanded; when the
+map reports an edit through GridMap.changed, only the entries that expanded the edited cell or one of its
+neighbors are dropped. The exception is A*, whose heuristic is scaled by the map's cheapest step cost: an edit
+that lowers that cost anywhere drops every A* entry. A hit
+costs O(path length): the stored path is replayed to the observer and returned without searching.
+
+Searches that read cells without reporting them (JPS scans whole lines between jump points) are cached too,
+but any edit drops them. Neither are "no path" answers from the map's component index: the search never ran,
+so there are no explored cells to tie them to, and opening a wall anywhere on the map can join the components.
+"""
+from collections import OrderedDict
+from algorithms.engine import DIAGONAL_STEPS, SearchResult, CLOSED, REVERSE_CLOSED, finish_path, unreachable
+from algorithms.registry import get_search
+
+# Searches whose observer sees every cell they expand, so they can be invalidated cell by cell.
+LOCAL_SEARCHES = {"a_star", "dijkstra", "bfs", "bidirectional_a_star", "bidirectional_dijkstra",
+                  "bidirectional_bfs", "wavefront"}
+
+# Searches whose heuristic depends on the lowest step cost on the whole map (GridMap.cost_range).
+MIN_COST_SEARCHES = {"a_star"}
+
+# Rough per-entry overhead in bytes on top of the explored bitmap and the path.
+ENTRY_OVERHEAD = 200
+PATH_CELL_BYTES = 8
+
+
+class PathCache:
+    """
+    - LRU cache of SearchResults keyed on (algorithm, start, end) for `grid_map`.
+    - Holds at most `max_entries` results and about `max_bytes` of paths and explored-cell bitmaps;
+      the least recently used entries are evicted first.
+    - Registers itself as a listener of `grid_map`. If the map's version moves without the cache being told
+      (cells written directly, without calling changed), everything is dropped on the next lookup.
+    """
+    def __init__(self, grid_map, max_entries=256, max_bytes=16 * 2**20):
+        self.grid_map = grid_map
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (path indices or None, cost, explored bitmap or None, size)
+        self.bytes = 0
+        self.version = grid_map.version
+        self.min_cost = grid_map.cost_range()[0]
+        self.hits = 0
+        self.misses = 0
+        grid_map.listeners.append(self.invalidate)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, algorithm, start, end, observer=None):
+        """
+        - Runs the named search through the cache and returns a SearchResult.
+        - A hit reports only the path to the observer and counts 0 expansions, since nothing was expanded.
+        """
+        if self.version != self.grid_map.version:
+            self.clear()
+        key = (algorithm, start, end)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            path, cost = entry[0], entry[1]
+            if path is None:
+                return SearchResult(None, None, 0)
+            return SearchResult(finish_path(self.grid_map, path, observer), cost, 0)
+
+        self.misses += 1
+        explored = bytearray((self.grid_map.rows * self.grid_map.cols + 7) // 8)
+        track = algorithm in LOCAL_SEARCHES
+
+        def record(index, state):
+            if state == CLOSED or state == REVERSE_CLOSED:
+                explored[index >> 3] |= 1 << (index & 7)
+            if observer is not None:
+                observer(index, state)
+
+        endpoints = (self.grid_map.index(start), self.grid_map.index(end))
+        shortcut = unreachable(self.grid_map, *endpoints)
+        result = get_search(algorithm)(self.grid_map, start, end, record if track else observer)
+        if shortcut:
+            return result
+        path = None if result.path is None else [self.grid_map.index(position) for position in result.path]
+        for index in endpoints:
+            explored[index >> 3] |= 1 << (index & 7)
+        self._store(key, path, result.cost, explored if track else None)
+        return result
+
+    def cached(self, algorithm):
+        """The named search as a plain search function (grid_map, start, end, observer) that uses this cache."""
+        def search(grid_map, start, end, observer=None):
+            if grid_map is not self.grid_map:
+                raise ValueError("This cache belongs to a different GridMap")
+            return self.search(algorithm, start, end, observer)
+        return search
+
+    def invalidate(self, index=None):
+        """Drops the entries an edit of `index` can affect, or every entry when `index` is None."""
+        self.version = self.grid_map.version
+        if index is None:
+            self.clear()
+            return
+        min_cost = self.grid_map.cost_range()[0]
+        if min_cost < self.min_cost:
+            # A cheaper step anywhere weakens the heuristic every cached A* result was proven optimal with.
+            for key in [key for key in self.entries if key[0] in MIN_COST_SEARCHES]:
+                self._drop(key)
+        self.min_cost = min_cost
+        rows, cols = self.grid_map.rows, self.grid_map.cols
+        row, col = divmod(index, cols)
+        # The edited cell matters to a search that expanded it or any of its neighbors. On an 8-connected map
+        # that includes the diagonal ones, which also read the cell for the corner rule.
+        touched = [index]
+        if row > 0:
+            touched.append(index - cols)
+        if row < rows - 1:
+            touched.append(index + cols)
+        if col > 0:
+            touched.append(index - 1)
+        if col < cols - 1:
+            touched.append(index + 1)
+        if self.grid_map.diagonal:
+            touched += [(row + d_row) * cols + col + d_col for d_row, d_col in DIAGONAL_STEPS
+                        if 0 <= row + d_row < rows and 0 <= col + d_col < cols]
+        stale = [key for key, (_, _, explored, _) in self.entries.items()
+                 if explored is None or any(explored[cell >> 3] >> (cell & 7) & 1 for cell in touched)]
+        for key in stale:
+            self._drop(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        self.version = self.grid_map.version
+        self.min_cost = self.grid_map.cost_range()[0]
+
+    def _store(self, key, path, cost, explored):
+        size = ENTRY_OVERHEAD + PATH_CELL_BYTES * len(path or ()) + len(explored or b"")
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (path, cost, explored, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self.entries)))
+
+    def _drop(self, key):
+        self.bytes -= self.entries.pop(key)[3]
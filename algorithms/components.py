@@ -0,0 +1,194 @@
+"""
+Connected-component index for instant "no path" answers.
+
+Without an index, a query between two cells that cannot reach each other floods the whole region around
+`start` before giving up, which is the slowest query a map has. A ComponentIndex labels every free cell with
+its connected component, so such queries are answered in O(1): every search checks the index attached to its
+GridMap before expanding anything.
+
+The labels are built from the runs of free cells in each row, joining runs that touch in neighboring rows with
+union-find. Edits reported through GridMap.changed are applied incrementally:
+
+- A barrier removed joins the components around it: a few unions.
+- A barrier added may split its component. A breadth-first search is started from each free neighbor and
+  they take turns; searches that meet are merged, and the search stops as soon as at most one group can still
+  grow. Only the pieces that were cut off are relabeled, so an edit that splits nothing is repaired after a
+  few steps around the cell.
+
+Diagonal steps never cut a corner past two barriers, so an 8-connected map has the same components as the
+4-connected one and one index serves both movement modes.
+"""
+import re
+from array import array
+from collections import deque
+from algorithms.engine import BARRIER
+
+BLOCKED = -1
+# Runs of free cells in an occupancy snapshot holding 1 for barriers and 0 elsewhere.
+FREE_RUN = re.compile(b"\x00+")
+OCCUPANCY = bytes(1 if state == BARRIER else 0 for state in range(256))
+
+
+class ComponentIndex:
+    """
+    - Component labels for the free cells of a GridMap, kept up to date through the map's listeners.
+    - Attaches itself as `grid_map.components`, where the searches look for it.
+    - `labels[index]` is BLOCKED (-1) for barriers; two free cells are connected when their labels have the
+      same union-find root.
+    - A bulk change (GridMap.changed() without an index) or an edit that was not reported rebuilds the labels
+      on the next query.
+    """
+    def __init__(self, grid_map):
+        self.grid_map = grid_map
+        self.labels = None
+        self.parent = []
+        self.version = None
+        grid_map.components = self
+        grid_map.listeners.append(self.changed)
+
+    def component(self, pos):
+        """Component number of a cell, or None for a barrier. Numbers change as the map is edited."""
+        label = self._labels()[self.grid_map.index(pos)]
+        return None if label == BLOCKED else self._find(label)
+
+    def connected(self, start, end):
+        """Whether a path can exist between two (row, col) positions."""
+        return not self.separated(self.grid_map.index(start), self.grid_map.index(end))
+
+    def separated(self, source, target):
+        """
+        - True when no path can lead from cell index `source` to `target`: the target is a barrier, or both
+          are free and in different components. A search from a barrier is left alone, as without an index.
+        """
+        if source == target:
+            return False
+        labels = self._labels()
+        if labels[target] == BLOCKED:
+            return True
+        if labels[source] == BLOCKED:
+            return False
+        return self._find(labels[source]) != self._find(labels[target])
+
+    def changed(self, index=None):
+        """GridMap listener: applies a barrier edit, ignores a cost edit, and drops everything on a bulk change."""
+        if index is None or self.labels is None or self.version != self.grid_map.version - 1:
+            self.labels = None
+            return
+        self.version = self.grid_map.version
+        blocked = self.grid_map.is_blocked(index)
+        if blocked and self.labels[index] != BLOCKED:
+            self._split(index)
+        elif not blocked and self.labels[index] == BLOCKED:
+            self._join(index)
+
+    def rebuild(self):
+        """Labels every free cell from scratch."""
+        grid_map = self.grid_map
+        rows, cols = grid_map.rows, grid_map.cols
+        occupancy = bytes(grid_map.cells).translate(OCCUPANCY)
+        labels = array("i", [BLOCKED]) * (rows * cols)
+        self.parent = parent = []
+        previous = []
+        for row in range(rows):
+            base = row * cols
+            current = []
+            for match in FREE_RUN.finditer(occupancy, base, base + cols):
+                start, stop = match.span()
+                label = len(parent)
+                parent.append(label)
+                current.append((start - base, stop - base, label))
+                labels[start:stop] = array("i", [label]) * (stop - start)
+            # Join the runs that overlap a run of the row above.
+            i = j = 0
+            while i < len(previous) and j < len(current):
+                above, below = previous[i], current[j]
+                if above[0] < below[1] and below[0] < above[1]:
+                    self._union(above[2], below[2])
+                if above[1] < below[1]:
+                    i += 1
+                else:
+                    j += 1
+            previous = current
+        self.labels = labels
+        self.version = grid_map.version
+
+    def _labels(self):
+        if self.labels is None or self.version != self.grid_map.version:
+            self.rebuild()
+        return self.labels
+
+    def _find(self, label):
+        parent = self.parent
+        root = label
+        while parent[root] != root:
+            root = parent[root]
+        while parent[label] != root:
+            parent[label], label = root, parent[label]
+        return root
+
+    def _union(self, first, second):
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+    def _new_label(self):
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def _join(self, index):
+        labels = self.labels
+        label = labels[index] = self._new_label()
+        for neighbor in self.grid_map.orthogonal_neighbors(index):
+            self._union(label, labels[neighbor])
+
+    def _split(self, index):
+        labels = self.labels
+        labels[index] = BLOCKED
+        seeds = self.grid_map.orthogonal_neighbors(index)
+        if len(seeds) < 2:
+            return
+        neighbors = self.grid_map.orthogonal_neighbors
+        owner = {seed: search for search, seed in enumerate(seeds)}
+        group = list(range(len(seeds)))  # union-find over the searches that have met
+        queues = [deque([seed]) for seed in seeds]
+        visited = [[seed] for seed in seeds]
+
+        def find(search):
+            while group[search] != search:
+                search = group[search]
+            return search
+
+        while True:
+            growing = {find(search) for search, queue in enumerate(queues) if queue}
+            if len(growing) <= 1:
+                break
+            for search, queue in enumerate(queues):
+                if not queue:
+                    continue
+                for neighbor in neighbors(queue.popleft()):
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = search
+                        visited[search].append(neighbor)
+                        queue.append(neighbor)
+                    elif find(other) != find(search):
+                        group[find(other)] = find(search)
+
+        groups = {}
+        for search in range(len(seeds)):
+            groups.setdefault(find(search), []).append(search)
+        if len(groups) == 1:
+            return
+        # Every group that stopped growing is a whole piece of its own. The one still growing, or the largest
+        # when all stopped, keeps the old label.
+        if growing:
+            keep = next(iter(growing))
+        else:
+            keep = max(groups, key=lambda root: sum(len(visited[search]) for search in groups[root]))
+        for root, searches in groups.items():
+            if root == keep:
+                continue
+            label = self._new_label()
+            for search in searches:
+                for cell in visited[search]:
+                    labels[cell] = label
@@ -0,0 +1,186 @@
+"""
+Incremental replanning with D* Lite.
+
+D* Lite searches backwards from `end` and keeps its search state between queries: for every cell it has
+touched, g is the distance to `end` it last settled on and rhs the distance implied by its neighbors' g.
+When barriers change, only the cells next to the edit get a new rhs, and the search repairs the cells whose
+g and rhs disagree instead of starting over. Moving the start is cheap as well: the priorities are shifted by
+the distance moved (the `km` offset) rather than recomputed.
+
+A planner listens to its GridMap, so edits made through Grid.set_state (make_barrier, reset) are queued and
+repaired on the next query.
+"""
+from collections import OrderedDict
+from algorithms.engine import INF, SearchResult, OPEN, CLOSED, finish_path, run_visual, unreachable
+from algorithms.frontier import PriorityFrontier
+
+
+class DStarLite:
+    """
+    - D* Lite planner towards a fixed `end` over a GridMap, 4-connected with unit step costs; the map's
+      movement mode and terrain are ignored.
+    - `plan(start)` returns a SearchResult; its expansion count only covers the work done by that call.
+    """
+    def __init__(self, grid_map, end):
+        self.grid_map = grid_map
+        self.goal = grid_map.index(end)
+        self.end = end
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.queue = PriorityFrontier()
+        self.km = 0
+        self.last = None
+        self.pending = set()
+        self.version = grid_map.version
+        grid_map.listeners.append(self.changed)
+
+    def changed(self, index=None):
+        """GridMap listener: remembers the edited cell so the next plan can repair around it."""
+        if index is None:
+            self.reset()
+        else:
+            self.pending.add(index)
+        self.version = self.grid_map.version
+
+    def reset(self):
+        """Forgets all search state, as after a bulk edit."""
+        self.g.clear()
+        self.rhs = {self.goal: 0}
+        self.queue = PriorityFrontier()
+        self.km = 0
+        self.last = None
+        self.pending.clear()
+
+    def plan(self, start, observer=None):
+        """Brings the search up to date for `start` and returns the current shortest path from it."""
+        grid_map = self.grid_map
+        if self.version != grid_map.version:
+            self.reset()
+            self.version = grid_map.version
+        source = grid_map.index(start)
+        if self.last is None:
+            self.last = source
+            self.queue.push(self.goal, self._key(self.goal, source))
+        elif source != self.last:
+            self.km += self._heuristic(self.last, source)
+            self.last = source
+
+        for index in self.pending:
+            for cell in [index] + self._adjacent(index):
+                self._update_rhs(cell)
+                self._update_vertex(cell, source, observer)
+        self.pending.clear()
+
+        expansions = self._compute(source, observer)
+        if self.g.get(source, INF) == INF:
+            return SearchResult(None, None, expansions)
+        path = [source]
+        current = source
+        while current != self.goal:
+            current = min(self._successors(current), key=lambda cell: (self.g.get(cell, INF), cell))
+            path.append(current)
+        return SearchResult(finish_path(grid_map, path, observer), self.g[source], expansions)
+
+    def _compute(self, source, observer):
+        queue, g, rhs = self.queue, self.g, self.rhs
+        expansions = 0
+        while queue and (queue.peek() < self._key(source, source)
+                         or rhs.get(source, INF) != g.get(source, INF)):
+            old_key, current = queue.pop()
+            new_key = self._key(current, source)
+            if old_key < new_key:
+                queue.push(current, new_key)
+                continue
+            expansions += 1
+            if g.get(current, INF) > rhs.get(current, INF):
+                g[current] = rhs[current]
+                for neighbor in self._adjacent(current):
+                    self._update_rhs(neighbor)
+                    self._update_vertex(neighbor, source, observer)
+            else:
+                g[current] = INF
+                for cell in [current] + self._adjacent(current):
+                    self._update_rhs(cell)
+                    self._update_vertex(cell, source, observer)
+            if observer is not None:
+                observer(current, CLOSED)
+        return expansions
+
+    def _key(self, index, source):
+        best = min(self.g.get(index, INF), self.rhs.get(index, INF))
+        return (best + self._heuristic(source, index) + self.km, best)
+
+    def _heuristic(self, first, second):
+        first_row, first_col = divmod(first, self.grid_map.cols)
+        second_row, second_col = divmod(second, self.grid_map.cols)
+        return abs(first_row - second_row) + abs(first_col - second_col)
+
+    def _adjacent(self, index):
+        """All in-bounds 4-neighbors of a cell, blocked or not."""
+        rows, cols = self.grid_map.rows, self.grid_map.cols
+        row, col = divmod(index, cols)
+        result = []
+        if row < rows - 1:
+            result.append(index + cols)
+        if row > 0:
+            result.append(index - cols)
+        if col < cols - 1:
+            result.append(index + 1)
+        if col > 0:
+            result.append(index - 1)
+        return result
+
+    def _successors(self, index):
+        """Neighbors reachable in one step; none when the cell itself is blocked."""
+        if self.grid_map.is_blocked(index):
+            return []
+        return self.grid_map.orthogonal_neighbors(index)
+
+    def _update_rhs(self, index):
+        if index == self.goal:
+            return
+        g = self.g
+        best = min((g.get(neighbor, INF) for neighbor in self._successors(index)), default=INF)
+        if best + 1 < INF:
+            self.rhs[index] = best + 1
+        else:
+            self.rhs.pop(index, None)
+
+    def _update_vertex(self, index, source, observer):
+        if self.g.get(index, INF) != self.rhs.get(index, INF):
+            self.queue.update(index, self._key(index, source))
+            if observer is not None:
+                observer(index, OPEN)
+        else:
+            self.queue.remove(index)
+
+
+# Planners are kept between queries so that edits can be repaired instead of searched again.
+_planners = OrderedDict()
+MAX_PLANNERS = 4
+
+
+def planner_for(grid_map, end):
+    """Returns the DStarLite planner kept for `grid_map` and `end`, creating it on first use."""
+    key = (id(grid_map), end)
+    planner = _planners.get(key)
+    if planner is None or planner.grid_map is not grid_map:
+        planner = DStarLite(grid_map, end)
+        _planners[key] = planner
+        while len(_planners) > MAX_PLANNERS:
+            _, evicted = _planners.popitem(last=False)
+            evicted.grid_map.listeners.remove(evicted.changed)
+    _planners.move_to_end(key)
+    return planner
+
+
+def dstar_lite_search(grid_map, start, end, observer=None):
+    """Headless D* Lite; repeated queries towards the same `end` reuse and repair the previous search."""
+    if unreachable(grid_map, grid_map.index(start), grid_map.index(end)):
+        return SearchResult(None, None, 0)
+    return planner_for(grid_map, end).plan(start, observer)
+
+
+def dstar_lite(draw, grid, start, end):
+    """Visual D* Lite: runs dstar_lite_search on a Grid and animates it through `draw`."""
+    return run_visual(dstar_lite_search, draw, grid, start, end)
@@ -0,0 +1,239 @@
+"""
+Headless search engine shared by A*, Dijkstra and BFS.
+
+The solvers work on a compact row-major occupancy buffer and never touch pygame.
+The visualizer is just an optional observer that is told when a cell is opened,
+closed or put on the final path.
+"""
+import time
+from collections import namedtuple
+from math import sqrt
+from components.state import EMPTY, BARRIER, OPEN, CLOSED, PATH, REVERSE_CLOSED
+
+INF = float("inf")
+SQRT2 = sqrt(2)
+
+DIAGONAL_STEPS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+SearchResult = namedtuple("SearchResult", ["path", "cost", "expansions"])
+SearchResult.__doc__ = """Outcome of a headless search: cell path (or None), its cost and the expansion count."""
+
+
+class GridMap:
+    """
+    - Row-major occupancy grid used by the headless solvers.
+    - `cells` can be any byte buffer (bytearray, bytes, array('B'), a C-contiguous NumPy uint8 array).
+    - A cell is blocked when its value is BARRIER; every other value is walkable.
+    - `costs` is an optional terrain layer of the same size (array('B'), array('H'), bytearray, ...): the cost
+      of stepping into each cell. Without it every step costs 1. Only dijkstra and a_star (and the
+      cache around them) read it; the other searches treat every step as 1.
+    - Movement is 4-connected by default. With `diagonal` it is 8-connected: a diagonal step costs
+      `diagonal_cost` (sqrt(2), or 1 for Chebyshev moves) times the cost of the cell it enters, and it may not
+      cut a corner, i.e. both orthogonal cells beside it must be free. With `corner_cutting` one free side is
+      enough; squeezing between two diagonal barriers is never allowed.
+    - `neighbors` follows the movement mode; `orthogonal_neighbors` is always 4-connected, for the searches
+      that only support 4-connected maps.
+    - `version` counts walkability and cost edits reported through `changed`; `listeners` are told about each one.
+    - `components` is the ComponentIndex attached to the map (see algorithms/components.py), or None. With
+      one, the searches answer queries between disconnected cells without expanding anything.
+    """
+    def __init__(self, cells, rows, cols, costs=None, diagonal=False, corner_cutting=False, diagonal_cost=SQRT2):
+        self.cells = memoryview(cells).cast("B")
+        self.rows = rows
+        self.cols = cols
+        if len(self.cells) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} cells, got {len(self.cells)}")
+        self.costs = None if costs is None else self._cost_view(costs)
+        self.version = 0
+        self.listeners = []
+        self.components = None
+        self._cost_range = None
+        self._range_layer = None
+        self._set_movement(diagonal, corner_cutting, diagonal_cost)
+
+    def index(self, pos):
+        row, col = pos
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"Cell {pos} is outside the {self.rows}x{self.cols} grid")
+        return row * self.cols + col
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+    def is_blocked(self, index):
+        return self.cells[index] == BARRIER
+
+    def set_costs(self, costs):
+        """Replaces the terrain layer (None for unit costs) and reports it as a bulk change."""
+        self.costs = None if costs is None else self._cost_view(costs)
+        self.changed()
+
+    def cost_range(self):
+        """
+        - (lowest, highest) step cost on the map; (1, 1) without a terrain layer.
+        - The layer is scanned once and the range then kept up to date by changed(), so queries pay nothing
+          for it. A single-cell edit only widens the range: it can be looser than the exact one, never tighter,
+          which is all its users need (a lower bound for heuristics, an upper bound for bucket counts).
+        """
+        costs = self.costs
+        if costs is None:
+            return 1, 1
+        if self._cost_range is None or self._range_layer is not costs:
+            self._cost_range = min(costs, default=1), max(costs, default=1)
+            self._range_layer = costs
+        return self._cost_range
+
+    def set_movement(self, diagonal, corner_cutting=False, diagonal_cost=SQRT2):
+        """Switches between 4- and 8-connected movement and reports it as a bulk change."""
+        self._set_movement(diagonal, corner_cutting, diagonal_cost)
+        self.changed()
+
+    def _set_movement(self, diagonal, corner_cutting, diagonal_cost):
+        self.diagonal = diagonal
+        self.corner_cutting = corner_cutting
+        self.diagonal_cost = diagonal_cost
+        # Bound once here so the searches' hot loops pay nothing for the mode check.
+        self.neighbors = self.all_neighbors if diagonal else self.orthogonal_neighbors
+
+    def distance(self, first, second):
+        """
+        - Cheapest possible unit-cost distance between two cell indices under the movement mode:
+          Manhattan when 4-connected, octile with sqrt(2) diagonals, Chebyshev when diagonals cost 1.
+        """
+        first_row, first_col = divmod(first, self.cols)
+        second_row, second_col = divmod(second, self.cols)
+        d_row, d_col = abs(first_row - second_row), abs(first_col - second_col)
+        if self.diagonal:
+            return d_row + d_col + (self.diagonal_cost - 2) * min(d_row, d_col)
+        return d_row + d_col
+
+    def step_cost(self, index, neighbor):
+        """Cost of moving from `index` to the adjacent cell `neighbor`: its terrain cost, scaled on a diagonal."""
+        cost = 1 if self.costs is None else self.costs[neighbor]
+        cols = self.cols
+        if self.diagonal and index // cols != neighbor // cols and index % cols != neighbor % cols:
+            return cost * self.diagonal_cost
+        return cost
+
+    def _cost_view(self, costs):
+        costs = memoryview(costs)
+        if len(costs) != self.rows * self.cols:
+            raise ValueError(f"Expected {self.rows * self.cols} costs, got {len(costs)}")
+        return costs
+
+    def changed(self, index=None):
+        """
+        - Call after a cell became blocked or walkable or its cost changed, or with no index after a bulk edit.
+        - Bumps `version` and calls every `listener(index)`, so caches can drop what the edit affects.
+        """
+        self.version += 1
+        if index is None:
+            self._cost_range = None
+        elif self._cost_range is not None and self._range_layer is self.costs:
+            cost = self.costs[index]
+            low, high = self._cost_range
+            if not low <= cost <= high:
+                self._cost_range = min(low, cost), max(high, cost)
+        for listener in self.listeners:
+            listener(index)
+
+    def orthogonal_neighbors(self, index):
+        """Walkable 4-connected neighbors of a cell, in DOWN, UP, RIGHT, LEFT order."""
+        cells = self.cells
+        cols = self.cols
+        row, col = divmod(index, cols)
+        result = []
+        if row < self.rows - 1 and cells[index + cols] != BARRIER:
+            result.append(index + cols)
+        if row > 0 and cells[index - cols] != BARRIER:
+            result.append(index - cols)
+        if col < cols - 1 and cells[index + 1] != BARRIER:
+            result.append(index + 1)
+        if col > 0 and cells[index - 1] != BARRIER:
+            result.append(index - 1)
+        return result
+
+    def all_neighbors(self, index):
+        """
+        - Walkable 8-connected neighbors: the orthogonal ones, then DOWN-RIGHT, DOWN-LEFT, UP-RIGHT, UP-LEFT
+          for the diagonal steps the corner rule allows.
+        """
+        result = self.orthogonal_neighbors(index)
+        cells = self.cells
+        cols = self.cols
+        row, col = divmod(index, cols)
+        for d_row, d_col in DIAGONAL_STEPS:
+            next_row, next_col = row + d_row, col + d_col
+            if not (0 <= next_row < self.rows and 0 <= next_col < cols):
+                continue
+            if cells[index + d_row * cols + d_col] == BARRIER:
+                continue
+            beside_row = cells[index + d_row * cols] != BARRIER
+            beside_col = cells[index + d_col] != BARRIER
+            if (beside_row and beside_col) or (self.corner_cutting and (beside_row or beside_col)):
+                result.append(index + d_row * cols + d_col)
+        return result
+
+
+def unreachable(grid_map, source, target):
+    """True when the map's component index proves there is no path from `source` to `target` (cell indices)."""
+    return grid_map.components is not None and grid_map.components.separated(source, target)
+
+
+def trace_path(grid_map, came_from, source, target, observer=None):
+    """Walks `came_from` back from target and returns the path as (row, col) positions, start first."""
+    path = [target]
+    current = target
+    while current != source:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return finish_path(grid_map, path, observer)
+
+
+def finish_path(grid_map, path, observer=None):
+    """Reports the interior cells of an index path to the observer and converts it to (row, col) positions."""
+    if observer is not None:
+        for index in path[1:-1]:
+            observer(index, PATH)
+    return [grid_map.position(index) for index in path]
+
+
+def run_visual(search, draw, grid, start, end, stats=None):
+    """
+    - Runs a headless search on a Grid's state buffer, with the visualizer as an observer.
+    - Cells are recolored with the states the search reports and `draw` is called once per expansion
+      and once per path cell, like the original algorithms did.
+    - `stats`, a SearchStats, is handed to the search (which must accept it) and printed after it.
+    - Returns (time taken, nodes traversed, path length), or (None, None, None) when there is no path.
+    """
+    set_state = grid.set_state
+    endpoints = {start.index, end.index}
+
+    def observer(index, state):
+        if state == CLOSED or state == REVERSE_CLOSED:
+            draw()
+        if index not in endpoints:
+            set_state(index, state)
+        if state == PATH:
+            draw()
+
+    start_time = time.perf_counter()
+    if stats is None:
+        path, cost, nodes_traversed = search(grid.grid_map, start.get_pos(), end.get_pos(), observer)
+    else:
+        path, cost, nodes_traversed = search(grid.grid_map, start.get_pos(), end.get_pos(), observer, stats=stats)
+    end_time = time.perf_counter()
+    print(f"Time taken: {end_time - start_time:.2f} seconds")
+    print(f"Nodes traversed: {nodes_traversed}")
+    if stats is not None:
+        print(f"Stats: {stats.summary()}")
+    if path is None:
+        print("There's no path :(")
+        return (None, None, None)
+    end.make_end()
+    path_length = len(path) - 1
+    print(f"Path length: {path_length}")
+    if cost != path_length:
+        print(f"Path cost: {cost:.2f}" if isinstance(cost, float) else f"Path cost: {cost}")
+    return (end_time - start_time, nodes_traversed, path_length)
@@ -0,0 +1,151 @@
+"""
+Frontier containers shared by the search algorithms.
+
+The searches are single-threaded, so they use plain heapq and collections.deque instead of the
+thread-safe queue.PriorityQueue and queue.Queue, which lock on every put and get.
+"""
+from collections import deque
+from heapq import heappush, heappop
+
+
+class PriorityFrontier:
+    """
+    - Min-priority frontier on top of heapq, with ties broken by insertion order.
+    - Decrease-key is done lazily: pushing an item again with a lower priority supersedes the older entry,
+      and superseded entries are dropped when they reach the top of the heap.
+    """
+    def __init__(self):
+        self.heap = []
+        self.best = {}
+        self.count = 0
+
+    def __len__(self):
+        return len(self.best)
+
+    def __bool__(self):
+        return bool(self.best)
+
+    def __contains__(self, item):
+        return item in self.best
+
+    def push(self, item, priority):
+        """Adds `item`, or lowers its priority if it is already queued. Returns False if nothing changed."""
+        best = self.best.get(item)
+        if best is not None and best <= priority:
+            return False
+        self.best[item] = priority
+        self.count += 1
+        heappush(self.heap, (priority, self.count, item))
+        return True
+
+    def update(self, item, priority):
+        """Sets the priority of `item`, raising it if need be, and queues it if it is not queued."""
+        self.best.pop(item, None)
+        self.push(item, priority)
+
+    def remove(self, item):
+        """Drops `item` if it is queued; its heap entry is discarded when it reaches the top."""
+        self.best.pop(item, None)
+
+    def entries(self):
+        """Entries held, counting the superseded ones that have not been dropped yet."""
+        return len(self.heap)
+
+    def peek(self):
+        """Returns the lowest priority without removing its item."""
+        heap, best = self.heap, self.best
+        while best.get(heap[0][2]) != heap[0][0]:
+            heappop(heap)
+        return heap[0][0]
+
+    def pop(self):
+        """Removes and returns the (priority, item) pair with the lowest priority."""
+        heap, best = self.heap, self.best
+        while True:
+            priority, _, item = heappop(heap)
+            if best.get(item) == priority:
+                del best[item]
+                return priority, item
+
+
+class BucketFrontier:
+    """
+    - Min-priority frontier for small non-negative integer priorities (Dial's algorithm).
+    - Items sit in a ring of `max_step + 1` buckets indexed by priority, so push and pop are O(1) apart from
+      stepping over empty buckets. This needs the priorities to be monotone, as in Dijkstra: nothing may be
+      pushed below the last popped priority or more than `max_step` above it.
+    - Decrease-key is lazy, as in PriorityFrontier.
+    """
+    def __init__(self, max_step):
+        self.size = max_step + 1
+        self.buckets = [[] for _ in range(self.size)]
+        self.best = {}
+        self.current = 0
+
+    def __len__(self):
+        return len(self.best)
+
+    def __bool__(self):
+        return bool(self.best)
+
+    def __contains__(self, item):
+        return item in self.best
+
+    def push(self, item, priority):
+        """Adds `item`, or lowers its priority if it is already queued. Returns False if nothing changed."""
+        best = self.best.get(item)
+        if best is not None and best <= priority:
+            return False
+        self.best[item] = priority
+        self.buckets[priority % self.size].append(item)
+        return True
+
+    def entries(self):
+        """Entries held, counting the superseded ones that have not been dropped yet."""
+        return sum(map(len, self.buckets))
+
+    def peek(self):
+        """Returns the lowest priority without removing its item."""
+        buckets, best, current = self.buckets, self.best, self.current
+        while True:
+            bucket = buckets[current % self.size]
+            while bucket:
+                if best.get(bucket[-1]) == current:
+                    self.current = current
+                    return current
+                bucket.pop()
+            current += 1
+
+    def pop(self):
+        """Removes and returns the (priority, item) pair with the lowest priority."""
+        buckets, best, current = self.buckets, self.best, self.current
+        while True:
+            bucket = buckets[current % self.size]
+            while bucket:
+                item = bucket.pop()
+                if best.get(item) == current:
+                    del best[item]
+                    self.current = current
+                    return current, item
+            current += 1
+
+
+class FifoFrontier:
+    """First-in first-out frontier backed by collections.deque."""
+    def __init__(self):
+        self.queue = deque()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __bool__(self):
+        return bool(self.queue)
+
+    def entries(self):
+        return len(self.queue)
+
+    def push(self, item):
+        self.queue.append(item)
+
+    def pop(self):
+        return self.queue.popleft()
@@ -0,0 +1,350 @@
+"""
+Hierarchical pathfinding (HPA*) for large grids.
+
+The map is cut into square clusters. Wherever two neighboring clusters share a run of free cells along their
+border, the run gets one or two entrances: pairs of facing cells, one on each side, joined by a step of cost 1.
+Inside every cluster the distances between its entrance cells are precomputed with a BFS that stays within
+the cluster. Together these form a small abstract graph.
+
+A query connects `start` and `end` to the entrances of their own clusters, runs A* on the abstract graph
+and then refines each abstract edge back into cells with a search confined to one cluster. The paths are
+near-optimal (they may bend to pass through entrances) and a long query expands a small fraction of the
+cells flat A* does.
+
+A barrier edit reported through GridMap.changed only rebuilds the entrances on the edited cluster's borders
+and the distances inside that cluster, plus those of a neighbor whose shared border changed.
+
+The hierarchy is 4-connected with unit steps, whatever the map's movement mode and terrain.
+"""
+from collections import OrderedDict
+from algorithms.engine import INF, BARRIER, SearchResult, OPEN, CLOSED, finish_path, run_visual, unreachable
+from algorithms.frontier import PriorityFrontier
+
+CLUSTER_SIZE = 16
+# A free run along a border at least this long gets an entrance at each end instead of one in the middle.
+WIDE_ENTRANCE = 6
+
+
+class HierarchicalMap:
+    """
+    - Cluster and entrance graph over a GridMap, kept up to date through the map's listeners.
+    - `entrances[border]` lists the (cell, facing cell) pairs on a border between two clusters, and
+      `intra[cluster][cell]` maps each entrance cell of a cluster to {other entrance cell: distance}.
+    """
+    def __init__(self, grid_map, cluster_size=CLUSTER_SIZE):
+        self.grid_map = grid_map
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-grid_map.rows // cluster_size)
+        self.cluster_cols = -(-grid_map.cols // cluster_size)
+        self.entrances = {}
+        self.intra = {}
+        self.links = {}  # entrance cell -> set of facing cells across a border
+        self.version = grid_map.version
+        self.rebuild()
+        grid_map.listeners.append(self.changed)
+
+    def cluster_of(self, index):
+        row, col = divmod(index, self.grid_map.cols)
+        return row // self.cluster_size, col // self.cluster_size
+
+    def bounds(self, cluster):
+        """(first row, end row, first col, end col) of a cluster; the ends are exclusive."""
+        size = self.cluster_size
+        cluster_row, cluster_col = cluster
+        return (cluster_row * size, min((cluster_row + 1) * size, self.grid_map.rows),
+                cluster_col * size, min((cluster_col + 1) * size, self.grid_map.cols))
+
+    def rebuild(self):
+        """Recomputes every border and every cluster."""
+        self.entrances.clear()
+        self.intra.clear()
+        self.links.clear()
+        for cluster_row in range(self.cluster_rows):
+            for cluster_col in range(self.cluster_cols):
+                if cluster_row + 1 < self.cluster_rows:
+                    self._build_border(((cluster_row, cluster_col), (cluster_row + 1, cluster_col)))
+                if cluster_col + 1 < self.cluster_cols:
+                    self._build_border(((cluster_row, cluster_col), (cluster_row, cluster_col + 1)))
+        for cluster_row in range(self.cluster_rows):
+            for cluster_col in range(self.cluster_cols):
+                self._build_cluster((cluster_row, cluster_col))
+        self.version = self.grid_map.version
+
+    def changed(self, index=None):
+        """GridMap listener: rebuilds only what an edit of `index` can affect."""
+        if index is None:
+            self.rebuild()
+            return
+        cluster = self.cluster_of(index)
+        cluster_row, cluster_col = cluster
+        rebuild = {cluster}
+        for other in ((cluster_row - 1, cluster_col), (cluster_row + 1, cluster_col),
+                      (cluster_row, cluster_col - 1), (cluster_row, cluster_col + 1)):
+            if 0 <= other[0] < self.cluster_rows and 0 <= other[1] < self.cluster_cols:
+                border = (min(cluster, other), max(cluster, other))
+                before = self.entrances.get(border)
+                self._unlink(border)
+                self._build_border(border)
+                if self.entrances.get(border) != before:
+                    rebuild.add(other)
+        for each in rebuild:
+            self._build_cluster(each)
+        self.version = self.grid_map.version
+
+    def _build_border(self, border):
+        """Finds the entrances on the border between two neighboring clusters (lower cluster first)."""
+        first, second = border
+        first_row, first_end_row, first_col, first_end_col = self.bounds(first)
+        cols = self.grid_map.cols
+        cells = self.grid_map.cells
+        if first[0] != second[0]:
+            # Horizontal border: the last row of `first` faces the first row of `second`.
+            pairs = [((first_end_row - 1) * cols + col, first_end_row * cols + col)
+                     for col in range(first_col, first_end_col)]
+        else:
+            pairs = [(row * cols + first_end_col - 1, row * cols + first_end_col)
+                     for row in range(first_row, first_end_row)]
+
+        entrances = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and cells[pair[0]] != BARRIER and cells[pair[1]] != BARRIER:
+                run.append(pair)
+                continue
+            if run:
+                if len(run) >= WIDE_ENTRANCE:
+                    entrances += [run[0], run[-1]]
+                else:
+                    entrances.append(run[len(run) // 2])
+                run = []
+        self.entrances[border] = entrances
+        for inside, outside in entrances:
+            self.links.setdefault(inside, set()).add(outside)
+            self.links.setdefault(outside, set()).add(inside)
+
+    def _unlink(self, border):
+        for inside, outside in self.entrances.pop(border, ()):
+            for cell, other in ((inside, outside), (outside, inside)):
+                facing = self.links.get(cell)
+                if facing is not None:
+                    facing.discard(other)
+                    if not facing:
+                        del self.links[cell]
+
+    def _cluster_entrances(self, cluster):
+        """Entrance cells lying inside `cluster`."""
+        cluster_row, cluster_col = cluster
+        cells = set()
+        for other in ((cluster_row - 1, cluster_col), (cluster_row + 1, cluster_col),
+                      (cluster_row, cluster_col - 1), (cluster_row, cluster_col + 1)):
+            for pair in self.entrances.get((min(cluster, other), max(cluster, other)), ()):
+                cells.update(cell for cell in pair if self.cluster_of(cell) == cluster)
+        return cells
+
+    def _build_cluster(self, cluster):
+        """Recomputes the distances between the entrance cells of one cluster."""
+        entrances = self._cluster_entrances(cluster)
+        adjacency = cluster_adjacency(self.grid_map, self.bounds(cluster))
+        distances = {cell: {} for cell in entrances}
+        remaining = set(entrances)
+        for cell in entrances:
+            remaining.discard(cell)
+            if not remaining:
+                break
+            reached = local_distances(adjacency, cell, remaining)[0]
+            for other, distance in reached.items():
+                distances[cell][other] = distance
+                distances[other][cell] = distance
+        self.intra[cluster] = distances
+
+    def search(self, start, end, observer=None):
+        """
+        - Abstract A* between `start` and `end`, refined into a cell path; returns a SearchResult.
+        - The expansion count covers the abstract nodes and every cell expanded while connecting the
+          endpoints and refining the path.
+        """
+        grid_map = self.grid_map
+        if self.version != grid_map.version:
+            self.rebuild()
+        source = grid_map.index(start)
+        target = grid_map.index(end)
+        if source == target:
+            return SearchResult([start], 0, 0)
+        if unreachable(grid_map, source, target):
+            return SearchResult(None, None, 0)
+        source_cluster = self.cluster_of(source)
+        target_cluster = self.cluster_of(target)
+
+        # Connect the endpoints to the entrances of their clusters (and to each other if they share one).
+        source_adjacency = cluster_adjacency(grid_map, self.bounds(source_cluster))
+        start_edges, expansions = local_distances(source_adjacency, source,
+                                                  self._cluster_entrances(source_cluster) | {target})
+        if source_cluster != target_cluster:
+            start_edges.pop(target, None)
+        target_adjacency = cluster_adjacency(grid_map, self.bounds(target_cluster))
+        end_edges, end_expansions = local_distances(target_adjacency, target, self._cluster_entrances(target_cluster))
+        expansions += end_expansions
+
+        cols = grid_map.cols
+        end_row, end_col = end
+
+        def edges(node):
+            if node == source:
+                result = list(start_edges.items())
+            else:
+                result = list(self.intra[self.cluster_of(node)].get(node, {}).items())
+                if node in end_edges:
+                    result.append((target, end_edges[node]))
+            result += [(other, 1) for other in self.links.get(node, ())]
+            return result
+
+        open_set = PriorityFrontier()
+        open_set.push(source, 0)
+        came_from = {}
+        g_score = {source: 0}
+        while open_set:
+            current = open_set.pop()[1]
+            if current == target:
+                break
+            for neighbor, cost in edges(current):
+                temp_g_score = g_score[current] + cost
+                if temp_g_score < g_score.get(neighbor, INF):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = temp_g_score
+                    row, col = divmod(neighbor, cols)
+                    open_set.push(neighbor, temp_g_score + abs(row - end_row) + abs(col - end_col))
+                    if observer is not None and neighbor != target:
+                        observer(neighbor, OPEN)
+            if observer is not None and current != source:
+                observer(current, CLOSED)
+            expansions += 1
+        else:
+            return SearchResult(None, None, expansions)
+
+        waypoints = [target]
+        while waypoints[-1] != source:
+            waypoints.append(came_from[waypoints[-1]])
+        waypoints.reverse()
+
+        path = [source]
+        for node in waypoints[1:]:
+            if self.cluster_of(node) == self.cluster_of(path[-1]):
+                segment, segment_expansions = local_path(grid_map, self.bounds(self.cluster_of(node)), path[-1], node)
+                path += segment[1:]
+                expansions += segment_expansions
+            else:
+                path.append(node)
+        return SearchResult(finish_path(grid_map, path, observer), len(path) - 1, expansions)
+
+
+def cluster_adjacency(grid_map, bounds):
+    """Walkable neighbors of every free cell inside `bounds`, not leaving it; maps cell index -> list."""
+    first_row, end_row, first_col, end_col = bounds
+    cells = grid_map.cells
+    cols = grid_map.cols
+    adjacency = {}
+    for row in range(first_row, end_row):
+        for index in range(row * cols + first_col, row * cols + end_col):
+            if cells[index] == BARRIER:
+                continue
+            col = index - row * cols
+            neighbors = []
+            if row + 1 < end_row and cells[index + cols] != BARRIER:
+                neighbors.append(index + cols)
+            if row > first_row and cells[index - cols] != BARRIER:
+                neighbors.append(index - cols)
+            if col + 1 < end_col and cells[index + 1] != BARRIER:
+                neighbors.append(index + 1)
+            if col > first_col and cells[index - 1] != BARRIER:
+                neighbors.append(index - 1)
+            adjacency[index] = neighbors
+    return adjacency
+
+
+def local_distances(adjacency, source, targets):
+    """
+    - BFS from `source` over a cluster's adjacency that stops once every cell in `targets` is reached.
+    - Returns ({reached target: distance}, nodes expanded).
+    """
+    distance = {source: 0}
+    reached = {}
+    remaining = len(targets - {source})
+    layer = [source]
+    step = 0
+    nodes_traversed = 0
+    while layer and remaining:
+        step += 1
+        next_layer = []
+        for current in layer:
+            nodes_traversed += 1
+            for neighbor in adjacency.get(current, ()):
+                if neighbor not in distance:
+                    distance[neighbor] = step
+                    next_layer.append(neighbor)
+                    if neighbor in targets:
+                        reached[neighbor] = step
+                        remaining -= 1
+        layer = next_layer
+    return reached, nodes_traversed
+
+
+def local_path(grid_map, bounds, source, target):
+    """A* from `source` to `target` inside `bounds`; returns (index path, nodes expanded)."""
+    first_row, end_row, first_col, end_col = bounds
+    cells = grid_map.cells
+    cols = grid_map.cols
+    end_row_target, end_col_target = divmod(target, cols)
+    open_set = PriorityFrontier()
+    open_set.push(source, 0)
+    came_from = {}
+    g_score = {source: 0}
+    nodes_traversed = 0
+    while open_set:
+        current = open_set.pop()[1]
+        if current == target:
+            break
+        nodes_traversed += 1
+        row, col = divmod(current, cols)
+        temp_g_score = g_score[current] + 1
+        for neighbor, inside in ((current + cols, row + 1 < end_row), (current - cols, row > first_row),
+                                 (current + 1, col + 1 < end_col), (current - 1, col > first_col)):
+            if inside and cells[neighbor] != BARRIER and temp_g_score < g_score.get(neighbor, INF):
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                neighbor_row, neighbor_col = divmod(neighbor, cols)
+                open_set.push(neighbor, temp_g_score + abs(neighbor_row - end_row_target)
+                              + abs(neighbor_col - end_col_target))
+    path = [target]
+    while path[-1] != source:
+        path.append(came_from[path[-1]])
+    path.reverse()
+    return path, nodes_traversed
+
+
+# A few hierarchies are kept between queries, so hpa_search only builds one per map.
+_hierarchies = OrderedDict()
+MAX_HIERARCHIES = 4
+
+
+def hierarchy_for(grid_map, cluster_size=CLUSTER_SIZE):
+    """Returns the HierarchicalMap kept for `grid_map`, building it on first use."""
+    key = (id(grid_map), cluster_size)
+    hierarchy = _hierarchies.get(key)
+    if hierarchy is None or hierarchy.grid_map is not grid_map:
+        hierarchy = HierarchicalMap(grid_map, cluster_size)
+        _hierarchies[key] = hierarchy
+        while len(_hierarchies) > MAX_HIERARCHIES:
+            _, evicted = _hierarchies.popitem(last=False)
+            evicted.grid_map.listeners.remove(evicted.changed)
+    _hierarchies.move_to_end(key)
+    return hierarchy
+
+
+def hpa_search(grid_map, start, end, observer=None):
+    """Headless HPA*; the hierarchy is built on the first query for a map and reused afterwards."""
+    return hierarchy_for(grid_map).search(start, end, observer)
+
+
+def hpa(draw, grid, start, end):
+    """Visual HPA*: runs hpa_search on a Grid and animates it through `draw`."""
+    return run_visual(hpa_search, draw, grid, start, end)
@@ -0,0 +1,215 @@
+"""
+Jump Point Search for uniform-cost grids.
+
+JPS is A* that skips over the runs of symmetric paths a uniform grid has. From each expanded cell it only
+follows the directions that can lead somewhere new, and "jumps" along them until it reaches a cell with a
+forced neighbor or the goal. Only those jump points enter the open set, so on open maps it expands a small
+fraction of what a_star does while returning paths of the same length.
+
+With diagonal=True the search is 8-connected, a diagonal step costs sqrt(2), and corners are never cut:
+a diagonal step needs both orthogonal cells beside it to be free. By default the search follows the map's
+movement mode. Its pruning rules are those of the no-corner-cutting mode, so an 8-connected search on a map that
+allows corner cutting is refused rather than returning paths longer than the map's optimum. The pruning also
+assumes every cell costs the same to enter, so maps with terrain are refused too.
+"""
+from math import sqrt
+from algorithms.engine import INF, BARRIER, SearchResult, OPEN, CLOSED, finish_path, run_visual, unreachable
+from algorithms.frontier import PriorityFrontier
+
+SQRT2 = sqrt(2)
+STRAIGHT = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+OCCUPANCY = bytes(1 if state == BARRIER else 0 for state in range(256))
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+def jps_search(grid_map, start, end, observer=None, diagonal=None):
+    """
+    - Headless Jump Point Search over a GridMap; 8-connected if `diagonal` is set, or when it is None and the
+      map is 8-connected.
+    - Raises ValueError on an 8-connected map whose diagonals do not cost sqrt(2) or that allows corner
+      cutting, or on a map with terrain costs other than 1: the pruning rules assume none of those.
+    - Returns a SearchResult whose path lists every cell (not just the jump points) and whose expansion
+      count is the number of jump points expanded.
+    """
+    if diagonal is None:
+        diagonal = grid_map.diagonal
+        if diagonal and grid_map.diagonal_cost != SQRT2:
+            raise ValueError("JPS needs diagonal steps to cost sqrt(2)")
+    if diagonal and grid_map.corner_cutting:
+        raise ValueError("JPS does not cut corners: switch corner cutting off or use A* or Dijkstra")
+    if grid_map.cost_range() != (1, 1):
+        raise ValueError("JPS needs uniform step costs: clear the terrain or use A* or Dijkstra")
+    rows, cols, cells = grid_map.rows, grid_map.cols, grid_map.cells
+    source = grid_map.index(start)
+    target = grid_map.index(end)
+    if unreachable(grid_map, source, target):
+        return SearchResult(None, None, 0)
+    end_row, end_col = end
+
+    def walkable(row, col):
+        return 0 <= row < rows and 0 <= col < cols and cells[row * cols + col] != BARRIER
+
+    # Snapshot with 1 for barriers and 0 elsewhere, so jumps can scan whole lines with bytes.find.
+    occupancy = bytes(cells).translate(OCCUPANCY)
+
+    def ray(index, step, count):
+        """`count` cells of the snapshot starting at `index` and moving by `step`."""
+        stop = index + step * count
+        return occupancy[index:stop if stop >= 0 else None:step]
+
+    def jump_straight(row, col, d_row, d_col):
+        """Follows a straight line until a jump point; returns its index or None."""
+        if not walkable(row, col):
+            return None
+        index = row * cols + col
+        if d_col:
+            step, count = d_col, (cols - col if d_col > 0 else col + 1)
+            goal = (end_col - col) * d_col if row == end_row else -1
+            # Cells beside the line, starting one cell behind it.
+            sides = [index + side * cols - d_col for side in (-1, 1) if 0 <= row + side < rows]
+        else:
+            step, count = d_row * cols, (rows - row if d_row > 0 else row + 1)
+            goal = (end_row - row) * d_row if col == end_col else -1
+            sides = [index + side - step for side in (-1, 1) if 0 <= col + side < cols]
+
+        stop = ray(index, step, count).find(1)
+        if stop == -1:
+            stop = count
+        found = 0 <= goal < stop
+        if found:
+            stop = goal
+        for side in sides:
+            # A forced neighbor is a free side cell right after a blocked one.
+            forced = ray(side, step, stop + 1).find(b"\x01\x00")
+            if forced != -1 and forced < stop:
+                stop = forced
+                found = True
+
+        if d_row and not diagonal:
+            # Moving vertically on a 4-connected grid, a row is also a jump point if a horizontal jump
+            # from it succeeds.
+            for offset in range(stop):
+                if jump_straight(row + offset * d_row, col + 1, 0, 1) is not None or \
+                        jump_straight(row + offset * d_row, col - 1, 0, -1) is not None:
+                    return index + offset * step
+        return index + stop * step if found else None
+
+    def jump_diagonal(row, col, d_row, d_col):
+        """Follows a diagonal until a cell from which a straight jump succeeds; returns its index or None."""
+        while walkable(row, col):
+            if row == end_row and col == end_col:
+                return row * cols + col
+            if jump_straight(row + d_row, col, d_row, 0) is not None or \
+                    jump_straight(row, col + d_col, 0, d_col) is not None:
+                return row * cols + col
+            if not (walkable(row + d_row, col) and walkable(row, col + d_col)):
+                return None
+            row += d_row
+            col += d_col
+        return None
+
+    def directions(index, parent):
+        """Directions worth jumping in from `index`, pruned by the direction we arrived from."""
+        row, col = divmod(index, cols)
+        if parent is None:
+            moves = list(STRAIGHT)
+            if diagonal:
+                moves += [(d_row, d_col) for d_row, d_col in DIAGONAL
+                          if walkable(row + d_row, col) and walkable(row, col + d_col)]
+            return moves
+        parent_row, parent_col = divmod(parent, cols)
+        d_row, d_col = sign(row - parent_row), sign(col - parent_col)
+        if d_row and d_col:
+            moves = [(d_row, 0), (0, d_col)]
+            if walkable(row + d_row, col) and walkable(row, col + d_col):
+                moves.append((d_row, d_col))
+            return moves
+        if not diagonal:
+            return [(d_row, d_col)] + ([(0, 1), (0, -1)] if d_row else [(1, 0), (-1, 0)])
+        moves = [(d_row, d_col)]
+        sides = [(0, 1), (0, -1)] if d_row else [(1, 0), (-1, 0)]
+        for s_row, s_col in sides:
+            if walkable(row + s_row, col + s_col):
+                moves.append((s_row, s_col))
+                if walkable(row + d_row, col + d_col):
+                    moves.append((d_row + s_row, d_col + s_col))
+        return moves
+
+    def distance(row1, col1, row2, col2):
+        d_row, d_col = abs(row1 - row2), abs(col1 - col2)
+        if diagonal:
+            return max(d_row, d_col) + (SQRT2 - 1) * min(d_row, d_col)
+        return d_row + d_col
+
+    open_set = PriorityFrontier()
+    open_set.push(source, distance(start[0], start[1], end_row, end_col))
+    came_from = {}
+    g_score = {source: 0}
+    nodes_traversed = 0
+
+    while open_set:
+        current = open_set.pop()[1]
+
+        if current == target:
+            path = [target]
+            while path[-1] != source:
+                path.append(came_from[path[-1]])
+            path.reverse()
+            return SearchResult(finish_path(grid_map, fill_segments(path, cols), observer),
+                                g_score[target], nodes_traversed)
+
+        row, col = divmod(current, cols)
+        for d_row, d_col in directions(current, came_from.get(current)):
+            if d_row and d_col:
+                jump_point = jump_diagonal(row + d_row, col + d_col, d_row, d_col)
+            else:
+                jump_point = jump_straight(row + d_row, col + d_col, d_row, d_col)
+            if jump_point is None:
+                continue
+            jump_row, jump_col = divmod(jump_point, cols)
+            temp_g_score = g_score[current] + distance(row, col, jump_row, jump_col)
+            if temp_g_score < g_score.get(jump_point, INF):
+                came_from[jump_point] = current
+                g_score[jump_point] = temp_g_score
+                open_set.push(jump_point, temp_g_score + distance(jump_row, jump_col, end_row, end_col))
+                if observer is not None:
+                    observer(jump_point, OPEN)
+
+        if observer is not None:
+            observer(current, CLOSED)
+        nodes_traversed += 1
+
+    return SearchResult(None, None, nodes_traversed)
+
+
+def fill_segments(jump_points, cols):
+    """Expands a list of jump points into every cell along the straight or diagonal segments between them."""
+    path = [jump_points[0]]
+    for index in jump_points[1:]:
+        row, col = divmod(path[-1], cols)
+        end_row, end_col = divmod(index, cols)
+        d_row, d_col = sign(end_row - row), sign(end_col - col)
+        while (row, col) != (end_row, end_col):
+            row += d_row
+            col += d_col
+            path.append(row * cols + col)
+    return path
+
+
+def jps_diagonal_search(grid_map, start, end, observer=None):
+    """Headless 8-connected Jump Point Search; returns a SearchResult."""
+    return jps_search(grid_map, start, end, observer, diagonal=True)
+
+
+def jps(draw, grid, start, end):
+    """Visual JPS: runs jps_search on a Grid and animates it through `draw`."""
+    return run_visual(jps_search, draw, grid, start, end)
+
+
+def jps_diagonal(draw, grid, start, end):
+    """Visual 8-connected JPS: runs jps_diagonal_search on a Grid and animates it through `draw`."""
+    return run_visual(jps_diagonal_search, draw, grid, start, end)
@@ -0,0 +1,323 @@
+"""
+ALT heuristics: A* with landmarks and the triangle inequality.
+
+On mazes and room maps the Manhattan distance badly underestimates how far apart two cells are, and A* expands
+almost as much as Dijkstra. ALT pays for a better heuristic with preprocessing: a few landmark cells are
+picked, and the exact distance from each of them to every cell is stored. For a landmark L, the triangle
+inequality bounds the distance from a cell n to the target t from below in two ways:
+
+    d(n, t) >= d(L, t) - d(L, n)        d(n, t) >= d(n, L) - d(t, L)
+
+A* uses the best of these bounds over the landmarks, and of the usual distance heuristic. With terrain a step
+costs what the cell it enters costs, so reversing a path only swaps the costs of its two ends:
+d(n, L) = d(L, n) - cost(n) + cost(L), and the tables from the landmarks give both bounds.
+
+- Landmarks are picked by farthest-point selection: the first is the cell farthest from the middle of the map,
+  and each next one the cell farthest from all the landmarks before it.
+- The tables are flat array('H') buffers (uint16) when every distance fits, and array('I') (uint32) otherwise.
+  The type's largest value marks the cells a landmark cannot reach.
+- save_landmarks writes them next to the map file with a checksum of its barriers and costs, and
+  landmarks_for loads them back while they still match, so the preprocessing is paid once per map.
+- Distances must be integers: the map is 4-connected, or 8-connected with diagonals that cost 1 (Chebyshev
+  moves), with any terrain. Octile maps raise ValueError.
+- Like a ShortestPathTree, tables are only valid for the map as it was when they were built; any edit makes
+  alt_search build them again.
+"""
+import struct
+import sys
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from algorithms.a_star import a_star_search
+from algorithms.components import OCCUPANCY
+from algorithms.engine import SearchResult, run_visual, unreachable
+from algorithms.frontier import BucketFrontier
+
+try:
+    import numpy as np
+    from algorithms.wavefront import distance_field
+except ImportError:  # Without NumPy (the `fast` extra) every pass over the map runs in plain Python.
+    np = None
+
+MAGIC = b"PFALT1\n\0"
+# Typecode, rows, cols, landmark count, movement flags (1: diagonal, 2: corner cutting), map checksum.
+HEADER = struct.Struct("<cIIIBI")
+EXTENSION = ".alt"
+DEFAULT_LANDMARKS = 8
+# Landmarks consulted by one query: the ones with the best bounds between its start and end.
+ACTIVE_LANDMARKS = 4
+UNREACHABLE = {"H": 0xFFFF, "I": 0xFFFFFFFF}
+# The NumPy wavefront pays about as much for each step of its frontier as a queue pays for 30 cells, so it only
+# wins when the map is this many times wider than its longest shortest path; mazes are not.
+WAVEFRONT_WIDTH = 30
+
+
+class LandmarkTable:
+    """
+    - Distances from each landmark (a cell index) to every cell of a GridMap, one flat array per landmark.
+    - `tables[k][index]` is `unreachable` for the cells that landmark k cannot reach.
+    - Pass it to a_star_search as `landmarks`; it raises ValueError once the map has reported an edit.
+    """
+    def __init__(self, grid_map, landmarks, tables, typecode):
+        self.grid_map = grid_map
+        self.landmarks = landmarks
+        self.tables = tables
+        self.typecode = typecode
+        self.unreachable = UNREACHABLE[typecode]
+        self.version = grid_map.version
+
+    def check(self, grid_map):
+        """Raises ValueError unless the tables were built for `grid_map` as it is now."""
+        if grid_map is not self.grid_map:
+            raise ValueError("These landmark tables belong to a different GridMap")
+        if self.version != grid_map.version:
+            raise ValueError("The map has changed since these landmark tables were built")
+
+    def lower_bound(self, source, target):
+        """Lower bound on the cost of a path between two cell indices."""
+        return self.heuristic(source, target)(source)
+
+    def heuristic(self, source, target):
+        """
+        - Returns h(index): a lower bound on the cost from a cell index to `target`, for a search from `source`.
+        - Only the ACTIVE_LANDMARKS landmarks with the best bounds at `source` are consulted, which keeps each
+          evaluation cheap; the bound is never below the map's distance heuristic.
+        """
+        grid_map = self.grid_map
+        costs = grid_map.costs
+        distance = grid_map.distance
+        min_cost = grid_map.cost_range()[0]
+        unreachable = self.unreachable
+        # Landmarks that cannot reach both ends have nothing to say about this query.
+        active = [(table, table[target]) for table in self.tables
+                  if table[target] != unreachable and table[source] != unreachable]
+        if len(active) > ACTIVE_LANDMARKS:
+            shift = 0 if costs is None else costs[target] - costs[source]
+
+            def bound_at_source(entry):
+                table, to_target = entry
+                bound = to_target - table[source]
+                return max(bound, shift - bound)
+            active = sorted(active, key=bound_at_source, reverse=True)[:ACTIVE_LANDMARKS]
+
+        if costs is None:
+            def h(index):
+                best = min_cost * distance(index, target)
+                for table, to_target in active:
+                    bound = to_target - table[index]
+                    if bound < 0:
+                        bound = -bound
+                    if bound > best:
+                        best = bound
+                return best
+        else:
+            target_cost = costs[target]
+
+            def h(index):
+                best = min_cost * distance(index, target)
+                shift = target_cost - costs[index]
+                for table, to_target in active:
+                    bound = to_target - table[index]
+                    if shift - bound > bound:
+                        bound = shift - bound
+                    if bound > best:
+                        best = bound
+                return best
+
+        return h
+
+
+def build_landmarks(grid_map, count=DEFAULT_LANDMARKS):
+    """
+    - Picks up to `count` landmarks by farthest-point selection and returns their LandmarkTable.
+    - Landmarks are taken from the region around the middle of the map; queries elsewhere fall back to the
+      distance heuristic.
+    """
+    check_metric(grid_map)
+    occupancy = bytes(grid_map.cells).translate(OCCUPANCY)
+    middle = grid_map.rows // 2 * grid_map.cols + grid_map.cols // 2
+    seed = occupancy.find(b"\x00", middle)
+    if seed < 0:
+        seed = occupancy.rfind(b"\x00")
+    landmarks = []
+    tables = []
+    largest = 0
+    if seed >= 0:
+        vectorized = np is not None and not grid_map.diagonal and grid_map.costs is None
+        closest = _distances(grid_map, seed, vectorized)
+        if vectorized:
+            vectorized = len(closest) - closest.count(-1) >= WAVEFRONT_WIDTH * max(closest)
+        for _ in range(count):
+            farthest = max(closest)
+            if farthest <= 0:
+                break  # every reachable cell already is a landmark
+            landmark = closest.index(farthest)
+            distances = _distances(grid_map, landmark, vectorized)
+            largest = max(largest, max(distances))
+            if largest >= UNREACHABLE["I"]:
+                raise ValueError("Path costs on this map do not fit in 32 bits")
+            landmarks.append(landmark)
+            tables.append(_narrow(distances, "I"))
+            if np is None:
+                closest = array("q", map(min, closest, distances))
+            else:
+                nearest = np.minimum(np.frombuffer(closest, np.int64), np.frombuffer(distances, np.int64))
+                closest = array("q", nearest.tobytes())
+    typecode = "H" if largest < UNREACHABLE["H"] else "I"
+    return LandmarkTable(grid_map, landmarks, [_narrow(table, typecode) for table in tables], typecode)
+
+
+def check_metric(grid_map):
+    """Raises ValueError for maps whose path costs are not integers, which the tables cannot hold."""
+    if grid_map.diagonal and grid_map.diagonal_cost != 1:
+        raise ValueError("Landmark tables need integer path costs: use 4-connected movement or diagonal_cost=1")
+
+
+def map_checksum(grid_map):
+    """CRC-32 of the map's barriers and terrain, to tell whether saved tables still describe it."""
+    checksum = zlib.crc32(bytes(grid_map.cells).translate(OCCUPANCY))
+    if grid_map.costs is not None:
+        costs = grid_map.costs.tobytes()
+        if sys.byteorder == "big" and grid_map.costs.itemsize > 1:
+            costs = array("H", costs)
+            costs.byteswap()
+        checksum = zlib.crc32(costs, checksum)
+    return checksum
+
+
+def save_landmarks(path, table):
+    """Writes a LandmarkTable: the header, the landmarks as uint32, then the tables, all little-endian."""
+    grid_map = table.grid_map
+    landmarks = array("I", table.landmarks)
+    tables = [array(table.typecode, distances) for distances in table.tables]
+    if sys.byteorder == "big":
+        for data in [landmarks] + tables:
+            data.byteswap()
+    flags = grid_map.diagonal | grid_map.corner_cutting << 1
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(HEADER.pack(table.typecode.encode(), grid_map.rows, grid_map.cols, len(landmarks), flags,
+                               map_checksum(grid_map)))
+        for data in [landmarks] + tables:
+            data.tofile(file)
+
+
+def load_landmarks(path, grid_map):
+    """Reads tables written by save_landmarks; ValueError if they were built for another map or movement mode."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a landmark file")
+        try:
+            typecode, rows, cols, count, flags, checksum = HEADER.unpack(file.read(HEADER.size))
+        except struct.error:
+            raise ValueError(f"{path} is truncated") from None
+        typecode = typecode.decode()
+        if typecode not in UNREACHABLE:
+            raise ValueError(f"{path} is not a landmark file")
+        if ((rows, cols) != (grid_map.rows, grid_map.cols) or flags != grid_map.diagonal | grid_map.corner_cutting << 1
+                or checksum != map_checksum(grid_map)):
+            raise ValueError(f"{path} was built for a different map or movement mode")
+        landmarks = array("I")
+        tables = [array(typecode) for _ in range(count)]
+        try:
+            landmarks.fromfile(file, count)
+            for table in tables:
+                table.fromfile(file, rows * cols)
+        except EOFError:
+            raise ValueError(f"{path} is truncated") from None
+    if sys.byteorder == "big":
+        for data in [landmarks] + tables:
+            data.byteswap()
+    return LandmarkTable(grid_map, list(landmarks), tables, typecode)
+
+
+def landmark_path(map_path):
+    """Where the landmark tables of a map file are kept: next to it, with EXTENSION appended."""
+    return map_path + EXTENSION
+
+
+# Tables are kept between queries, since building them costs several passes over the whole map.
+_tables = OrderedDict()
+MAX_TABLES = 4
+
+
+def landmarks_for(grid_map, map_path=None, count=DEFAULT_LANDMARKS):
+    """
+    - Returns up-to-date landmark tables for `grid_map`, reusing the ones kept from earlier queries.
+    - With `map_path`, tables saved next to the map file are loaded while they match it, and tables that had
+      to be built are saved there.
+    """
+    key = id(grid_map)
+    table = _tables.get(key)
+    if table is None or table.grid_map is not grid_map or table.version != grid_map.version:
+        table = None
+        if map_path is not None:
+            try:
+                table = load_landmarks(landmark_path(map_path), grid_map)
+            except (OSError, ValueError):
+                pass
+        if table is None:
+            table = build_landmarks(grid_map, count)
+            if map_path is not None:
+                save_landmarks(landmark_path(map_path), table)
+        _tables[key] = table
+        while len(_tables) > MAX_TABLES:
+            _tables.popitem(last=False)
+    _tables.move_to_end(key)
+    return table
+
+
+def alt_search(grid_map, start, end, observer=None, stats=None):
+    """Headless A* with landmark heuristics; the tables are built on the first query and after every edit."""
+    if unreachable(grid_map, grid_map.index(start), grid_map.index(end)):
+        return SearchResult(None, None, 0)
+    return a_star_search(grid_map, start, end, observer, landmarks_for(grid_map), stats)
+
+
+def alt(draw, grid, start, end):
+    """Visual ALT: runs alt_search on a Grid and animates it through `draw`."""
+    return run_visual(alt_search, draw, grid, start, end)
+
+
+def _distances(grid_map, source, vectorized=False):
+    """
+    - Cost of the cheapest path from cell index `source` to every cell, as array('q') with -1 where unreachable.
+    - `vectorized` uses the NumPy wavefront, which is only valid on 4-connected maps without terrain.
+    """
+    if vectorized:
+        return array("q", distance_field(grid_map, grid_map.position(source)).astype("int64").tobytes())
+    neighbors = grid_map.neighbors
+    costs = grid_map.costs
+    distance = array("q", [-1]) * (grid_map.rows * grid_map.cols)
+    distance[source] = 0
+    if costs is None:
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            step = distance[current] + 1
+            for neighbor in neighbors(current):
+                if distance[neighbor] < 0:
+                    distance[neighbor] = step
+                    queue.append(neighbor)
+        return distance
+    frontier = BucketFrontier(grid_map.cost_range()[1])
+    frontier.push(source, 0)
+    while frontier:
+        current_distance, current = frontier.pop()
+        for neighbor in neighbors(current):
+            temp_distance = current_distance + costs[neighbor]
+            if distance[neighbor] < 0 or temp_distance < distance[neighbor]:
+                distance[neighbor] = temp_distance
+                frontier.push(neighbor, temp_distance)
+    return distance
+
+
+def _narrow(values, typecode):
+    """
+    - Copies an array into a narrower unsigned type by keeping the low bytes of every value, without a Python
+      loop. Every value must fit, apart from -1 or the wider type's largest value, which become
+      UNREACHABLE[typecode].
+    """
+    narrow = array(typecode, values.tobytes())
+    ratio = values.itemsize // narrow.itemsize
+    return narrow[ratio - 1::ratio] if sys.byteorder == "big" else narrow[::ratio]
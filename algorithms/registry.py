@@ -0,0 +1,67 @@
+"""
+Names of the headless searches, so tools can pick one from a string.
+
+Modules are only imported when a search is requested.
+"""
+from importlib import import_module
+
+SEARCHES = {
+    "a_star": ("algorithms.a_star", "a_star_search"),
+    "alt": ("algorithms.landmarks", "alt_search"),
+    "dijkstra": ("algorithms.dijkstra", "dijkstra_search"),
+    "bfs": ("algorithms.bfs", "bfs_search"),
+    "bidirectional_a_star": ("algorithms.bidirectional", "bidirectional_a_star_search"),
+    "bidirectional_dijkstra": ("algorithms.bidirectional", "bidirectional_dijkstra_search"),
+    "bidirectional_bfs": ("algorithms.bidirectional", "bidirectional_bfs_search"),
+    "jps": ("algorithms.jps", "jps_search"),
+    "jps_diagonal": ("algorithms.jps", "jps_diagonal_search"),
+    "hpa": ("algorithms.hpa", "hpa_search"),
+    "dstar_lite": ("algorithms.dstar_lite", "dstar_lite_search"),
+    "wavefront": ("algorithms.wavefront", "wavefront_search"),  # needs NumPy
+}
+
+# Searches that are 8-connected whatever the map's movement mode; every other search follows
+# GridMap.diagonal unless it is listed in FOUR_CONNECTED_SEARCHES.
+DIAGONAL_SEARCHES = {"jps_diagonal"}
+
+# Searches that are 4-connected whatever the map's movement mode.
+FOUR_CONNECTED_SEARCHES = {"hpa", "dstar_lite", "wavefront"}
+
+# Searches whose cost is the number of moves, which on an 8-connected map is not the path's cost.
+MOVE_COUNT_SEARCHES = {"bfs", "bidirectional_bfs"}
+
+# Searches that keep their state between queries, so repeating a query on an unchanged map does no work.
+INCREMENTAL_SEARCHES = {"dstar_lite"}
+
+# Searches that preprocess the whole map before their first query, and again after it is edited. They keep
+# the result between queries (HPA*'s hierarchy, ALT's tables), so their per-query times hide that cost.
+PREPROCESSED_SEARCHES = {"alt", "hpa"}
+
+# Searches that raise ValueError on a map with terrain, because they assume every step costs the same.
+UNIT_COST_SEARCHES = {"jps", "jps_diagonal"}
+
+# Searches that raise ValueError on an 8-connected map that allows corner cutting.
+NO_CORNER_CUTTING_SEARCHES = {"jps", "jps_diagonal"}
+
+# Searches that accept a SearchStats as `stats` (see algorithms/stats.py).
+INSTRUMENTED_SEARCHES = {"a_star", "alt", "dijkstra", "bfs"}
+
+
+def get_search(name):
+    """Returns the headless search function registered under `name`."""
+    if name not in SEARCHES:
+        raise ValueError(f"Unknown algorithm {name!r}; choose from {', '.join(SEARCHES)}")
+    module, function = SEARCHES[name]
+    return getattr(import_module(module), function)
+
+
+def available_searches():
+    """Names of the searches whose modules import, e.g. without the ones that need an uninstalled NumPy."""
+    names = []
+    for name in SEARCHES:
+        try:
+            get_search(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
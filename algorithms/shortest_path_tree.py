@@ -0,0 +1,108 @@
+"""
+Single-source shortest-path trees.
+
+dijkstra_search stops as soon as it reaches `end` and throws its scores away. shortest_path_tree runs
+Dijkstra from a source until the whole reachable area is settled and keeps the result as two flat arrays,
+the distance and the parent of every cell. After that, the path from the source to any cell is read by
+following parents, in O(path length) and without searching again.
+"""
+from array import array
+from algorithms.engine import SearchResult, OPEN, CLOSED, finish_path
+from algorithms.frontier import PriorityFrontier
+
+UNREACHABLE = -1
+
+
+class ShortestPathTree:
+    """
+    - Distances and parents from one source over a GridMap, as flat arrays indexed by cell. Distances are
+      array('q'), or array('d') on 8-connected maps whose diagonal steps are not a whole cost such as sqrt(2);
+      parents are array('i').
+    - `distance[index]` is UNREACHABLE (-1) for barriers and cells that cannot be reached, and
+      `parent[index]` is -1 for those and for the source itself.
+    - Only valid for the map as it was when the tree was built: lookups raise ValueError once the map
+      reports an edit through GridMap.changed.
+    """
+    def __init__(self, grid_map, source, distance, parent, expansions):
+        self.grid_map = grid_map
+        self.source = source
+        self.distance = distance
+        self.parent = parent
+        self.expansions = expansions
+        self.version = grid_map.version
+
+    def distance_to(self, end):
+        """Cost of the shortest path to `end`, or None when it cannot be reached."""
+        self._check_version()
+        distance = self.distance[self.grid_map.index(end)]
+        return None if distance == UNREACHABLE else distance
+
+    def path_to(self, end, observer=None):
+        """The shortest path from the source to `end` as (row, col) positions, or None."""
+        self._check_version()
+        current = self.grid_map.index(end)
+        if self.distance[current] == UNREACHABLE:
+            return None
+        parent = self.parent
+        path = [current]
+        while current != self.source:
+            current = parent[current]
+            path.append(current)
+        path.reverse()
+        return finish_path(self.grid_map, path, observer)
+
+    def search(self, end, observer=None):
+        """Answers one query as a SearchResult; nothing is expanded, so the expansion count is 0."""
+        path = self.path_to(end, observer)
+        return SearchResult(path, None if path is None else self.distance_to(end), 0)
+
+    def _check_version(self):
+        if self.version != self.grid_map.version:
+            raise ValueError("The map has changed since this shortest-path tree was built")
+
+
+def shortest_path_tree(grid_map, start, observer=None):
+    """
+    - Runs Dijkstra from `start` until every reachable cell is settled and returns a ShortestPathTree.
+    - `observer(index, state)` is told about opened and closed cells, like the other searches.
+    - Honors the map's terrain costs and movement mode, so lookups agree with dijkstra_search.
+    """
+    source = grid_map.index(start)
+    neighbors = grid_map.neighbors
+    costs = grid_map.costs
+    cols = grid_map.cols
+    diagonal = grid_map.diagonal
+    size = grid_map.rows * grid_map.cols
+    diagonal_cost = grid_map.diagonal_cost
+    if diagonal_cost == int(diagonal_cost):
+        diagonal_cost = int(diagonal_cost)  # e.g. 1.0 on a Chebyshev map: keep the distances integers
+    typecode = "d" if diagonal and isinstance(diagonal_cost, float) else "q"
+    distance = array(typecode, [UNREACHABLE]) * size
+    parent = array("i", [-1]) * size
+    distance[source] = 0
+    open_set = PriorityFrontier()
+    open_set.push(source, 0)
+    nodes_traversed = 0
+
+    while open_set:
+        current_distance, current = open_set.pop()
+        nodes_traversed += 1
+        if diagonal:
+            current_row, current_col = divmod(current, cols)
+        for neighbor in neighbors(current):
+            step = 1 if costs is None else costs[neighbor]
+            if diagonal:
+                row, col = divmod(neighbor, cols)
+                if row != current_row and col != current_col:
+                    step *= diagonal_cost
+            temp_distance = current_distance + step
+            if distance[neighbor] == UNREACHABLE or temp_distance < distance[neighbor]:
+                distance[neighbor] = temp_distance
+                parent[neighbor] = current
+                open_set.push(neighbor, temp_distance)
+                if observer is not None:
+                    observer(neighbor, OPEN)
+        if observer is not None:
+            observer(current, CLOSED)
+
+    return ShortestPathTree(grid_map, source, distance, parent, nodes_traversed)
@@ -0,0 +1,216 @@
+"""
+Instrumentation for the searches.
+
+Pass a SearchStats as `stats` to a_star_search, dijkstra_search or bfs_search (or to run_visual) to see what
+the search did:
+
+- expansions: cells expanded, the count the search returns. The goal is not counted, so a search that starts
+  on its goal expands nothing.
+- pushes: frontier pushes that queued a cell or lowered its priority; decrease_keys are the latter.
+- stale_pops: superseded frontier entries dropped by pops. Decrease-key is lazy, so each one leaves a stale
+  entry behind.
+- max_frontier: the most cells queued at once.
+- search_ns and draw_ns: time spent searching and time spent in the observer, which is where the
+  visualizer draws.
+
+Without stats a search runs exactly as before. With them, its frontier is wrapped in a CountingFrontier and
+its observer is timed, so the counting costs nothing unless it is asked for.
+
+With `trace=True` every (cell index, state) event the search reports is recorded as well, and export() writes
+it to a compact binary log for offline analysis:
+
+    b"PFTRACE1", rows and cols as uint32, the event count and the seven counters as uint64,
+    then the cell index of every event as uint32 and its state as one byte
+
+All little-endian: 5 bytes per event. load_trace reads it back.
+
+record runs any search this way at full speed, without drawing, so that components/replay.py can play the
+events back later at whatever speed, as often as needed.
+"""
+import struct
+import sys
+import time
+from array import array
+
+MAGIC = b"PFTRACE1"
+HEADER = struct.Struct("<II8Q")
+COUNTERS = ("expansions", "pushes", "decrease_keys", "stale_pops", "max_frontier", "search_ns", "draw_ns")
+
+
+class SearchStats:
+    """
+    - Counters, timings and an optional event trace for the searches it is passed to.
+    - Counts and times add up over every search that uses the same SearchStats, and max_frontier is the
+      largest of them; use a new one to look at a single search.
+    """
+    def __init__(self, trace=False):
+        self.expansions = 0
+        self.pushes = 0
+        self.decrease_keys = 0
+        self.stale_pops = 0
+        self.max_frontier = 0
+        self.search_ns = 0
+        self.draw_ns = 0
+        self.rows = self.cols = 0
+        self.trace = trace
+        self.indices = array("I")
+        self.states = array("B")
+        self.frontier = None
+        self.started = None
+        self._draw_ns = 0
+
+    def attach(self, grid_map, frontier, observer):
+        """
+        - Called by a search before its loop: starts the clock and returns (frontier, observer) to use
+          instead of its own, wrapped to count and time what they see.
+        """
+        self.rows, self.cols = grid_map.rows, grid_map.cols
+        self.frontier = CountingFrontier(frontier, self)
+        if self.trace:
+            observer = self._tracing(observer)
+        elif observer is not None:
+            observer = self._timing(observer)
+        self.started = time.perf_counter_ns()
+        return self.frontier, observer
+
+    def finish(self, expansions):
+        """Called by a search when it returns: stops the clock and settles the counts."""
+        elapsed = time.perf_counter_ns() - self.started
+        self.search_ns += elapsed - self._draw_ns
+        self.draw_ns += self._draw_ns
+        self._draw_ns = 0
+        self.expansions += expansions
+        counting = self.frontier
+        self.stale_pops += counting.pushed - counting.popped - counting.frontier.entries()
+        self.frontier = None
+
+    def recorder(self, grid_map):
+        """An observer that only records events, for searches that do not take `stats`."""
+        self.rows, self.cols = grid_map.rows, grid_map.cols
+        return self._tracing(None)
+
+    def _timing(self, observer):
+        clock = time.perf_counter_ns
+
+        def observe(index, state):
+            began = clock()
+            observer(index, state)
+            self._draw_ns += clock() - began
+        return observe
+
+    def _tracing(self, observer):
+        clock = time.perf_counter_ns
+        record_index, record_state = self.indices.append, self.states.append
+
+        def observe(index, state):
+            record_index(index)
+            record_state(state)
+            if observer is not None:
+                began = clock()
+                observer(index, state)
+                self._draw_ns += clock() - began
+        return observe
+
+    def summary(self):
+        """The counters as one line of text."""
+        return (f"{self.expansions} expansions, {self.pushes} pushes ({self.decrease_keys} decrease-keys), "
+                f"{self.stale_pops} stale pops, frontier up to {self.max_frontier}, "
+                f"search {self.search_ns / 1e6:.1f} ms, draw {self.draw_ns / 1e6:.1f} ms")
+
+    def events(self):
+        """The recorded (cell index, state) events, in order."""
+        return zip(self.indices, self.states)
+
+    def export(self, path):
+        """Writes the counters and the recorded events to `path` in the binary trace format."""
+        indices = array("I", self.indices)
+        if sys.byteorder == "big":
+            indices.byteswap()
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(HEADER.pack(self.rows, self.cols, len(self.states),
+                                   *(getattr(self, counter) for counter in COUNTERS)))
+            indices.tofile(file)
+            self.states.tofile(file)
+
+
+class CountingFrontier:
+    """
+    - Wraps a PriorityFrontier, BucketFrontier or FifoFrontier and reports its pushes, decrease-keys and size
+      to a SearchStats.
+    - Stale pops are not seen one by one: they are the entries that were pushed but neither popped nor left
+      in the frontier, which SearchStats.finish works out once.
+    """
+    def __init__(self, frontier, stats):
+        self.frontier = frontier
+        self.stats = stats
+        self.pushed = 0
+        self.popped = 0
+        self.decreasable = hasattr(frontier, "best")
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def __bool__(self):
+        return bool(self.frontier)
+
+    def push(self, item, *priority):
+        frontier = self.frontier
+        queued = self.decreasable and item in frontier
+        if frontier.push(item, *priority) is False:
+            return False
+        stats = self.stats
+        self.pushed += 1
+        stats.pushes += 1
+        if queued:
+            stats.decrease_keys += 1
+        if len(frontier) > stats.max_frontier:
+            stats.max_frontier = len(frontier)
+        return True
+
+    def pop(self):
+        self.popped += 1
+        return self.frontier.pop()
+
+
+def record(search, grid_map, start, end, instrumented=False, path=None):
+    """
+    - Runs a headless search without drawing and returns (SearchResult, SearchStats) with its events.
+    - With `instrumented` the search is handed the stats, so it must accept them, and the counters are filled
+      in as well; otherwise only the events and the time taken are recorded.
+    - With `path` the recording is also exported to that file.
+    """
+    stats = SearchStats(trace=True)
+    if instrumented:
+        result = search(grid_map, start, end, stats=stats)
+    else:
+        began = time.perf_counter_ns()
+        result = search(grid_map, start, end, stats.recorder(grid_map))
+        stats.search_ns = time.perf_counter_ns() - began
+        stats.expansions = result.expansions
+    if path is not None:
+        stats.export(path)
+    return result, stats
+
+
+def load_trace(path):
+    """Reads a trace written by SearchStats.export and returns it as a SearchStats."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a search trace")
+        try:
+            rows, cols, count, *counters = HEADER.unpack(file.read(HEADER.size))
+        except struct.error:
+            raise ValueError(f"{path} is truncated") from None
+        stats = SearchStats(trace=True)
+        stats.rows, stats.cols = rows, cols
+        for name, value in zip(COUNTERS, counters):
+            setattr(stats, name, value)
+        try:
+            stats.indices.fromfile(file, count)
+            stats.states.fromfile(file, count)
+        except EOFError:
+            raise ValueError(f"{path} is truncated: expected {count} events") from None
+    if sys.byteorder == "big":
+        stats.indices.byteswap()
+    return stats
@@ -0,0 +1,88 @@
+"""
+Vectorized BFS wavefront on a NumPy occupancy array.
+
+Instead of popping one cell at a time, every step takes the whole frontier as an array of cell indices,
+shifts it by +-1 row and +-1 column at once, and keeps the free cells that have no distance yet. The result
+is a full distance field from the start, so one run answers "how far is everything" and any number of
+paths can be traced back from it by walking downhill. The wavefront is always 4-connected, whatever the
+map's movement mode.
+
+Requires NumPy (pip install numpy, or the `fast` extra).
+"""
+import numpy as np
+from algorithms.engine import BARRIER, SearchResult, CLOSED, finish_path, run_visual, unreachable
+
+UNREACHABLE = -1
+
+
+def distance_field(grid_map, start, observer=None):
+    """
+    - Returns an int32 array of shape (rows, cols) with the number of steps from `start` to every cell,
+      or UNREACHABLE (-1) for barriers and cells that cannot be reached.
+    - With an observer, every cell is reported as CLOSED when the wavefront reaches it.
+    """
+    rows, cols = grid_map.rows, grid_map.cols
+    size = rows * cols
+    free = np.frombuffer(grid_map.cells, dtype=np.uint8) != BARRIER
+    distance = np.full(size, UNREACHABLE, dtype=np.int32)
+    # Scratch space for dropping duplicate cells from a new frontier without sorting it.
+    owner = np.empty(size, dtype=np.intp)
+
+    frontier = np.array([grid_map.index(start)], dtype=np.intp)
+    if not free[frontier[0]]:
+        return distance.reshape(rows, cols)
+    distance[frontier] = 0
+    step = 0
+    while frontier.size:
+        if observer is not None:
+            for index in frontier.tolist():
+                observer(index, CLOSED)
+        frontier_column = frontier % cols
+        shifted = np.concatenate((
+            frontier[frontier < size - cols] + cols,  # DOWN
+            frontier[frontier >= cols] - cols,  # UP
+            frontier[frontier_column < cols - 1] + 1,  # RIGHT
+            frontier[frontier_column > 0] - 1,  # LEFT
+        ))
+        shifted = shifted[free[shifted] & (distance[shifted] == UNREACHABLE)]
+        step += 1
+        distance[shifted] = step
+        position = np.arange(shifted.size)
+        owner[shifted] = position
+        frontier = shifted[owner[shifted] == position]
+    return distance.reshape(rows, cols)
+
+
+def descend(grid_map, field, end):
+    """Traces the index path from the field's source to `end` by stepping to a neighbor one step closer."""
+    flat = field.reshape(-1)
+    current = grid_map.index(end)
+    if flat[current] == UNREACHABLE:
+        return None
+    path = [current]
+    while flat[current] > 0:
+        target = flat[current] - 1
+        current = next(neighbor for neighbor in grid_map.orthogonal_neighbors(current) if flat[neighbor] == target)
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def wavefront_search(grid_map, start, end, observer=None):
+    """
+    - Headless wavefront BFS: builds the distance field from `start` and descends it from `end`.
+    - The expansion count is the number of cells the wavefront reached.
+    """
+    if unreachable(grid_map, grid_map.index(start), grid_map.index(end)):
+        return SearchResult(None, None, 0)
+    field = distance_field(grid_map, start, observer)
+    expansions = int(np.count_nonzero(field != UNREACHABLE))
+    path = descend(grid_map, field, end)
+    if path is None:
+        return SearchResult(None, None, expansions)
+    return SearchResult(finish_path(grid_map, path, observer), len(path) - 1, expansions)
+
+
+def wavefront(draw, grid, start, end):
+    """Visual wavefront BFS: runs wavefront_search on a Grid and animates it through `draw`."""
+    return run_visual(wavefront_search, draw, grid, start, end)
@@ -0,0 +1,57 @@
+"""
+Throughput of the batch API as the number of worker processes grows.
+
+Generates random (start, end) pairs on one seeded map and answers them with solve_batch at each worker
+count, reporting queries per second and the speedup over a single process.
+
+    python -m benchmarks.batch [--map random:0.3] [--size 300] [--queries 400] [--workers 1 2 4 8]
+
+--map also takes file:path/to/arena.map, in which case --size is ignored.
+"""
+import argparse
+import os
+import random
+import time
+from algorithms.batch import solve_batch
+from algorithms.engine import GridMap
+from algorithms.registry import SEARCHES
+from benchmarks.suite import make_map, parse_map
+
+
+def random_queries(grid_map, count, seed):
+    """`count` (start, end) pairs of free cells, drawn with a seeded generator."""
+    rng = random.Random(seed)
+    free = [index for index in range(grid_map.rows * grid_map.cols) if not grid_map.is_blocked(index)]
+    return [(grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))) for _ in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure batch query throughput per worker count.")
+    parser.add_argument("--map", default="random:0.3",
+                        help="map family, e.g. open random:0.3 maze rooms:16 file:arena.map")
+    parser.add_argument("--size", type=int, default=300, help="map side length (default: 300)")
+    parser.add_argument("--queries", type=int, default=400, help="number of (start, end) pairs (default: 400)")
+    parser.add_argument("--algorithm", choices=list(SEARCHES), default="a_star")
+    parser.add_argument("--workers", nargs="+", type=int,
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}), help="worker counts to try")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    spec, family, options = parse_map(args.map)
+    cells, rows, cols = make_map(family, args.size, args.seed, options)
+    grid_map = GridMap(cells, rows, cols)
+    queries = random_queries(grid_map, args.queries, args.seed)
+    print(f"{spec} {rows}x{cols}, {args.queries} queries, {args.algorithm}, {os.cpu_count()} CPUs")
+
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        solve_batch(grid_map, queries, args.algorithm, workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>3} workers: {elapsed:8.2f} s, {args.queries / elapsed:8.1f} queries/s, "
+              f"{baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark for the search frontiers.
+
+Records the push/pop sequence of a flood over an open grid (500x500 by default), then replays it against
+the thread-safe queue.PriorityQueue / queue.Queue and against the heapq / deque frontiers the algorithms use,
+and reports the cost per operation.
+
+    python -m benchmarks.frontier [--size 500]
+"""
+import argparse
+import time
+from queue import PriorityQueue, Queue
+from algorithms.engine import GridMap
+from algorithms.frontier import PriorityFrontier, FifoFrontier
+
+
+def record_priority_flood(grid_map):
+    """Uniform-cost flood from the top-left corner; returns its operations (None for a pop)."""
+    trace = [(0, 0)]
+    frontier = PriorityFrontier()
+    frontier.push(0, 0)
+    g_score = [float("inf")] * (grid_map.rows * grid_map.cols)
+    g_score[0] = 0
+    while frontier:
+        priority, current = frontier.pop()
+        trace.append(None)
+        for neighbor in grid_map.neighbors(current):
+            if priority + 1 < g_score[neighbor]:
+                g_score[neighbor] = priority + 1
+                frontier.push(neighbor, priority + 1)
+                trace.append((neighbor, priority + 1))
+    return trace
+
+
+def record_fifo_flood(grid_map):
+    """Breadth-first flood from the top-left corner; returns its operations (None for a pop)."""
+    trace = [0]
+    frontier = FifoFrontier()
+    frontier.push(0)
+    visited = bytearray(grid_map.rows * grid_map.cols)
+    visited[0] = 1
+    while frontier:
+        current = frontier.pop()
+        trace.append(None)
+        for neighbor in grid_map.neighbors(current):
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                frontier.push(neighbor)
+                trace.append(neighbor)
+    return trace
+
+
+def replay_priority(trace, push, pop):
+    start = time.perf_counter_ns()
+    for operation in trace:
+        if operation is None:
+            pop()
+        else:
+            push(*operation)
+    return time.perf_counter_ns() - start
+
+
+def replay_fifo(trace, push, pop):
+    start = time.perf_counter_ns()
+    for operation in trace:
+        if operation is None:
+            pop()
+        else:
+            push(operation)
+    return time.perf_counter_ns() - start
+
+
+def compare(name, trace, replay, locked, fast):
+    locked_ns = replay(trace, *locked) / len(trace)
+    fast_ns = replay(trace, *fast) / len(trace)
+    print(f"{name:>8}: {len(trace)} ops, queue module {locked_ns:.0f} ns/op, "
+          f"frontier {fast_ns:.0f} ns/op, {locked_ns / fast_ns:.1f}x faster")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare queue-module and heapq/deque frontiers.")
+    parser.add_argument("--size", type=int, default=500, help="grid side length (default: 500)")
+    args = parser.parse_args(argv)
+
+    grid_map = GridMap(bytearray(args.size * args.size), args.size, args.size)
+    print(f"{args.size}x{args.size} open grid")
+
+    locked_queue = PriorityQueue()
+    frontier = PriorityFrontier()
+    compare("priority", record_priority_flood(grid_map), replay_priority,
+            (lambda item, priority: locked_queue.put((priority, item)), locked_queue.get),
+            (frontier.push, frontier.pop))
+
+    locked_queue = Queue()
+    frontier = FifoFrontier()
+    compare("fifo", record_fifo_flood(grid_map), replay_fifo,
+            (locked_queue.put, locked_queue.get),
+            (frontier.push, frontier.pop))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Reproducible map families for benchmarking.
+
+Every generator takes a side length and a seed and returns a row-major bytearray of cell states, so the
+same arguments always produce the same map.
+"""
+import random
+from components.state import EMPTY, BARRIER
+
+
+def open_field(size, seed=0):
+    """No obstacles at all."""
+    return bytearray(size * size)
+
+
+def random_obstacles(size, seed=0, density=0.2):
+    """Each cell is a barrier with probability `density`."""
+    rng = random.Random(seed)
+    return bytearray(BARRIER if rng.random() < density else EMPTY for _ in range(size * size))
+
+
+def maze(size, seed=0):
+    """
+    Perfect maze carved by an iterative depth-first search.
+    Passages run along even rows and columns; walls fill the cells in between.
+    """
+    rng = random.Random(seed)
+    cells = bytearray([BARRIER]) * (size * size)
+    cells[0] = EMPTY
+    stack = [(0, 0)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc, dr // 2, dc // 2) for dr, dc in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 0 <= row + dr < size and 0 <= col + dc < size and cells[(row + dr) * size + col + dc] == BARRIER]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col, half_row, half_col = rng.choice(options)
+        cells[(row + half_row) * size + col + half_col] = EMPTY
+        cells[next_row * size + next_col] = EMPTY
+        stack.append((next_row, next_col))
+    return cells
+
+
+def rooms(size, seed=0, room_size=12):
+    """
+    Rectangular rooms separated by one-cell walls.
+    Every wall between two neighboring rooms has a single door at a random position.
+    """
+    rng = random.Random(seed)
+    cells = bytearray(size * size)
+    lines = range(room_size, size, room_size + 1)
+    for line in lines:
+        for i in range(size):
+            cells[line * size + i] = BARRIER  # horizontal wall
+            cells[i * size + line] = BARRIER  # vertical wall
+    bounds = [0] + [line + 1 for line in lines]
+    spans = [(low, min(low + room_size, size)) for low in bounds]
+    for line in lines:
+        for low, high in spans:
+            if high > low:
+                cells[line * size + rng.randrange(low, high)] = EMPTY
+                cells[rng.randrange(low, high) * size + line] = EMPTY
+    return cells
+
+
+MAP_FAMILIES = {
+    "open": open_field,
+    "random": random_obstacles,
+    "maze": maze,
+    "rooms": rooms,
+}
+
+
+def endpoints(cells, cols, placement="corners", seed=0):
+    """
+    Picks the start and end cells of a benchmark query on a map `cols` cells wide.
+    "corners" takes the first free cell from the top-left and the last free cell from the bottom-right;
+    "random" takes two free cells at random (seeded).
+    """
+    first = cells.find(bytes([EMPTY]))
+    if first == -1:
+        raise ValueError("Map has no free cells")
+    if placement == "random":
+        rng = random.Random(seed)
+        free = [index for index in range(len(cells)) if cells[index] == EMPTY]
+        return divmod(rng.choice(free), cols), divmod(rng.choice(free), cols)
+    return divmod(first, cols), divmod(cells.rfind(bytes([EMPTY])), cols)
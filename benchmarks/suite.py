@@ -0,0 +1,211 @@
+"""
+Benchmark suite comparing the headless searches across map families and sizes.
+
+Runs without opening a window and writes machine-readable results so regressions can be tracked between
+releases:
+
+    python -m benchmarks --maps open random:0.3 maze rooms --sizes 50 200 1000 --json results.json --csv results.csv
+
+A map can also be read from a file (a MovingAI .map or a packed map, see components/mapio.py) with
+--maps file:path/to/arena.map; it is run once at its own size, recorded as "ROWSxCOLS".
+
+Each (map, size, algorithm) record holds the median wall time over --repeat runs (time.perf_counter_ns),
+expansions and expansions per second, the peak traced memory of one extra run (tracemalloc), the path cost
+and whether it matches the optimal cost found by Dijkstra. With --diagonal the maps are 8-connected
+(sqrt(2) diagonals, no corner cutting unless --corner-cutting is given); searches that are 4-connected
+regardless of the map's mode, or that count moves (BFS), are then not checked for optimality. Searches that
+refuse a map with ValueError (ALT on octile distances, for one) are reported as unsupported and left out of
+the results.
+"""
+import argparse
+import csv
+import json
+import statistics
+import time
+import tracemalloc
+from algorithms.engine import GridMap
+from algorithms.registry import (DIAGONAL_SEARCHES, FOUR_CONNECTED_SEARCHES, INCREMENTAL_SEARCHES, MOVE_COUNT_SEARCHES,
+                                 PREPROCESSED_SEARCHES, SEARCHES, UNIT_COST_SEARCHES, available_searches, get_search)
+from benchmarks.maps import MAP_FAMILIES, endpoints
+from components.mapio import load_map
+
+FIELDS = ["map", "size", "seed", "endpoints", "start", "end", "algorithm", "time_ns", "expansions", "expansions_per_sec",
+          "peak_bytes", "cost", "optimal_cost", "optimal", "connectivity"]
+
+
+def parse_map(spec):
+    """Splits a map spec such as 'random:0.3' or 'file:arena.map' into its family and keyword arguments."""
+    family, _, argument = spec.partition(":")
+    if family == "file":
+        if not argument:
+            raise argparse.ArgumentTypeError("file maps need a path, e.g. file:arena.map")
+        return spec, family, {"path": argument}
+    if family not in MAP_FAMILIES:
+        raise argparse.ArgumentTypeError(f"unknown map family {family!r}; choose from {', '.join(MAP_FAMILIES)}")
+    if not argument:
+        return spec, family, {}
+    if family == "random":
+        return spec, family, {"density": float(argument)}
+    if family == "rooms":
+        return spec, family, {"room_size": int(argument)}
+    raise argparse.ArgumentTypeError(f"map family {family!r} takes no argument")
+
+
+def make_map(family, size, seed, options):
+    """(cells, rows, cols) of a generated size x size map, or of a map file at its own size."""
+    if family == "file":
+        return load_map(options["path"])
+    return MAP_FAMILIES[family](size, seed=seed, **options), size, size
+
+
+def time_search(search, grid_map, start, end, repeat):
+    """Returns the result of the last run and the median time in nanoseconds."""
+    timings = []
+    for _ in range(repeat):
+        begin = time.perf_counter_ns()
+        result = search(grid_map, start, end)
+        timings.append(time.perf_counter_ns() - begin)
+    return result, int(statistics.median(timings))
+
+
+def peak_memory(search, grid_map, start, end):
+    tracemalloc.start()
+    try:
+        search(grid_map, start, end)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def comparable(name, diagonal):
+    """Whether the named search moves like a map in the given mode, so its cost can be checked against Dijkstra's."""
+    if name in DIAGONAL_SEARCHES:
+        return diagonal
+    return not (diagonal and (name in FOUR_CONNECTED_SEARCHES or name in MOVE_COUNT_SEARCHES))
+
+
+def same_cost(cost, optimal_cost):
+    if cost is None or optimal_cost is None:
+        return cost is optimal_cost
+    return abs(cost - optimal_cost) < 1e-9
+
+
+def run(maps, sizes, algorithms, seed=0, repeat=3, measure_memory=True, placement="corners", log=print,
+        diagonal=False, corner_cutting=False):
+    """Runs every combination and returns a list of result records (dicts keyed by FIELDS)."""
+    records = []
+    optimal = get_search("dijkstra")
+    for spec, family, kwargs in maps:
+        for size in ([None] if family == "file" else sizes):
+            cells, rows, cols = make_map(family, size, seed, kwargs)
+            if size is None:
+                size = f"{rows}x{cols}"
+            grid_map = GridMap(cells, rows, cols, diagonal=diagonal, corner_cutting=corner_cutting)
+            start, end = endpoints(cells, cols, placement, seed)
+            optimal_cost = optimal(grid_map, start, end).cost
+            for name in algorithms:
+                if name in UNIT_COST_SEARCHES and grid_map.cost_range() != (1, 1):
+                    continue
+                search = get_search(name)
+                try:
+                    result, time_ns = time_search(search, grid_map, start, end, repeat)
+                except ValueError as error:
+                    # The search does not support this map, e.g. ALT on octile distances; the others still run.
+                    if log:
+                        log(f"{spec:>12} {size:>5}  {name:<10} unsupported: {error}")
+                    continue
+                record = {
+                    "map": spec,
+                    "size": size,
+                    "seed": seed,
+                    "endpoints": placement,
+                    "start": list(start),
+                    "end": list(end),
+                    "algorithm": name,
+                    "time_ns": time_ns,
+                    "expansions": result.expansions,
+                    "expansions_per_sec": round(result.expansions / (time_ns / 1e9)) if time_ns else None,
+                    "peak_bytes": peak_memory(search, grid_map, start, end) if measure_memory else None,
+                    "cost": result.cost,
+                    "optimal_cost": optimal_cost,
+                    "optimal": same_cost(result.cost, optimal_cost) if comparable(name, diagonal) else None,
+                    "connectivity": 8 if diagonal else 4,
+                }
+                records.append(record)
+                if log:
+                    log(format_record(record))
+    return records
+
+
+def format_record(record):
+    peak = "-" if record["peak_bytes"] is None else f"{record['peak_bytes'] / 1e6:.1f} MB"
+    return (f"{record['map']:>12} {record['size']:>5}  {record['algorithm']:<10}"
+            f"{record['time_ns'] / 1e6:>10.2f} ms {record['expansions']:>9} exp "
+            f"{record['expansions_per_sec'] or 0:>9} exp/s {peak:>9}  cost {record['cost']}"
+            f"{' (suboptimal)' if record['optimal'] is False else ''}")
+
+
+def bidirectional_reductions(records):
+    """Pairs each bidirectional run with its single-direction counterpart and returns the expansion ratios."""
+    single = {(r["map"], r["size"], r["algorithm"]): r["expansions"] for r in records}
+    reductions = []
+    for record in records:
+        name = record["algorithm"]
+        if not name.startswith("bidirectional_"):
+            continue
+        baseline = single.get((record["map"], record["size"], name[len("bidirectional_"):]))
+        if baseline:
+            reductions.append((record["map"], record["size"], name, baseline, record["expansions"]))
+    return reductions
+
+
+def write_json(records, path):
+    with open(path, "w") as file:
+        json.dump(records, file, indent=2)
+
+
+def write_csv(records, path):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the headless pathfinding algorithms.")
+    parser.add_argument("--maps", nargs="+", type=parse_map, default=[parse_map(m) for m in MAP_FAMILIES],
+                        help="map families, e.g. open random:0.3 maze rooms:16 file:arena.map "
+                             "(default: every generated family)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[50, 100, 200],
+                        help="map side lengths (default: 50 100 200)")
+    parser.add_argument("--algorithms", nargs="+", choices=list(SEARCHES), default=[
+                            name for name in available_searches() if name not in DIAGONAL_SEARCHES
+                            and name not in INCREMENTAL_SEARCHES and name not in PREPROCESSED_SEARCHES],
+                        help="searches to run (default: every 4-connected one whose dependencies are installed and "
+                             "that neither keeps state between queries nor preprocesses the map)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per combination (default: 3)")
+    parser.add_argument("--endpoints", choices=["corners", "random"], default="corners",
+                        help="query opposite corners or two seeded random free cells (default: corners)")
+    parser.add_argument("--diagonal", action="store_true", help="8-connected maps with sqrt(2) diagonal steps")
+    parser.add_argument("--corner-cutting", action="store_true",
+                        help="with --diagonal, allow a diagonal step past one blocked corner")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    args = parser.parse_args(argv)
+
+    records = run(args.maps, args.sizes, args.algorithms, args.seed, args.repeat, not args.no_memory, args.endpoints,
+                  diagonal=args.diagonal, corner_cutting=args.corner_cutting)
+    for family, size, name, baseline, expansions in bidirectional_reductions(records):
+        print(f"{family:>12} {size:>5}  {name}: {expansions} vs {baseline} expansions "
+              f"({expansions / baseline:.0%} of single-direction)")
+    if args.json:
+        write_json(records, args.json)
+    if args.csv:
+        write_csv(records, args.csv)
+    return records
+
+
+if __name__ == "__main__":
+    main()
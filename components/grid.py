@@ -1,41 +1,121 @@
-import pygame
-from spot import Spot
+from array import array
+from algorithms.engine import GridMap
+from components.spot import Spot
+from components.state import EMPTY, BARRIER, OPEN, CLOSED, PATH, REVERSE_OPEN, REVERSE_CLOSED, PALETTE, translation
+
+# bytes.translate tables used to clear many cells at once.
+CLEAR_ALL = translation({state: EMPTY for state in range(len(PALETTE))})
+CLEAR_KEEP_BARRIERS = translation({state: EMPTY for state in range(len(PALETTE)) if state != BARRIER})
+CLEAR_SEARCH = translation({state: EMPTY for state in (OPEN, CLOSED, PATH, REVERSE_OPEN, REVERSE_CLOSED)})
 
 class Grid:
-    def __init__(self, rows, width):
+    """
+    - Manages the entire grid where the pathfinding takes place.
+    - Cell states are stored as one byte per cell in a flat array('B') indexed by row * cols + col.
+      Spot objects are only created on demand as views into that buffer.
+
+    Methods:
+    - __init__: Initializes the grid with given dimensions, empty or from a state buffer such as a loaded map
+      (see components/mapio.py).
+    - make_grid: Clears every cell back to empty.
+    - spot: Returns the Spot view for a cell.
+    - get_state / set_state: Read and write a cell's state code. Changed cells are recorded in `dirty`
+      so the Renderer only repaints what changed; bulk changes set `redraw_all` instead.
+      Turning a cell into a barrier or back is reported to `grid_map.changed`.
+    - get_cost / set_cost / set_costs: Read and write the terrain layer, the cost of stepping into each cell
+      (1 by default). It is a flat array('B'), widened to array('H') once a cost above 255 is set, shared with
+      `grid_map`, and is only allocated once a cell gets a cost other than 1. Costs run from 1 to 65535.
+    - set_movement: Switches the searches (and Spot.neighbors) between 4- and 8-connected movement.
+    - get_clicked_pos: Translates pixel coordinates to grid coordinates.
+    - reset: Resets the grid to its initial state, with an option to clear barriers.
+    - clear_path: Clears the path after an algorithm has run.
+
+    Neighbors are never stored: the searches and Spot.neighbors generate them from the state buffer on the fly,
+    so editing a cell is immediately visible to the next query and nothing has to be rebuilt before a run.
+    """
+    def __init__(self, rows, width, cols=None, cells=None):
         self.rows = rows
+        self.cols = cols or rows
         self.width = width
-        self.gap = width // rows
-        self.grid = self._initialize_grid()
-
-    def _initialize_grid(self):
-        return [[Spot(i, j, self.gap, self.rows) for j in range(self.rows)] for i in range(self.rows)]
-
-    def draw_grid(self, window):
-        window.fill((255, 255, 255))  # White background
-        self._draw_all_spots(window)
-        self._draw_grid_lines(window)
-
-    def _draw_all_spots(self, window):
-        for row in self.grid:
-            for spot in row:
-                spot.draw(window)
-
-    def _draw_grid_lines(self, window):
-        for i in range(self.rows):
-            pygame.draw.line(window, (128, 128, 128), (0, i * self.gap), (self.width, i * self.gap))
-            pygame.draw.line(window, (128, 128, 128), (i * self.gap, 0), (i * self.gap, self.width))
-
-    def handle_click(self, position):
-        row, col = position[1] // self.gap, position[0] // self.gap
-        return self.grid[row][col]
-
-    def reset_grid(self):
-        for row in self.grid:
-            for spot in row:
-                spot.reset()
-
-    def update_grid_neighbors(self):
-        for row in self.grid:
-            for spot in row:
-                spot.update_neighbors(self.grid)
+        self.gap = max(1, width // max(self.rows, self.cols))
+        self.state = array("B", bytes(self.rows * self.cols) if cells is None else cells)
+        if len(self.state) != self.rows * self.cols:
+            raise ValueError(f"Expected {self.rows * self.cols} cells, got {len(self.state)}")
+        self.costs = None
+        self.grid_map = GridMap(self.state, self.rows, self.cols)
+        self.dirty = set()
+        self.redraw_all = True
+
+    def make_grid(self):
+        self._rewrite(CLEAR_ALL)
+
+    def spot(self, row, col):
+        return Spot(self, row * self.cols + col)
+
+    def get_state(self, index):
+        return self.state[index]
+
+    def set_state(self, index, state):
+        old_state = self.state[index]
+        if old_state != state:
+            self.state[index] = state
+            self.dirty.add(index)
+            if (old_state == BARRIER) != (state == BARRIER):
+                self.grid_map.changed(index)
+
+    def get_cost(self, index):
+        return 1 if self.costs is None else self.costs[index]
+
+    def set_cost(self, index, cost):
+        if not 1 <= cost <= 65535:
+            raise ValueError(f"Step costs must be between 1 and 65535, got {cost}")
+        if self.get_cost(index) == cost:
+            return
+        if self.costs is None:
+            # An all-ones layer costs the same as none, so the searches need not be told about it.
+            self.costs = array("B", [1]) * len(self.state)
+            self.grid_map.costs = memoryview(self.costs)
+        if cost > 255 and self.costs.typecode == "B":
+            # Widening keeps every cost, so only the edited cell is reported below.
+            self.costs = array("H", self.costs)
+            self.grid_map.costs = memoryview(self.costs)
+        self.costs[index] = cost
+        self.dirty.add(index)
+        self.grid_map.changed(index)
+
+    def set_costs(self, costs):
+        """Replaces the whole terrain layer, e.g. one loaded from a file; None goes back to unit costs."""
+        if costs is not None and len(costs) != len(self.state):
+            raise ValueError(f"Expected {len(self.state)} costs, got {len(costs)}")
+        self.costs = costs
+        self.grid_map.set_costs(costs)
+        self.redraw_all = True
+
+    def clear_costs(self):
+        if self.costs is not None:
+            self.set_costs(None)
+
+    def set_movement(self, diagonal, corner_cutting=False):
+        """8-connected movement when `diagonal` is set; see GridMap for the corner rule."""
+        if (self.grid_map.diagonal, self.grid_map.corner_cutting) != (diagonal, corner_cutting):
+            self.grid_map.set_movement(diagonal, corner_cutting)
+
+    def get_clicked_pos(self, pos):
+        y, x = pos
+        row = y // self.gap
+        col = x // self.gap
+        return row, col
+
+    def reset(self, clear_barriers=False):
+        self._rewrite(CLEAR_ALL if clear_barriers else CLEAR_KEEP_BARRIERS)
+
+    def clear_path(self):
+        self._rewrite(CLEAR_SEARCH)
+
+    def _rewrite(self, table):
+        cells = self.state.tobytes()
+        had_barriers = BARRIER in cells
+        self.state[:] = array("B", cells.translate(table))
+        self.redraw_all = True
+        if had_barriers and table[BARRIER] != BARRIER:
+            self.grid_map.changed()
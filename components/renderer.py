@@ -0,0 +1,284 @@
+import math
+import re
+import pygame
+from components.state import EMPTY, BARRIER, START, END, OPEN, CLOSED, PATH, REVERSE_OPEN, REVERSE_CLOSED, PALETTE
+
+try:
+    import numpy as np
+except ImportError:  # The far-zoom image needs NumPy (the `fast` extra); without it every zoom draws cell by cell.
+    np = None
+
+LINE_COLOR = (128, 128, 128)
+BACKGROUND_COLOR = (255, 255, 255)
+# Empty cells with a terrain cost above 1 are shaded towards this color, fully at TERRAIN_SHADE_MAX.
+TERRAIN_COLOR = (139, 90, 43)
+TERRAIN_SHADE_MAX = 10
+# Runs of bytes other than EMPTY, and of uint8 costs other than 1: a full redraw only visits these cells.
+NOT_EMPTY = re.compile(b"[^" + re.escape(bytes([EMPTY])) + b"]")
+NOT_UNIT = re.compile(b"[^\\x01]")
+
+# Pixels per cell from which every cell gets its own rect and grid lines; below it the grid is drawn from a
+# cached image with one pixel per cell (or per block of cells when a cell is smaller than a pixel).
+DETAIL_ZOOM = 4
+MAX_ZOOM = 64
+ZOOM_STEP = 1.25
+# When a block of cells shares one pixel, the state shown is the one that comes last here.
+DRAW_ORDER = (EMPTY, REVERSE_CLOSED, CLOSED, REVERSE_OPEN, OPEN, BARRIER, PATH, START, END)
+
+
+def terrain_color(cost):
+    """Color of an empty cell with the given step cost."""
+    share = min(cost - 1, TERRAIN_SHADE_MAX - 1) / (TERRAIN_SHADE_MAX - 1)
+    return tuple(round(white + (shade - white) * share) for white, shade in zip(BACKGROUND_COLOR, TERRAIN_COLOR))
+
+class Renderer:
+    """
+    - Draws a Grid through a camera that can zoom and pan, so grids larger than the window stay usable.
+    - Like the rest of the visualizer, a cell's row runs along the x axis and its column along the y axis.
+    - At DETAIL_ZOOM pixels per cell or more, only the visible cells are drawn, each inside its grid lines.
+      After the first frame only the visible spots whose state changed are repainted and passed to
+      pygame.display.update.
+    - Further out, the grid is kept as a cached image with one pixel per cell, built from the state buffer with
+      pygame.surfarray, and the visible part is scaled onto the window. Once cells are smaller than a pixel,
+      the image holds one pixel per block of cells showing the block's most important state (DRAW_ORDER).
+      Changed spots only recolor their pixel, so a 2000x2000 search animates at interactive frame rates.
+    - Empty spots with a terrain cost are shaded by cost, so the search colors still show on top of terrain.
+
+    Methods:
+    - draw: Repaints the dirty spots (or everything after a bulk change or a camera move) and updates the display.
+    - invalidate: Forces a full redraw on the next draw call.
+    - cell_at: The (row, col) under a window position, or None outside the grid.
+    - zoom_at / pan / fit: Move the camera; fit shows the whole grid, as at startup.
+    - handle_event: Applies a camera event (mouse wheel, middle-button drag, arrow keys, +/-, F); returns
+      whether the event was one.
+    """
+    def __init__(self, grid, win):
+        self.grid = grid
+        self.win = win
+        self.image = None
+        self.block = 1
+        self.fit()
+
+    def fit(self):
+        """Zooms so the whole grid fits the window, with whole pixels per cell when cells are a pixel or more."""
+        width, height = self.win.get_size()
+        zoom = min(width / self.grid.rows, height / self.grid.cols)
+        self.zoom = math.floor(zoom) if zoom >= 1 else zoom
+        self.offset = [0.0, 0.0]  # (row, col) at the top-left corner of the window
+        self.moved = True
+
+    def invalidate(self):
+        self.grid.redraw_all = True
+
+    def cell_at(self, pos):
+        x, y = pos
+        row = math.floor(self.offset[0] + x / self.zoom)
+        col = math.floor(self.offset[1] + y / self.zoom)
+        if 0 <= row < self.grid.rows and 0 <= col < self.grid.cols:
+            return row, col
+        return None
+
+    def zoom_at(self, pos, factor):
+        """Multiplies the zoom by `factor`, keeping the point under `pos` in place."""
+        width, height = self.win.get_size()
+        smallest = min(width / self.grid.rows, height / self.grid.cols, 1)
+        zoom = min(max(self.zoom * factor, smallest), MAX_ZOOM)
+        x, y = pos
+        self.offset[0] += x / self.zoom - x / zoom
+        self.offset[1] += y / self.zoom - y / zoom
+        self.zoom = zoom
+        self.moved = True
+
+    def pan(self, dx, dy):
+        """Moves the view by (dx, dy) window pixels."""
+        self.offset[0] += dx / self.zoom
+        self.offset[1] += dy / self.zoom
+        self.moved = True
+
+    def handle_event(self, event):
+        width, height = self.win.get_size()
+        if event.type == pygame.MOUSEWHEEL:
+            self.zoom_at(pygame.mouse.get_pos(), ZOOM_STEP ** event.y)
+        elif event.type == pygame.MOUSEMOTION and event.buttons[1]:
+            self.pan(-event.rel[0], -event.rel[1])
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+            step = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+            dx, dy = step[event.key]
+            self.pan(dx * width / 4, dy * height / 4)
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            self.zoom_at((width / 2, height / 2), ZOOM_STEP)
+        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.zoom_at((width / 2, height / 2), 1 / ZOOM_STEP)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+            self.fit()
+        else:
+            return False
+        return True
+
+    def draw(self):
+        if self.zoom < DETAIL_ZOOM and np is not None:
+            self._draw_image()
+        else:
+            self._draw_cells()
+
+    def _visible(self):
+        """Row and column ranges of the cells that are at least partly inside the window."""
+        width, height = self.win.get_size()
+        grid = self.grid
+        first_row = max(0, math.floor(self.offset[0]))
+        first_col = max(0, math.floor(self.offset[1]))
+        last_row = min(grid.rows, math.ceil(self.offset[0] + width / self.zoom))
+        last_col = min(grid.cols, math.ceil(self.offset[1] + height / self.zoom))
+        return range(first_row, last_row), range(first_col, last_col)
+
+    def _draw_cells(self):
+        grid = self.grid
+        self.image = None  # Not kept up to date in this mode
+        if grid.redraw_all or self.moved:
+            grid.redraw_all = False
+            self.moved = False
+            grid.dirty.clear()
+            self.win.fill(BACKGROUND_COLOR)
+            rows, cols = self._visible()
+            if self.zoom >= DETAIL_ZOOM:
+                self._draw_lines(rows, cols)
+            for index in self._painted_cells(rows, cols):
+                self._paint(index)
+            pygame.display.update()
+        elif grid.dirty:
+            rows, cols = self._visible()
+            rects = [self._paint(index) for index in grid.dirty
+                     if index // grid.cols in rows and index % grid.cols in cols]
+            grid.dirty.clear()
+            pygame.display.update(rects)
+
+    def _draw_lines(self, rows, cols):
+        if not rows or not cols:
+            return
+        left, right = self._screen(rows.start, 0), self._screen(rows.stop, 0)
+        top, bottom = self._screen(cols.start, 1), self._screen(cols.stop, 1)
+        for row in range(rows.start, rows.stop + 1):
+            x = self._screen(row, 0)
+            pygame.draw.line(self.win, LINE_COLOR, (x, top), (x, bottom))
+        for col in range(cols.start, cols.stop + 1):
+            y = self._screen(col, 1)
+            pygame.draw.line(self.win, LINE_COLOR, (left, y), (right, y))
+
+    def _screen(self, cell, axis):
+        """Window coordinate of the leading edge of a row (axis 0, along x) or column (axis 1, along y)."""
+        return math.floor((cell - self.offset[axis]) * self.zoom)
+
+    def _painted_cells(self, rows, cols):
+        """Visible cells that differ from the background, found with C-level scans of each visible row."""
+        grid = self.grid
+        state, costs = grid.state, grid.costs
+        cells = []
+        for row in rows:
+            start = row * grid.cols + cols.start
+            stop = row * grid.cols + cols.stop
+            cells += [start + match.start() for match in NOT_EMPTY.finditer(state[start:stop].tobytes())]
+            if costs is not None:
+                if costs.typecode == "B":
+                    cells += [start + match.start() for match in NOT_UNIT.finditer(costs[start:stop].tobytes())]
+                else:
+                    cells += [index for index in range(start, stop) if costs[index] > 1]
+        return set(cells)
+
+    def _color(self, index):
+        state = self.grid.state[index]
+        cost = self.grid.get_cost(index)
+        return terrain_color(cost) if state == EMPTY and cost > 1 else PALETTE[state]
+
+    def _paint(self, index):
+        """Fills one spot inside its grid lines and returns the rect that changed."""
+        row, col = divmod(index, self.grid.cols)
+        x, y = self._screen(row, 0), self._screen(col, 1)
+        width, height = self._screen(row + 1, 0) - x, self._screen(col + 1, 1) - y
+        if self.zoom >= DETAIL_ZOOM:
+            rect = pygame.Rect(x + 1, y + 1, width - 1, height - 1)
+        else:
+            rect = pygame.Rect(x, y, max(width, 1), max(height, 1))
+        self.win.fill(self._color(index), rect)
+        return rect
+
+    def _draw_image(self):
+        grid = self.grid
+        block = max(1, math.ceil(1 / self.zoom))
+        if self.image is None or block != self.block or grid.redraw_all:
+            self.block = block
+            self.image = self._build_image()
+        elif grid.dirty:
+            for cell in {(index // grid.cols // block, index % grid.cols // block) for index in grid.dirty}:
+                self.image.set_at(cell, self._block_color(*cell))
+        elif not self.moved:
+            return
+        grid.redraw_all = False
+        grid.dirty.clear()
+        self.moved = False
+        self._present()
+
+    def _build_image(self):
+        """One pixel per block of self.block x self.block cells, colored with pygame.surfarray."""
+        grid = self.grid
+        state = np.frombuffer(grid.state, dtype=np.uint8).reshape(grid.rows, grid.cols)
+        costs = None if grid.costs is None else np.asarray(grid.costs).reshape(grid.rows, grid.cols)
+        state, costs = self._pool(state, costs, self.block)
+        colors = np.array(PALETTE + (BACKGROUND_COLOR,) * (256 - len(PALETTE)), dtype=np.uint8)[state]
+        if costs is not None:
+            shades = np.array([terrain_color(cost) for cost in range(1, TERRAIN_SHADE_MAX + 1)], dtype=np.uint8)
+            shaded = (state == EMPTY) & (costs > 1)
+            colors[shaded] = shades[np.minimum(costs[shaded], TERRAIN_SHADE_MAX) - 1]
+        return pygame.surfarray.make_surface(colors)
+
+    @staticmethod
+    def _pool(state, costs, block):
+        """Reduces each block x block square to its most important state and its highest cost."""
+        if block == 1:
+            return state, costs
+        rows, cols = state.shape
+        padded_rows, padded_cols = -(-rows // block) * block, -(-cols // block) * block
+        rank = np.zeros(256, dtype=np.uint8)
+        rank[list(DRAW_ORDER)] = np.arange(len(DRAW_ORDER))
+        ranks = np.zeros((padded_rows, padded_cols), dtype=np.uint8)
+        ranks[:rows, :cols] = rank[state]
+        ranks = ranks.reshape(padded_rows // block, block, padded_cols // block, block).max(axis=(1, 3))
+        state = np.array(DRAW_ORDER, dtype=np.uint8)[ranks]
+        if costs is not None:
+            padded = np.ones((padded_rows, padded_cols), dtype=costs.dtype)
+            padded[:rows, :cols] = costs
+            costs = padded.reshape(padded_rows // block, block, padded_cols // block, block).max(axis=(1, 3))
+        return state, costs
+
+    def _block_color(self, block_row, block_col):
+        """Color of one image pixel, recomputed after one of its cells changed."""
+        grid, block = self.grid, self.block
+        if block == 1:
+            return self._color(block_row * grid.cols + block_col)
+        best, cost = EMPTY, 1
+        for row in range(block_row * block, min((block_row + 1) * block, grid.rows)):
+            for col in range(block_col * block, min((block_col + 1) * block, grid.cols)):
+                index = row * grid.cols + col
+                state = grid.state[index]
+                if DRAW_ORDER.index(state) > DRAW_ORDER.index(best):
+                    best = state
+                cost = max(cost, grid.get_cost(index))
+        return terrain_color(cost) if best == EMPTY and cost > 1 else PALETTE[best]
+
+    def _present(self):
+        """Scales the visible part of the image onto the window."""
+        width, height = self.win.get_size()
+        scale = self.zoom * self.block  # window pixels per image pixel
+        source = []
+        target = []
+        for axis, size, extent in ((0, self.image.get_width(), width), (1, self.image.get_height(), height)):
+            first = self.offset[axis] / self.block
+            low = max(0, math.floor(first))
+            high = min(size, math.ceil(first + extent / scale))
+            source.append((low, max(high - low, 0)))
+            target.append((math.floor((low - first) * scale), math.floor((high - first) * scale)))
+        self.win.fill(BACKGROUND_COLOR)
+        if source[0][1] and source[1][1]:
+            area = self.image.subsurface(pygame.Rect(source[0][0], source[1][0], source[0][1], source[1][1]))
+            size = (target[0][1] - target[0][0], target[1][1] - target[1][0])
+            self.win.blit(pygame.transform.scale(area, size), (target[0][0], target[1][0]))
+        pygame.display.update()
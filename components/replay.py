@@ -0,0 +1,133 @@
+"""
+Playing a recorded search back onto the grid.
+
+A search recorded with algorithms.stats.record runs at full speed without drawing; its (cell index, state)
+events are then replayed here, so watching a big search no longer means waiting for it, and one recording
+can be watched any number of times. Every event also remembers the state it overwrote, so the replay can run
+backwards as cheaply as forwards: seeking, stepping and scrubbing only apply the events in between.
+"""
+from array import array
+import pygame
+from components.state import BARRIER
+
+# Events applied per frame for each speed key.
+REPLAY_SPEEDS = {pygame.K_1: 1, pygame.K_2: 10, pygame.K_3: 100, pygame.K_4: 1000, pygame.K_5: 10000}
+BAR_HEIGHT = 10
+BAR_COLOR = (60, 60, 60)
+PROGRESS_COLOR = (255, 165, 0)
+
+
+class Replay:
+    """
+    - Replays recorded events onto a Grid that is in the state the search started from.
+    - Events for the cells in `endpoints` are skipped, as in run_visual, so the start and end stay visible.
+      So are events for cells that are barriers now: a search never reports one, so the grid was edited
+      since the recording and the wall must survive the replay.
+    - `position` is the number of events applied; `playing` advances it by `speed` events per frame.
+    - A progress bar along the bottom of the window shows the position and can be clicked or dragged.
+
+    Keys: Space pauses and resumes, ',' and '.' step one event back or forward, '[' and ']' jump a tenth of
+    the recording, Home and End jump to either end, '1'-'5' set the speed (1 to 10000 events per frame), and
+    Escape closes the replay with every event applied.
+    """
+    def __init__(self, grid, win, indices, states, endpoints=(), fps=60):
+        self.grid = grid
+        self.win = win
+        self.indices = array("I")
+        self.states = array("B")
+        # The state each event overwrote, to undo it when going backwards.
+        self.previous = array("B")
+        current = array("B", grid.state)
+        skip = set(endpoints)
+        for index, state in zip(indices, states):
+            if index in skip or current[index] == BARRIER:
+                continue
+            self.indices.append(index)
+            self.states.append(state)
+            self.previous.append(current[index])
+            current[index] = state
+        self.position = 0
+        self.playing = True
+        self.speed = 1
+        self.closed = False
+        self.scrubbing = False
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+
+    def __len__(self):
+        return len(self.indices)
+
+    def seek(self, position):
+        """Moves to `position` events from the start, applying or undoing the events in between."""
+        position = max(0, min(len(self), position))
+        set_state = self.grid.set_state
+        if position > self.position:
+            for index, state in zip(self.indices[self.position:position], self.states[self.position:position]):
+                set_state(index, state)
+        elif position < self.position:
+            for index, state in zip(reversed(self.indices[position:self.position]),
+                                    reversed(self.previous[position:self.position])):
+                set_state(index, state)
+        self.position = position
+
+    def advance(self):
+        """Called once per frame: waits for the frame's turn and applies the next `speed` events when playing."""
+        self.clock.tick(self.fps)
+        if self.playing:
+            self.seek(self.position + self.speed)
+            if self.position == len(self):
+                self.playing = False
+
+    def close(self):
+        self.seek(len(self))
+        self.closed = True
+        self.grid.redraw_all = True  # Paint over the progress bar
+
+    def handle_event(self, event):
+        """Applies a replay key or a click on the progress bar; returns whether the event was one."""
+        if event.type == pygame.KEYDOWN:
+            key = event.key
+            if key == pygame.K_SPACE:
+                if self.position == len(self):
+                    self.seek(0)
+                self.playing = not self.playing
+            elif key in (pygame.K_COMMA, pygame.K_PERIOD):
+                self.playing = False
+                self.seek(self.position + (1 if key == pygame.K_PERIOD else -1))
+            elif key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+                jump = max(1, len(self) // 10)
+                self.seek(self.position + (jump if key == pygame.K_RIGHTBRACKET else -jump))
+            elif key == pygame.K_HOME:
+                self.seek(0)
+            elif key == pygame.K_END:
+                self.seek(len(self))
+            elif key in REPLAY_SPEEDS:
+                self.speed = REPLAY_SPEEDS[key]
+                print(f"Replay speed: {self.speed} events per frame")
+            elif key == pygame.K_ESCAPE:
+                self.close()
+            else:
+                return False
+            return True
+        if event.type == pygame.MOUSEBUTTONDOWN and pygame.mouse.get_pressed()[0]:
+            self.scrubbing = self._bar().collidepoint(pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.scrubbing = False
+        if not self.scrubbing or event.type not in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
+            return False
+        # Once a drag started on the bar it keeps scrubbing wherever the mouse goes.
+        self.playing = False
+        self.seek(round(pygame.mouse.get_pos()[0] / self.win.get_width() * len(self)))
+        return True
+
+    def draw_bar(self):
+        """Draws the progress bar over the bottom of the window."""
+        bar = self._bar()
+        done = bar.width * self.position // max(1, len(self))
+        pygame.draw.rect(self.win, BAR_COLOR, bar)
+        pygame.draw.rect(self.win, PROGRESS_COLOR, pygame.Rect(bar.x, bar.y, done, bar.height))
+        pygame.display.update(bar)
+
+    def _bar(self):
+        width, height = self.win.get_size()
+        return pygame.Rect(0, height - BAR_HEIGHT, width, BAR_HEIGHT)
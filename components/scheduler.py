@@ -0,0 +1,61 @@
+import time
+import pygame
+
+# Expansions shown per frame for each speed key; None runs the search freely and samples it at the target FPS.
+SPEED_KEYS = {pygame.K_1: 1, pygame.K_2: 10, pygame.K_3: 100, pygame.K_4: None}
+
+class SearchCancelled(Exception):
+    """Raised from inside a running search when the window is closed."""
+
+class FrameScheduler:
+    """
+    - Callback handed to the algorithms in place of a raw draw function; the algorithms call it once per step.
+    - Decouples the search from rendering: a frame is only drawn every `steps_per_frame` steps, or, in instant
+      mode (steps_per_frame=None), whenever 1 / fps seconds have passed since the last frame.
+    - Polls pygame events at most once per frame interval so the speed can be changed and the view zoomed
+      and panned while a search runs.
+
+    Methods:
+    - __call__: Counts one search step and draws a frame when one is due.
+    - handle_key: Applies a speed key (1/2/3/4 for 1x/10x/100x/instant); returns whether the key was one.
+    - flush: Draws the final state once the algorithm returns.
+    """
+    def __init__(self, renderer, steps_per_frame=1, fps=60):
+        self.renderer = renderer
+        self.steps_per_frame = steps_per_frame
+        self.frame_time = 1 / fps
+        self.steps = 0
+        self.last_frame = time.perf_counter()
+
+    def __call__(self):
+        self.steps += 1
+        now = time.perf_counter()
+        if now - self.last_frame < self.frame_time:
+            if self.steps_per_frame is None or self.steps < self.steps_per_frame:
+                return
+        self.last_frame = now
+        self.steps = 0
+        self._poll_events()
+        self.renderer.draw()
+
+    def handle_key(self, key):
+        if key not in SPEED_KEYS:
+            return False
+        self.steps_per_frame = SPEED_KEYS[key]
+        speed = "instant" if self.steps_per_frame is None else f"{self.steps_per_frame}x"
+        print(f"Visualization speed: {speed}")
+        return True
+
+    def flush(self):
+        self.steps = 0
+        self.last_frame = time.perf_counter()
+        self.renderer.draw()
+
+    def _poll_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                raise SearchCancelled()
+            if self.renderer.handle_event(event):
+                continue
+            if event.type == pygame.KEYDOWN:
+                self.handle_key(event.key)
@@ -1,54 +1,83 @@
-import pygame
+from components.state import EMPTY, BARRIER, START, END, OPEN, CLOSED, PATH, PALETTE
 
 class Spot:
-    def __init__(self, row, col, width, total_rows):
-        self.row = row
-        self.col = col
-        self.x = row * width
-        self.y = col * width
-        self.color = (255, 255, 255)  
-        self.neighbors = []
-        self.width = width
-        self.total_rows = total_rows
+    """
+    - Lightweight view of one cell of a Grid.
+    - Holds only the grid and the flat cell index (row * cols + col); the state lives in the grid's byte buffer,
+      so spots are created on demand and two spots for the same cell compare equal.
+    """
+    __slots__ = ("grid", "index")
 
-    def get_pos(self):
-        return self.row, self.col
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, Spot) and self.index == other.index and self.grid is other.grid
+
+    def __hash__(self):
+        return hash(self.index)
+
+    def __repr__(self):
+        return f"Spot{self.get_pos()}"
 
-    def is_closed(self):
-        return self.color == (205, 92, 92)  # Indian Red
+    @property
+    def row(self):
+        return self.index // self.grid.cols
 
-    def is_open(self):
-        return self.color == (60, 179, 113)  # Medium Sea Green
+    @property
+    def col(self):
+        return self.index % self.grid.cols
 
-    def is_barrier(self):
-        return self.color == (47, 79, 79)  # Dark Slate Gray
+    @property
+    def x(self):
+        return self.row * self.grid.gap
 
-    def is_start(self):
-        return self.color == (255, 215, 0)  # Gold
+    @property
+    def y(self):
+        return self.col * self.grid.gap
 
-    def is_end(self):
-        return self.color == (100, 149, 237)  # Cornflower Blue
+    @property
+    def width(self):
+        return self.grid.gap
 
-    def reset(self):
-        self.color = (200, 200, 200)  # Light Grey
+    @property
+    def total_rows(self):
+        return self.grid.rows
 
-    def make_start(self): self.color = (255, 215, 0)  # Gold
-    def make_closed(self): self.color = (205, 92, 92)  # Indian Red
-    def make_open(self): self.color = (60, 179, 113)  # Medium Sea Green
-    def make_barrier(self): self.color = (47, 79, 79)  # Dark Slate Gray
-    def make_end(self): self.color = (100, 149, 237)  # Cornflower Blue
-    def make_path(self): self.color = (218, 165, 32)  # Golden Rod
+    @property
+    def state(self):
+        return self.grid.state[self.index]
+
+    @property
+    def cost(self):
+        return self.grid.get_cost(self.index)
+
+    @property
+    def color(self):
+        return PALETTE[self.grid.state[self.index]]
+
+    def get_pos(self):
+        return divmod(self.index, self.grid.cols)
 
-    def draw(self, win):
-        pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.width))
+    def is_closed(self): return self.state == CLOSED
+    def is_open(self): return self.state == OPEN
+    def is_barrier(self): return self.state == BARRIER
+    def is_start(self): return self.state == START
+    def is_end(self): return self.state == END
+    def is_path(self): return self.state == PATH
 
-    def update_neighbors(self, grid):
-        self.neighbors = []
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]  # DOWN, UP, RIGHT, LEFT
+    def reset(self): self.grid.set_state(self.index, EMPTY)
+    def make_start(self): self.grid.set_state(self.index, START)
+    def make_closed(self): self.grid.set_state(self.index, CLOSED)
+    def make_open(self): self.grid.set_state(self.index, OPEN)
+    def make_barrier(self): self.grid.set_state(self.index, BARRIER)
+    def make_end(self): self.grid.set_state(self.index, END)
+    def make_path(self): self.grid.set_state(self.index, PATH)
+    def make_terrain(self, cost): self.grid.set_cost(self.index, cost)
 
-        for dx, dy in directions:
-            row, col = self.row + dx, self.col + dy
-            if 0 <= row < self.total_rows and 0 <= col < self.total_rows:
-                neighbor = grid[row][col]
-                if not neighbor.is_barrier():
-                    self.neighbors.append(neighbor)
+    @property
+    def neighbors(self):
+        """Walkable neighbors, read straight from the grid's state buffer."""
+        grid = self.grid
+        return [Spot(grid, index) for index in grid.grid_map.neighbors(self.index)]
@@ -0,0 +1,28 @@
+"""
+Integer cell state codes for the compact grid.
+
+A grid stores one byte per cell; colors are only looked up in PALETTE when a cell is drawn.
+"""
+EMPTY, BARRIER, START, END, OPEN, CLOSED, PATH = range(7)
+# Frontier of the backward half of a bidirectional search.
+REVERSE_OPEN, REVERSE_CLOSED = 7, 8
+
+PALETTE = (
+    (255, 255, 255),  # EMPTY: White
+    (47, 79, 79),  # BARRIER: Dark Slate Gray
+    (255, 215, 0),  # START: Gold
+    (100, 149, 237),  # END: Cornflower Blue
+    (60, 179, 113),  # OPEN: Medium Sea Green
+    (205, 92, 92),  # CLOSED: Indian Red
+    (218, 165, 32),  # PATH: Golden Rod
+    (135, 206, 250),  # REVERSE_OPEN: Light Sky Blue
+    (70, 130, 180),  # REVERSE_CLOSED: Steel Blue
+)
+
+
+def translation(mapping):
+    """Builds a bytes.translate table that rewrites the states in `mapping` and keeps every other state."""
+    table = bytearray(range(256))
+    for old, new in mapping.items():
+        table[old] = new
+    return bytes(table)
@@ -0,0 +1,51 @@
+"""
+Saving and loading the terrain cost layer.
+
+The file is a small header followed by the raw costs in row-major order:
+
+    b"PFCOST1\\n", typecode ('B' for uint8, 'H' for uint16), rows and cols as little-endian uint32
+
+The costs themselves are stored little-endian, so files move between machines unchanged.
+"""
+import struct
+import sys
+from array import array
+
+MAGIC = b"PFCOST1\n"
+HEADER = struct.Struct("<cII")
+
+
+def save_costs(path, costs, rows, cols):
+    """Writes a cost layer (array('B') or array('H')) of a rows x cols grid to `path`."""
+    if costs.typecode not in ("B", "H"):
+        raise ValueError(f"Costs must be array('B') or array('H'), not array({costs.typecode!r})")
+    if len(costs) != rows * cols:
+        raise ValueError(f"Expected {rows * cols} costs, got {len(costs)}")
+    data = array(costs.typecode, costs)
+    if sys.byteorder == "big":
+        data.byteswap()
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(HEADER.pack(costs.typecode.encode(), rows, cols))
+        data.tofile(file)
+
+
+def load_costs(path):
+    """Reads a cost layer written by save_costs and returns (costs, rows, cols)."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a terrain cost file")
+        try:
+            typecode, rows, cols = HEADER.unpack(file.read(HEADER.size))
+        except struct.error:
+            raise ValueError(f"{path} is truncated") from None
+        if typecode not in (b"B", b"H"):
+            raise ValueError(f"{path} has costs of unsupported type {typecode!r}")
+        costs = array(typecode.decode())
+        try:
+            costs.fromfile(file, rows * cols)
+        except EOFError:
+            raise ValueError(f"{path} is truncated: expected {rows * cols} costs") from None
+    if sys.byteorder == "big":
+        costs.byteswap()
+    return costs, rows, cols
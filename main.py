@@ -1,139 +1,55 @@
+"""
+The pygame visualizer: run() initializes pygame and opens the window.
+
+Importing this module loads pygame, as components.renderer, components.replay and components.scheduler do,
+but starts nothing. Scripts that only need the grid, map files or the searches should import them from
+components.grid, components.mapio, components.terrain and algorithms/, which never import pygame.
+"""
+import argparse
+from array import array
 import pygame
-from algorithms.a_star import a_star
-from algorithms.dijkstra import dijkstra
-from algorithms.bfs import bfs
-pygame.init()
-
-class Grid:
-    """
-    - Manages the entire grid where the pathfinding takes place.
-    - Responsible for initializing the grid with spots (nodes), drawing it, and handling user interactions.
-
-    Methods:
-    - __init__: Initializes the grid with given dimensions.
-    - make_grid: Fills the grid with spot objects.
-    - draw: Renders the grid and its spots on the Pygame window.
-    - get_clicked_pos: Translates pixel coordinates to grid coordinates.
-    - reset: Resets the grid to its initial state, with an option to clear barriers.
-    - clear_path: Clears the path after an algorithm has run.
-    - update_neighbors: Updates the neighbors for each spot in the grid based on the current grid state.
-    """
-    def __init__(self, rows, width):
-        self.rows = rows
-        self.width = width
-        self.grid = []
-        self.gap = width // rows
-        self.make_grid()
-
-    def make_grid(self):
-        self.grid = []
-        for i in range(self.rows):
-            self.grid.append([])
-            for j in range(self.rows):
-                spot = Spot(i, j, self.gap, self.rows)
-                self.grid[i].append(spot)
-
-    def draw(self, win):
-        win.fill((255, 255, 255))  # Fill window with white
-        for row in self.grid:
-            for spot in row:
-                spot.draw(win)
-
-        for i in range(self.rows):
-            pygame.draw.line(win, (128, 128, 128), (0, i * self.gap), (self.width, i * self.gap))
-            for j in range(self.rows):
-                pygame.draw.line(win, (128, 128, 128), (j * self.gap, 0), (j * self.gap, self.width))
-
-    def get_clicked_pos(self, pos):
-        y, x = pos
-        row = y // self.gap
-        col = x // self.gap
-        return row, col
-
-    def reset(self, clear_barriers=False):
-        for row in self.grid:
-            for spot in row:
-                if clear_barriers or not spot.is_barrier():
-                    spot.reset()
-
-    def clear_path(self):
-        for row in self.grid:
-            for spot in row:
-                if spot.is_closed() or spot.is_open() or spot.is_path():
-                    spot.reset()
-
-    def update_neighbors(self):
-        for row in self.grid:
-            for spot in row:
-                spot.update_neighbors(self.grid)
-
-
-import pygame
-
-class Spot:
-    """
-    - Represents each cell/node in the grid.
-    - Manages the properties of each spot like its position, color, and its neighbors.
-
-    Methods:
-    - __init__: Initializes a spot with its row, column, width, and total rows.
-    - State Check Methods (is_closed, is_open, is_barrier, etc.): Check the current state of the spot.
-    - State Update Methods (make_start, make_closed, make_open, etc.): Update the state of the spot.
-    - draw: Draws the spot on the Pygame window.
-    - update_neighbors: Determines and updates neighboring spots based on grid layout and current state.
-    """
-    def __init__(self, row, col, width, total_rows):
-        self.row = row
-        self.col = col
-        self.x = row * width
-        self.y = col * width
-        self.color = (255, 255, 255)  
-        self.neighbors = []
-        self.width = width
-        self.total_rows = total_rows
-
-    def get_pos(self):
-        return self.row, self.col
-
-    def is_closed(self):
-        return self.color == (205, 92, 92)  # Indian Red
-
-    def is_open(self):
-        return self.color == (60, 179, 113)  # Medium Sea Green
-
-    def is_barrier(self):
-        return self.color == (47, 79, 79)  # Dark Slate Gray
-
-    def is_start(self):
-        return self.color == (255, 215, 0)  # Gold
-
-    def is_end(self):
-        return self.color == (100, 149, 237)  # Cornflower Blue
-
-    def reset(self):
-        self.color = (200, 200, 200)  # Light Grey
-
-    def make_start(self): self.color = (255, 215, 0)  # Gold
-    def make_closed(self): self.color = (205, 92, 92)  # Indian Red
-    def make_open(self): self.color = (60, 179, 113)  # Medium Sea Green
-    def make_barrier(self): self.color = (47, 79, 79)  # Dark Slate Gray
-    def make_end(self): self.color = (100, 149, 237)  # Cornflower Blue
-    def make_path(self): self.color = (218, 165, 32)  # Golden Rod
-
-    def draw(self, win):
-        pygame.draw.rect(win, self.color, (self.x, self.y, self.width, self.width))
-
-    def update_neighbors(self, grid):
-        self.neighbors = []
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]  # DOWN, UP, RIGHT, LEFT
-
-        for dx, dy in directions:
-            row, col = self.row + dx, self.col + dy
-            if 0 <= row < self.total_rows and 0 <= col < self.total_rows:
-                neighbor = grid[row][col]
-                if not neighbor.is_barrier():
-                    self.neighbors.append(neighbor)
-
+from algorithms.cache import PathCache
+from algorithms.components import ComponentIndex
+from algorithms.engine import run_visual
+from algorithms.registry import INSTRUMENTED_SEARCHES, NO_CORNER_CUTTING_SEARCHES, UNIT_COST_SEARCHES, get_search
+from algorithms.stats import SearchStats, record, load_trace
+from components.grid import Grid
+from components.renderer import Renderer
+from components.replay import Replay
+from components.scheduler import FrameScheduler, SearchCancelled
+from components.mapio import load_map, save_map
+from components.terrain import save_costs, load_costs
+
+# (key, shift held) -> (search name in the registry, name shown when it is selected)
+ALGORITHMS = {
+    (pygame.K_a, False): ("a_star", "A*"),
+    (pygame.K_d, False): ("dijkstra", "Dijkstra's"),
+    (pygame.K_b, False): ("bfs", "Breadth First Search (BFS)"),
+    (pygame.K_a, True): ("bidirectional_a_star", "Bidirectional A*"),
+    (pygame.K_d, True): ("bidirectional_dijkstra", "Bidirectional Dijkstra's"),
+    (pygame.K_b, True): ("bidirectional_bfs", "Bidirectional BFS"),
+    (pygame.K_j, False): ("jps", "Jump Point Search (JPS)"),
+    (pygame.K_j, True): ("jps_diagonal", "Jump Point Search (JPS) with diagonal moves"),
+    (pygame.K_h, False): ("hpa", "Hierarchical A* (HPA*)"),
+    (pygame.K_l, False): ("dstar_lite", "D* Lite (incremental replanning)"),
+    (pygame.K_n, False): ("alt", "A* with landmarks (ALT)"),
+}
+
+# Left-click brushes cycled with 'T': None draws barriers, a number paints terrain with that step cost.
+BRUSHES = (None, 3, 9)
+
+# Movement modes cycled with 'M': (diagonal, corner_cutting) -> name shown when it is selected.
+MOVEMENTS = {
+    (False, False): "4-connected",
+    (True, False): "8-connected, no corner cutting",
+    (True, True): "8-connected with corner cutting",
+}
+TERRAIN_FILE = "terrain.cost"
+# Ctrl+E writes the barriers here unless a map file was opened, in which case it is overwritten.
+MAP_FILE = "grid.pfmap"
+# With instrumentation ('I') or record mode ('R') on, the events of every run are written here (see
+# algorithms/stats.py); 'P' replays this file when nothing was recorded yet.
+TRACE_FILE = "search.trace"
 
 def draw_text(win, text, position, font, color=(0, 0, 0)):
     """
@@ -143,7 +59,7 @@ def draw_text(win, text, position, font, color=(0, 0, 0)):
     text_surface = font.render(text, True, color)
     win.blit(text_surface, position)
 
-def main(win, width, rows):
+def main(win, width, rows, map_path=None):
     """
     - The central function of the application where the Pygame loop is managed.
     - Handles user interactions, algorithm selection, and execution of pathfinding algorithms.
@@ -151,19 +67,59 @@ def main(win, width, rows):
     Process:
     - Initializes the grid and manages user inputs for setting start, end, and barriers.
     - Listens for key presses to select and execute the chosen algorithm.
+    - Runs the algorithm through a FrameScheduler so the visualization speed (keys 1-4) is independent of the search.
+    - Runs it through a PathCache, so repeating a query on an unchanged part of the map only redraws the path.
+    - Keeps a ComponentIndex on the map, so a query between disconnected regions fails without searching.
+    - 'I' toggles instrumentation: searches that support it then bypass the cache, print their SearchStats
+      and write their event trace to TRACE_FILE.
+    - 'R' toggles record mode: the search runs headless at full speed and its events are then replayed
+      through a Replay, which can pause, seek, scrub and change speed. 'P' replays the last recording again.
+    - Opens `map_path` (a MovingAI .map or packed map, see components/mapio.py) instead of an empty
+      rows x rows grid when it is given, and saves the barriers back with Ctrl+E.
+    - Lets the user paint terrain costs ('T' picks the brush) and save or load them (Ctrl+S / Ctrl+O).
+    - 'M' cycles the movement mode between 4-connected and 8-connected with or without corner cutting.
+    - The mouse wheel, '+' / '-', the arrow keys and middle-button drags zoom and pan the view; 'F' fits the
+      whole grid again. See Renderer.handle_event.
     - Displays the results of the algorithm once executed.
     - Handles application events like quitting, resetting, and clearing the path.
     """
-    grid = Grid(rows, width)
+    if map_path is None:
+        grid = Grid(rows, width)
+    else:
+        try:
+            cells, rows, cols = load_map(map_path)
+        except (OSError, ValueError) as error:
+            print(f"Could not open map: {error}")
+            pygame.quit()
+            return
+        grid = Grid(rows, width, cols, cells)
+        print(f"Opened {map_path}: {rows}x{cols}")
+    renderer = Renderer(grid, win)
+    scheduler = FrameScheduler(renderer)
+    cache = PathCache(grid.grid_map)
+    ComponentIndex(grid.grid_map)
     start = None
     end = None
     run = True
     started = False
     algorithm = None
     algorithm_result = None
+    brush = None
+    instrumented = False
+    recording = None
+    # The map version the recording was made on; None for one loaded from TRACE_FILE.
+    recorded_version = None
+    record_mode = False
+    replay = None
 
     while run:
-        draw(win, grid)
+        draw(renderer)
+        if replay is not None:
+            replay.advance()
+            if replay.closed:
+                replay = None
+            else:
+                replay.draw_bar()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
@@ -171,10 +127,18 @@ def main(win, width, rows):
             if started:
                 continue
 
-            if pygame.mouse.get_pressed()[0]:  # Left mouse button
-                pos = pygame.mouse.get_pos()
-                row, col = grid.get_clicked_pos(pos)
-                spot = grid.grid[row][col]
+            if replay is not None:
+                # The grid can be viewed but not edited until the replay is closed with Escape.
+                if not replay.handle_event(event):
+                    renderer.handle_event(event)
+                continue
+
+            if renderer.handle_event(event):
+                continue
+
+            cell = renderer.cell_at(pygame.mouse.get_pos())
+            if pygame.mouse.get_pressed()[0] and cell is not None:  # Left mouse button
+                spot = grid.spot(*cell)
                 if not start and spot != end:
                     start = spot
                     start.make_start()
@@ -182,42 +146,132 @@ def main(win, width, rows):
                     end = spot
                     end.make_end()
                 elif spot != end and spot != start:
-                    spot.make_barrier()
+                    if brush is None:
+                        spot.make_barrier()
+                    elif not spot.is_barrier():
+                        spot.make_terrain(brush)
 
-            elif pygame.mouse.get_pressed()[2]:  # Right mouse button
-                pos = pygame.mouse.get_pos()
-                row, col = grid.get_clicked_pos(pos)
-                spot = grid.grid[row][col]
+            elif pygame.mouse.get_pressed()[2] and cell is not None:  # Right mouse button
+                spot = grid.spot(*cell)
                 spot.reset()
+                spot.make_terrain(1)
                 if spot == start:
                     start = None
                 elif spot == end:
                     end = None
 
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_a:
-                    algorithm = a_star
-                    print("Selected algorithm: A*")
-                elif event.key == pygame.K_d:
-                    algorithm = dijkstra
-                    print("Selected algorithm: Dijkstra's")
-                elif event.key == pygame.K_b:
-                    algorithm = bfs
-                    print("Selected algorithm: Breadth First Search (BFS)")
+                shift = bool(pygame.key.get_mods() & pygame.KMOD_SHIFT)
+                if (event.key, shift) in ALGORITHMS:
+                    algorithm, name = ALGORITHMS[(event.key, shift)]
+                    print(f"Selected algorithm: {name}")
+                    if algorithm in UNIT_COST_SEARCHES and grid.grid_map.cost_range() != (1, 1):
+                        print("It assumes uniform costs and will not run while the grid has terrain")
+                    if algorithm in NO_CORNER_CUTTING_SEARCHES and grid.grid_map.corner_cutting:
+                        print("It does not cut corners and will not run until 'M' switches corner cutting off")
+                    if algorithm == "alt":
+                        # Build the tables now, or load them from next to the map file, rather than on the first run.
+                        # Like every search module, the landmarks are only imported once they are selected.
+                        from algorithms.landmarks import landmarks_for
+                        try:
+                            landmarks_for(grid.grid_map, map_path)
+                        except (OSError, ValueError) as error:
+                            print(f"Could not prepare the landmarks: {error}")
+                elif event.key == pygame.K_SPACE and start and end and algorithm and record_mode:
+                    grid.clear_path()
+                    try:
+                        result, recording = record(get_search(algorithm), grid.grid_map, start.get_pos(), end.get_pos(),
+                                                   algorithm in INSTRUMENTED_SEARCHES, TRACE_FILE)
+                    except ValueError as error:
+                        print(f"Could not run the search: {error}")
+                        continue
+                    recorded_version = grid.grid_map.version
+                    print(f"Recorded {len(recording.states)} events in {recording.search_ns / 1e9:.2f} seconds "
+                          f"({'no path' if result.path is None else f'path length {len(result.path) - 1}'})")
+                    replay = Replay(grid, win, recording.indices, recording.states, (start.index, end.index))
                 elif event.key == pygame.K_SPACE and start and end and not started and algorithm:
                     started = True
-                    for row in grid.grid:
-                        for spot in row:
-                            spot.update_neighbors(grid.grid)
 
                     # Store the results from the algorithm
-                    algorithm_result = algorithm(lambda: draw(win, grid), grid.grid, start, end)
+                    try:
+                        if instrumented and algorithm in INSTRUMENTED_SEARCHES:
+                            stats = SearchStats(trace=True)
+                            algorithm_result = run_visual(get_search(algorithm), scheduler, grid, start, end, stats)
+                            stats.export(TRACE_FILE)
+                            print(f"Wrote {len(stats.states)} events to {TRACE_FILE}")
+                        else:
+                            hits = cache.hits
+                            algorithm_result = run_visual(cache.cached(algorithm), scheduler, grid, start, end)
+                            if cache.hits > hits:
+                                print("Served from the path cache")
+                    except SearchCancelled:
+                        run = False
+                        break
+                    except ValueError as error:
+                        # e.g. ALT on an 8-connected map, whose diagonal costs its tables cannot hold, or JPS on terrain or with corner cutting
+                        print(f"Could not run the search: {error}")
+                        started = False
+                        continue
+                    scheduler.flush()
                     started = False
                     # Display the results
                     draw_results(win, algorithm_result)
+                elif scheduler.handle_key(event.key):
+                    pass
+                elif event.key == pygame.K_t:
+                    brush = BRUSHES[(BRUSHES.index(brush) + 1) % len(BRUSHES)]
+                    print("Brush: barriers" if brush is None else f"Brush: terrain with cost {brush}")
+                elif event.key == pygame.K_r:
+                    record_mode = not record_mode
+                    print(f"Record mode {'on' if record_mode else 'off'}")
+                elif event.key == pygame.K_p:
+                    if recording is None:
+                        try:
+                            recording = load_trace(TRACE_FILE)
+                            recorded_version = None
+                        except (OSError, ValueError) as error:
+                            print(f"Nothing to replay: {error}")
+                            continue
+                    elif recorded_version not in (None, grid.grid_map.version):
+                        print("The grid changed since the recording; press Space in record mode to record again")
+                        continue
+                    if (recording.rows, recording.cols) != (grid.rows, grid.cols):
+                        print(f"The recording is {recording.rows}x{recording.cols}, the grid is {grid.rows}x{grid.cols}")
+                        continue
+                    grid.clear_path()
+                    endpoints = [spot.index for spot in (start, end) if spot]
+                    replay = Replay(grid, win, recording.indices, recording.states, endpoints)
+                elif event.key == pygame.K_i:
+                    instrumented = not instrumented
+                    print(f"Instrumentation {'on' if instrumented else 'off'}")
+                elif event.key == pygame.K_m:
+                    modes = list(MOVEMENTS)
+                    mode = modes[(modes.index((grid.grid_map.diagonal, grid.grid_map.corner_cutting)) + 1) % len(modes)]
+                    grid.set_movement(*mode)
+                    print(f"Movement: {MOVEMENTS[mode]}")
+                elif event.key == pygame.K_s and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                    costs = grid.costs if grid.costs is not None else array("B", [1]) * (grid.rows * grid.cols)
+                    save_costs(TERRAIN_FILE, costs, grid.rows, grid.cols)
+                    print(f"Saved terrain to {TERRAIN_FILE}")
+                elif event.key == pygame.K_e and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                    path = map_path or MAP_FILE
+                    save_map(path, grid.state, grid.rows, grid.cols)
+                    print(f"Saved the barriers to {path}")
+                elif event.key == pygame.K_o and pygame.key.get_mods() & pygame.KMOD_CTRL:
+                    try:
+                        costs, rows, cols = load_costs(TERRAIN_FILE)
+                    except (OSError, ValueError) as error:
+                        print(f"Could not load terrain: {error}")
+                    else:
+                        if (rows, cols) == (grid.rows, grid.cols):
+                            grid.set_costs(costs)
+                            print(f"Loaded terrain from {TERRAIN_FILE}")
+                        else:
+                            print(f"{TERRAIN_FILE} is {rows}x{cols}, the grid is {grid.rows}x{grid.cols}")
                 elif event.key == pygame.K_c:
                     if pygame.key.get_mods() & pygame.KMOD_SHIFT:
                         grid.reset(clear_barriers=True)
+                        grid.clear_costs()
                     else:
                         grid.clear_path()
                     start = None
@@ -243,17 +297,32 @@ def draw_results(win, results):
 
 
 
-def draw(win, grid):
+def draw(renderer):
     """
     - Responsible for updating the Pygame window with the current state of the grid.
-    - Calls the draw method of the grid object to render its current state.
+    - Only the spots that changed since the last frame are repainted; see Renderer.
     """
-    win.fill((255, 255, 255))
-    grid.draw(win)
-    pygame.display.update()
+    renderer.draw()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Visualize pathfinding algorithms on a grid.")
+    parser.add_argument("map", nargs="?",
+                        help="MovingAI .map or packed map file to open (default: an empty 50x50 grid)")
+    return parser.parse_args(argv)
 
 # Pygame window setup
 WIDTH = 800
-WIN = pygame.display.set_mode((WIDTH, WIDTH))
-pygame.display.set_caption("Pathfinding Visualizer")
-main(WIN, WIDTH, 50)
+
+def run(argv=None):
+    """
+    - Entry point of the visualizer (`python main.py`, `python -m main` or the `pathfinding` script).
+    - Pygame is only initialized and the window only opened here, so importing this module has no side effects.
+    """
+    args = parse_args(argv)
+    pygame.init()
+    win = pygame.display.set_mode((WIDTH, WIDTH))
+    pygame.display.set_caption("Pathfinding Visualizer")
+    main(win, WIDTH, 50, args.map)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,61 @@
+'''Tests for the batch API: results must come back in query order and match running each search on its own, with or without worker processes.'''
+import os
+import random
+import sys
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap
+from algorithms.a_star import a_star_search
+from algorithms.dijkstra import dijkstra_search
+from algorithms.batch import solve_batch
+from benchmarks.maps import random_obstacles
+
+def make_queries(grid_map, count):
+    rng = random.Random(0)
+    free = [index for index in range(grid_map.rows * grid_map.cols) if not grid_map.is_blocked(index)]
+    return [(grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))) for _ in range(count)]
+
+def test_matches_single_queries():
+    grid_map = GridMap(random_obstacles(30, 3, density=0.3), 30, 30)
+    queries = make_queries(grid_map, 40)
+    for workers in (1, 2):
+        results = solve_batch(grid_map, queries, "a_star", workers=workers, chunksize=3)
+        assert len(results) == len(queries)
+        for (start, end), result in zip(queries, results):
+            expected = a_star_search(grid_map, start, end)
+            assert (result.start, result.end) == (start, end)
+            assert (result.path, result.cost, result.expansions) == expected
+            assert result.time_ns >= 0
+
+    print("Test passed: batch results are in order and match single queries.")
+
+def test_terrain_reaches_workers():
+    rng = random.Random(1)
+    cells = random_obstacles(29, 3, density=0.2)
+    for typecode, choices in (("B", (1, 2, 9)), ("H", (1, 300, 1000))):
+        costs = array(typecode, (rng.choice(choices) for _ in range(29 * 29)))
+        grid_map = GridMap(cells, 29, 29, costs)
+        queries = make_queries(grid_map, 12)
+        expected = [dijkstra_search(grid_map, start, end).cost for start, end in queries]
+        for workers in (1, 2):
+            results = solve_batch(grid_map, queries, "dijkstra", workers=workers)
+            assert [result.cost for result in results] == expected, f"{typecode} costs with {workers} workers"
+
+    print("Test passed: worker processes search with the map's terrain costs.")
+
+def test_unknown_algorithm():
+    grid_map = GridMap(bytearray(4), 2, 2)
+    try:
+        solve_batch(grid_map, [((0, 0), (1, 1))], "teleport")
+    except ValueError:
+        pass
+    else:
+        assert False, "an unknown algorithm should raise ValueError"
+
+    print("Test passed: an unknown algorithm is rejected before any work starts.")
+
+test_matches_single_queries()
+test_terrain_reaches_workers()
+test_unknown_algorithm()
@@ -0,0 +1,46 @@
+'''Tests for the bidirectional searches: on seeded random maps, mazes and rooms they must find paths exactly as short as plain BFS.'''
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap
+from algorithms.bfs import bfs_search
+from algorithms.bidirectional import bidirectional_bfs_search, bidirectional_dijkstra_search, bidirectional_a_star_search
+from benchmarks.maps import random_obstacles, maze, rooms
+
+SEARCHES = [bidirectional_bfs_search, bidirectional_dijkstra_search, bidirectional_a_star_search]
+
+def check_path(grid_map, path, start, end, cost):
+    assert path[0] == start and path[-1] == end and len(path) - 1 == cost
+    for (row1, col1), (row2, col2) in zip(path, path[1:]):
+        assert abs(row1 - row2) + abs(col1 - col2) == 1
+        assert not grid_map.is_blocked(grid_map.index((row2, col2)))
+
+def test_matches_bfs():
+    for seed in range(60):
+        rng = random.Random(seed)
+        size = rng.randint(2, 25)
+        for cells in (random_obstacles(size, seed, density=rng.random() * 0.4), maze(size, seed), rooms(size, seed, 4)):
+            grid_map = GridMap(cells, size, size)
+            free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+            start, end = grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))
+            expected = bfs_search(grid_map, start, end).cost
+            for search in SEARCHES:
+                path, cost, _ = search(grid_map, start, end)
+                assert cost == expected, f"{search.__name__} on seed {seed}: {cost} != {expected}"
+                if path is not None:
+                    check_path(grid_map, path, start, end, cost)
+
+    print("Test passed: bidirectional searches find optimal paths.")
+
+def test_same_start_and_end():
+    grid_map = GridMap(bytearray(9), 3, 3)
+    for search in SEARCHES:
+        assert search(grid_map, (1, 1), (1, 1)) == ([(1, 1)], 0, 0)
+
+    print("Test passed: a query from a cell to itself is trivial.")
+
+test_matches_bfs()
+test_same_start_and_end()
@@ -0,0 +1,132 @@
+'''Tests for the path cache: hits must return what a fresh search would, edits must drop exactly the entries they can affect, and the size limits must hold.'''
+import os
+import random
+import sys
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, BARRIER, EMPTY, PATH
+from algorithms.cache import PathCache
+from algorithms.components import ComponentIndex
+from algorithms.registry import get_search
+from benchmarks.maps import random_obstacles
+
+NAMES = ["a_star", "dijkstra", "bfs", "bidirectional_bfs", "jps"]
+
+def test_hits_stay_correct_across_edits():
+    hits = 0
+    for seed in range(15):
+        rng = random.Random(seed)
+        size = 12
+        cells = random_obstacles(size, seed, density=0.25)
+        grid_map = GridMap(cells, size, size)
+        cache = PathCache(grid_map)
+        queries = [(divmod(rng.randrange(size * size), size), divmod(rng.randrange(size * size), size)) for _ in range(6)]
+        queries = [(start, end) for start, end in queries
+                   if not grid_map.is_blocked(grid_map.index(start)) and not grid_map.is_blocked(grid_map.index(end))]
+        endpoints = {grid_map.index(cell) for query in queries for cell in query}
+        for _ in range(30):
+            for name in NAMES:
+                for start, end in queries:
+                    path, cost, _ = cache.search(name, start, end)
+                    expected = get_search(name)(grid_map, start, end)
+                    assert (path, cost) == (expected.path, expected.cost), f"{name} {start}->{end}, seed {seed}"
+            index = rng.choice([index for index in range(size * size) if index not in endpoints])
+            cells[index] = EMPTY if cells[index] == BARRIER else BARRIER
+            grid_map.changed(index)
+        hits += cache.hits
+    assert hits > 0
+
+    print("Test passed: cached results match fresh searches after every edit.")
+
+def test_selective_invalidation():
+    grid_map = GridMap(bytearray(20 * 20), 20, 20)
+    cache = PathCache(grid_map)
+    cache.search("a_star", (0, 0), (0, 5))
+    cache.search("a_star", (19, 0), (19, 5))
+    grid_map.cells[10 * 20 + 15] = BARRIER
+    grid_map.changed(10 * 20 + 15)
+    assert len(cache) == 2, "an edit far from both searches should keep them"
+    grid_map.cells[1 * 20 + 3] = BARRIER
+    grid_map.changed(1 * 20 + 3)
+    assert set(key[1] for key in cache.entries) == {(19, 0)}
+
+    print("Test passed: an edit only drops the searches that looked at the edited cell.")
+
+def test_hit_replays_path_only():
+    grid_map = GridMap(bytearray(100), 10, 10)
+    cache = PathCache(grid_map)
+    cache.search("dijkstra", (0, 0), (9, 9))
+    seen = []
+    path, cost, expansions = cache.search("dijkstra", (0, 0), (9, 9), lambda index, state: seen.append(state))
+    assert cost == 18 and expansions == 0 and len(path) == 19
+    assert seen == [PATH] * 17
+
+    print("Test passed: a cache hit only reports the path.")
+
+def test_limits():
+    grid_map = GridMap(bytearray(100), 10, 10)
+    cache = PathCache(grid_map, max_entries=3)
+    for col in range(5):
+        cache.search("bfs", (0, 0), (9, col))
+    assert len(cache) == 3 and list(cache.entries)[0] == ("bfs", (0, 0), (9, 2))
+    cache.search("bfs", (0, 0), (9, 2))
+    cache.search("bfs", (0, 0), (5, 5))
+    assert ("bfs", (0, 0), (9, 2)) in cache.entries, "a hit should refresh an entry"
+
+    cache = PathCache(grid_map, max_bytes=600)
+    for col in range(5):
+        cache.search("bfs", (0, 0), (9, col))
+    assert 0 < len(cache) < 5 and cache.bytes <= 600
+
+    cache = PathCache(grid_map)
+    cache.search("bfs", (0, 0), (9, 9))
+    grid_map.cells[55] = BARRIER  # written without calling changed()
+    grid_map.version += 1
+    cache.search("bfs", (0, 0), (9, 9))
+    assert cache.hits == 0
+
+    print("Test passed: the cache respects its entry and memory limits and notices unreported edits.")
+
+def test_component_shortcut_not_cached():
+    cells = bytearray(100)
+    cells[50:60] = bytes([BARRIER]) * 10
+    grid_map = GridMap(cells, 10, 10)
+    cache = PathCache(grid_map)
+    ComponentIndex(grid_map)
+    assert cache.search("a_star", (0, 0), (9, 9)) == (None, None, 0)
+    cells[55] = EMPTY
+    grid_map.changed(55)
+    assert cache.search("a_star", (0, 0), (9, 9)).cost == get_search("a_star")(grid_map, (0, 0), (9, 9)).cost == 18
+
+    print("Test passed: 'no path' answers from the component index are not cached.")
+
+def test_cheaper_step_anywhere_drops_a_star():
+    # A* scales its heuristic by the cheapest step on the map, so lowering a far-away cost can change its result.
+    size = 12
+    stale = 0
+    for seed in range(40):
+        rng = random.Random(seed)
+        costs = array("B", (rng.choice((5, 6)) for _ in range(size * size)))
+        grid_map = GridMap(bytearray(size * size), size, size, costs)
+        cache = PathCache(grid_map)
+        before = cache.search("a_star", (0, 0), (size - 1, size - 1))
+        cache.search("dijkstra", (0, 0), (size - 1, size - 1))
+        index = rng.randrange(size * size)
+        costs[index] = 1
+        grid_map.changed(index)
+        expected = get_search("a_star")(grid_map, (0, 0), (size - 1, size - 1)).cost
+        stale += expected != before.cost
+        assert cache.search("a_star", (0, 0), (size - 1, size - 1)).cost == expected, f"seed {seed}"
+        assert cache.search("dijkstra", (0, 0), (size - 1, size - 1)).cost == expected, f"seed {seed}"
+    assert stale, "some edits should have changed the optimal cost"
+
+    print("Test passed: lowering the cheapest step cost drops the cached A* results.")
+
+test_hits_stay_correct_across_edits()
+test_selective_invalidation()
+test_hit_replays_path_only()
+test_limits()
+test_component_shortcut_not_cached()
+test_cheaper_step_anywhere_drops_a_star()
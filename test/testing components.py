@@ -0,0 +1,113 @@
+'''Tests for the component index: its answers must match a flood fill after every barrier edit, and the searches must give up on disconnected queries without expanding a cell.'''
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, BARRIER, EMPTY
+from algorithms.components import ComponentIndex
+from algorithms.registry import SEARCHES, DIAGONAL_SEARCHES, get_search
+from benchmarks.maps import random_obstacles, rooms
+
+def flood(grid_map, source):
+    '''Every cell index reachable from `source` by 4-connected steps.'''
+    seen = {source}
+    queue = deque([source])
+    while queue:
+        for neighbor in grid_map.orthogonal_neighbors(queue.popleft()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return seen
+
+def check(grid_map, index, rng, samples=30):
+    free = [cell for cell in range(grid_map.rows * grid_map.cols) if not grid_map.is_blocked(cell)]
+    for source in rng.sample(free, min(samples, len(free))):
+        reachable = flood(grid_map, source)
+        for target in rng.sample(free, min(samples, len(free))):
+            assert index.separated(source, target) == (target not in reachable), (source, target)
+
+def test_matches_flood_fill():
+    rng = random.Random(0)
+    for size, density in ((12, 0.35), (25, 0.45), (30, 0.3)):
+        cells = random_obstacles(size, seed=size, density=density)
+        grid_map = GridMap(cells, size, size)
+        index = ComponentIndex(grid_map)
+        check(grid_map, index, rng)
+        for _ in range(200):
+            cell = rng.randrange(size * size)
+            cells[cell] = EMPTY if cells[cell] == BARRIER else BARRIER
+            grid_map.changed(cell)
+            assert index.labels is not None, "a single edit should be repaired in place"
+            if rng.random() < 0.2:
+                check(grid_map, index, rng, samples=10)
+        check(grid_map, index, rng)
+
+    print("Test passed: the index agrees with a flood fill through random barrier edits.")
+
+def test_splits_and_bulk_changes():
+    # A wall with one gap: closing the gap splits the map in two, opening it joins them again.
+    size = 9
+    cells = bytearray(size * size)
+    for row in range(size):
+        cells[row * size + 4] = BARRIER
+    cells[4 * size + 4] = EMPTY
+    grid_map = GridMap(cells, size, size)
+    index = ComponentIndex(grid_map)
+    assert index.connected((0, 0), (8, 8))
+    assert index.component((0, 4)) is None and not index.connected((0, 0), (0, 4))
+
+    cells[4 * size + 4] = BARRIER
+    grid_map.changed(4 * size + 4)
+    assert not index.connected((0, 0), (8, 8)) and index.connected((0, 0), (8, 3))
+    cells[4 * size + 4] = EMPTY
+    grid_map.changed(4 * size + 4)
+    assert index.connected((0, 0), (8, 8))
+
+    grid_map.set_movement(True)  # 8-connected maps have the same components
+    assert index.connected((0, 0), (8, 8))
+    cells[:] = bytes(size * size)
+    grid_map.changed()
+    assert index.connected((0, 0), (0, 4))
+    cells[0] = BARRIER  # an edit that was never reported is caught by the version
+    grid_map.version += 1
+    assert index.component((0, 0)) is None
+
+    print("Test passed: closing and opening a gap splits and joins, and bulk changes relabel.")
+
+def test_searches_skip_unreachable():
+    size = 40
+    cells = rooms(size, seed=3)
+    for row in range(size):
+        cells[row * size + size // 2] = BARRIER
+    start, end = (1, 1), (size - 2, size - 2)
+    cells[1 * size + 1] = cells[(size - 2) * size + size - 2] = EMPTY
+    for diagonal in (False, True):
+        grid_map = GridMap(cells, size, size, diagonal=diagonal)
+        ComponentIndex(grid_map)
+        for name in SEARCHES:
+            if name in DIAGONAL_SEARCHES and not diagonal:
+                continue
+            assert tuple(get_search(name)(grid_map, start, end)) == (None, None, 0), name
+
+    print("Test passed: every search answers a disconnected query without expanding a cell.")
+
+def test_build_time():
+    size = 1000
+    cells = random_obstacles(size, seed=1, density=0.3)
+    grid_map = GridMap(cells, size, size)
+    begin = time.perf_counter()
+    index = ComponentIndex(grid_map)
+    index.rebuild()
+    elapsed = time.perf_counter() - begin
+    assert elapsed < 3, f"labeling a {size}x{size} map took {elapsed:.2f} s"
+
+    print(f"Test passed: a megacell map is labeled in {elapsed:.2f} s.")
+
+test_matches_flood_fill()
+test_splits_and_bulk_changes()
+test_searches_skip_unreachable()
+test_build_time()
@@ -0,0 +1,127 @@
+'''Tests for 8-connected movement: the searches that follow the map's mode must find optimal paths under the octile (or Chebyshev) metric, honor the corner rule and keep the cache valid.'''
+import heapq
+import math
+import os
+import random
+import sys
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, BARRIER, EMPTY
+from algorithms.cache import PathCache
+from algorithms.registry import get_search
+from components.grid import Grid
+from benchmarks.maps import random_obstacles, maze, rooms
+
+def reference(grid_map, start, end, diagonal_cost, corner_cutting, terrain=True):
+    '''Plain-heap Dijkstra written against (row, col) moves, independent of GridMap.neighbors.'''
+    rows, cols = grid_map.rows, grid_map.cols
+    free = lambda row, col: 0 <= row < rows and 0 <= col < cols and not grid_map.is_blocked(row * cols + col)
+    distance = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        d, (row, col) = heapq.heappop(queue)
+        if (row, col) == end:
+            return d
+        if d > distance[(row, col)]:
+            continue
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                if not (d_row or d_col) or not free(row + d_row, col + d_col):
+                    continue
+                if d_row and d_col:
+                    sides = free(row + d_row, col) + free(row, col + d_col)
+                    if sides < (1 if corner_cutting else 2):
+                        continue
+                step = 1 if grid_map.costs is None or not terrain else grid_map.costs[(row + d_row) * cols + col + d_col]
+                nd = d + step * (diagonal_cost if d_row and d_col else 1)
+                if nd < distance.get((row + d_row, col + d_col), math.inf):
+                    distance[(row + d_row, col + d_col)] = nd
+                    heapq.heappush(queue, (nd, (row + d_row, col + d_col)))
+    return None
+
+def close(cost, expected):
+    return (cost is None) == (expected is None) and (cost is None or abs(cost - expected) < 1e-9)
+
+def check_moves(grid_map, path):
+    for (row1, col1), (row2, col2) in zip(path, path[1:]):
+        assert grid_map.index((row2, col2)) in grid_map.neighbors(grid_map.index((row1, col1))), f"illegal step {path}"
+
+def test_optimal_costs():
+    for seed in range(60):
+        rng = random.Random(seed)
+        size = rng.randint(2, 18)
+        corner_cutting = seed % 2 == 1
+        diagonal_cost = 1 if seed % 3 == 0 else math.sqrt(2)
+        for cells in (random_obstacles(size, seed, density=rng.random() * 0.4), maze(size, seed), rooms(size, seed, 4)):
+            costs = array("B", [rng.randint(1, 5) for _ in range(size * size)]) if seed % 4 == 0 else None
+            grid_map = GridMap(cells, size, size, costs, diagonal=True, corner_cutting=corner_cutting,
+                               diagonal_cost=diagonal_cost)
+            free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+            start, end = grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))
+
+            expected = reference(grid_map, start, end, diagonal_cost, corner_cutting)
+            for name in ("a_star", "dijkstra"):
+                path, cost, _ = get_search(name)(grid_map, start, end)
+                assert close(cost, expected), f"{name} on seed {seed}: {cost} != {expected}"
+                if path is not None:
+                    check_moves(grid_map, path)
+                    assert close(cost, sum(grid_map.step_cost(grid_map.index(a), grid_map.index(b))
+                                           for a, b in zip(path, path[1:])))
+
+            unit = reference(grid_map, start, end, diagonal_cost, corner_cutting, terrain=False)
+            for name in ("bidirectional_a_star", "bidirectional_dijkstra"):
+                path, cost, _ = get_search(name)(grid_map, start, end)
+                assert close(cost, unit), f"{name} on seed {seed}: {cost} != {unit}"
+                if path is not None:
+                    check_moves(grid_map, path)
+
+            moves = reference(grid_map, start, end, 1, corner_cutting, terrain=False)
+            for name in ("bfs", "bidirectional_bfs"):
+                path, cost, _ = get_search(name)(grid_map, start, end)
+                assert cost == moves, f"{name} on seed {seed}: {cost} != {moves}"
+                if path is not None:
+                    check_moves(grid_map, path)
+
+            if costs is None and diagonal_cost != 1 and not corner_cutting:
+                assert close(get_search("jps")(grid_map, start, end).cost, expected), f"jps on seed {seed}"
+
+    print("Test passed: the searches find optimal 8-connected paths with and without corner cutting.")
+
+def test_corner_rule():
+    # . #
+    # # .
+    cells = bytearray([EMPTY, BARRIER, BARRIER, EMPTY])
+    assert GridMap(cells, 2, 2, diagonal=True, corner_cutting=True).neighbors(0) == []
+    cells[1] = EMPTY
+    assert GridMap(cells, 2, 2, diagonal=True).neighbors(0) == [1]
+    assert GridMap(cells, 2, 2, diagonal=True, corner_cutting=True).neighbors(0) == [1, 3]
+    assert GridMap(bytearray(9), 3, 3, diagonal=True).neighbors(4) == [7, 1, 5, 3, 8, 6, 2, 0]
+    assert GridMap(bytearray(9), 3, 3).neighbors(4) == [7, 1, 5, 3]
+
+    print("Test passed: diagonal steps follow the corner rule.")
+
+def test_grid_movement():
+    grid = Grid(10, 100)
+    cache = PathCache(grid.grid_map)
+    assert cache.search("a_star", (0, 0), (9, 9)).cost == 18
+    grid.set_movement(True)
+    assert len(grid.spot(5, 5).neighbors) == 8
+    path, cost, _ = cache.search("a_star", (0, 0), (9, 9))
+    assert abs(cost - 9 * math.sqrt(2)) < 1e-9 and len(path) == 10
+
+    # Blocking a diagonal neighbor of the path is an edit a 4-connected cache would have missed.
+    cache.search("dijkstra", (0, 0), (0, 2))
+    grid.spot(1, 1).make_barrier()
+    grid.spot(1, 2).make_barrier()
+    assert ("dijkstra", (0, 0), (0, 2)) not in cache.entries
+    assert cache.search("dijkstra", (0, 0), (2, 2)).cost == 4
+    grid.set_movement(True, corner_cutting=True)
+    assert abs(cache.search("dijkstra", (0, 0), (2, 2)).cost - (2 + math.sqrt(2))) < 1e-9
+
+    print("Test passed: a Grid switches movement modes and its cache follows.")
+
+test_optimal_costs()
+test_corner_rule()
+test_grid_movement()
@@ -0,0 +1,65 @@
+'''Tests for D* Lite: after every edit or start move, the repaired plan must cost the same as a fresh A* search, and a small edit must cost far less work than the first plan.'''
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, BARRIER, EMPTY
+from algorithms.a_star import a_star_search
+from algorithms.dstar_lite import DStarLite
+from benchmarks.maps import random_obstacles, maze
+
+def check_path(grid_map, path, start, end):
+    assert path[0] == start and path[-1] == end
+    for (row1, col1), (row2, col2) in zip(path, path[1:]):
+        assert abs(row1 - row2) + abs(col1 - col2) == 1
+        assert not grid_map.is_blocked(row2 * grid_map.cols + col2)
+
+def test_repairs_match_fresh_searches():
+    for seed in range(25):
+        rng = random.Random(seed)
+        size = rng.randint(3, 20)
+        cells = (random_obstacles(size, seed, density=0.25) if seed % 2 else maze(size, seed))
+        grid_map = GridMap(cells, size, size)
+        free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+        start, end = grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))
+        planner = DStarLite(grid_map, end)
+        for step in range(40):
+            path, cost, _ = planner.plan(start)
+            expected = a_star_search(grid_map, start, end).cost
+            assert cost == expected, f"seed {seed}, step {step}: {cost} != {expected}"
+            if path is not None:
+                check_path(grid_map, path, start, end)
+            if rng.random() < 0.3:
+                # Move the start to a free neighbor, like a robot following its plan.
+                choices = [grid_map.position(cell) for cell in grid_map.neighbors(grid_map.index(start))]
+                if choices:
+                    start = rng.choice(choices)
+            else:
+                index = rng.randrange(size * size)
+                if index in (grid_map.index(start), grid_map.index(end)):
+                    continue
+                cells[index] = EMPTY if cells[index] == BARRIER else BARRIER
+                grid_map.changed(index)
+
+    print("Test passed: D* Lite repairs match fresh A* searches.")
+
+def test_small_edit_is_cheap():
+    size = 80
+    cells = random_obstacles(size, 1, density=0.2)
+    grid_map = GridMap(cells, size, size)
+    cells[0] = cells[size * size - 1] = EMPTY
+    planner = DStarLite(grid_map, (size - 1, size - 1))
+    path, _, first = planner.plan((0, 0))
+    row, col = path[len(path) // 2]
+    cells[row * size + col] = BARRIER
+    grid_map.changed(row * size + col)
+    _, cost, repair = planner.plan((0, 0))
+    assert cost == a_star_search(grid_map, (0, 0), (size - 1, size - 1)).cost
+    assert repair < first / 4, f"repair expanded {repair}, first plan {first}"
+
+    print("Test passed: repairing one edit expands a fraction of the first plan.")
+
+test_repairs_match_fresh_searches()
+test_small_edit_is_cheap()
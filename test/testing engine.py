@@ -0,0 +1,66 @@
+'''Tests for the headless search engine. Unlike the other test scripts, these run the real solvers from algorithms/ on a compact occupancy buffer, so no pygame window is involved.'''
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, BARRIER, EMPTY, OPEN, CLOSED, PATH
+from algorithms.a_star import a_star_search
+from algorithms.dijkstra import dijkstra_search
+from algorithms.bfs import bfs_search
+
+SEARCHES = [a_star_search, dijkstra_search, bfs_search]
+
+'''Builds the same 5x5 map as the Dijkstra test script: two horizontal walls that force the path along the right edge.'''
+def make_walled_map():
+    barriers = [(1, 1), (1, 2), (1, 3), (3, 1), (3, 2), (3, 3)]
+    cells = bytearray(25)
+    for row, col in barriers:
+        cells[row * 5 + col] = BARRIER
+    return GridMap(cells, 5, 5)
+
+def test_shortest_path_cost():
+    grid_map = make_walled_map()
+    for search in SEARCHES:
+        path, cost, expansions = search(grid_map, (0, 0), (4, 4))
+        assert cost == 8, f"{search.__name__} found cost {cost}"
+        assert len(path) == 9 and path[0] == (0, 0) and path[-1] == (4, 4)
+        assert all(not grid_map.is_blocked(grid_map.index(pos)) for pos in path)
+        assert expansions > 0
+
+    print("Test passed: all solvers find the optimal cost.")
+
+def test_no_path():
+    cells = bytearray(9)
+    for index in (1, 4, 7):
+        cells[index] = BARRIER
+    grid_map = GridMap(cells, 3, 3)
+    for search in SEARCHES:
+        path, cost, _ = search(grid_map, (0, 0), (0, 2))
+        assert path is None and cost is None, f"{search.__name__} found a path through a wall"
+
+    print("Test passed: unreachable goals report no path.")
+
+def test_observer_events():
+    grid_map = make_walled_map()
+    events = {OPEN: set(), CLOSED: set(), PATH: set()}
+    path, _, _ = a_star_search(grid_map, (0, 0), (4, 4), lambda index, state: events[state].add(index))
+    inner = {grid_map.index(pos) for pos in path[1:-1]}
+    assert events[PATH] == inner
+    assert grid_map.index((0, 0)) in events[CLOSED]
+
+    print("Test passed: observer sees open, closed and path events.")
+
+def test_rectangular_grid():
+    cells = bytes([EMPTY] * 12)
+    grid_map = GridMap(cells, 2, 6)
+    for search in SEARCHES:
+        _, cost, _ = search(grid_map, (0, 0), (1, 5))
+        assert cost == 6
+
+    print("Test passed: rectangular grids are supported.")
+
+test_shortest_path_cost()
+test_no_path()
+test_observer_events()
+test_rectangular_grid()
@@ -0,0 +1,77 @@
+'''Tests for the heapq and deque frontiers, including lazy decrease-key.'''
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.frontier import PriorityFrontier, BucketFrontier, FifoFrontier
+
+def test_priority_frontier():
+    frontier = PriorityFrontier()
+    frontier.push("a", 5)
+    frontier.push("b", 3)
+    frontier.push("c", 4)
+    assert frontier.push("a", 1) is True  # decrease-key
+    assert frontier.push("b", 7) is False  # not an improvement
+    assert len(frontier) == 3 and "a" in frontier
+
+    popped = [frontier.pop() for _ in range(3)]
+    assert popped == [(1, "a"), (3, "b"), (4, "c")], popped
+    assert not frontier
+
+    print("Test passed: superseded entries are skipped.")
+
+def test_priority_ties_are_fifo():
+    frontier = PriorityFrontier()
+    for item in (3, 1, 2):
+        frontier.push(item, 0)
+    assert [frontier.pop()[1] for _ in range(3)] == [3, 1, 2]
+
+    print("Test passed: equal priorities pop in insertion order.")
+
+def test_priority_update_and_remove():
+    frontier = PriorityFrontier()
+    frontier.push("a", 1)
+    frontier.push("b", 2)
+    frontier.push("c", 3)
+    frontier.update("a", 5)  # increase-key
+    frontier.remove("b")
+    frontier.update("d", 4)
+    assert len(frontier) == 3 and "b" not in frontier
+    assert frontier.peek() == 3
+    assert [frontier.pop() for _ in range(3)] == [(3, "c"), (4, "d"), (5, "a")]
+
+    print("Test passed: priorities can be raised and items removed.")
+
+def test_bucket_frontier():
+    frontier = BucketFrontier(3)
+    frontier.push("a", 0)
+    assert frontier.pop() == (0, "a")
+    frontier.push("b", 3)
+    frontier.push("c", 2)
+    frontier.push("d", 1)
+    assert frontier.push("b", 1) is True  # decrease-key
+    assert frontier.push("c", 3) is False
+    assert len(frontier) == 3 and frontier.peek() == 1
+    assert sorted([frontier.pop(), frontier.pop()]) == [(1, "b"), (1, "d")]
+    frontier.push("e", 4)  # wraps around the ring of buckets
+    assert [frontier.pop() for _ in range(2)] == [(2, "c"), (4, "e")]
+    assert not frontier
+
+    print("Test passed: the bucket frontier pops in priority order and wraps around.")
+
+def test_fifo_frontier():
+    frontier = FifoFrontier()
+    for item in range(5):
+        frontier.push(item)
+    assert len(frontier) == 5
+    assert [frontier.pop() for _ in range(5)] == list(range(5))
+    assert not frontier
+
+    print("Test passed: FIFO order is kept.")
+
+test_priority_frontier()
+test_priority_ties_are_fifo()
+test_priority_update_and_remove()
+test_bucket_frontier()
+test_fifo_frontier()
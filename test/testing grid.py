@@ -0,0 +1,48 @@
+'''Tests for the compact grid: one state byte per cell, Spot objects as on-demand views, and bulk resets that keep or drop barriers.'''
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.grid import Grid
+from components.state import EMPTY, BARRIER, START, OPEN, CLOSED, PATH, PALETTE
+
+def test_memory_per_cell():
+    tracemalloc.start()
+    grid = Grid(1000, 800)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert size / (grid.rows * grid.cols) < 2, f"{size} bytes for a 1000x1000 grid"
+
+    print("Test passed: the grid stores about one byte per cell.")
+
+def test_spot_views():
+    grid = Grid(4, 80, cols=6)
+    spot = grid.spot(2, 5)
+    assert spot.get_pos() == (2, 5) and spot.index == 17
+    assert spot == grid.spot(2, 5) and spot != grid.spot(3, 2)
+    spot.make_barrier()
+    assert grid.get_state(17) == BARRIER and grid.spot(2, 5).is_barrier()
+    assert spot.color == PALETTE[BARRIER]
+    assert spot not in grid.spot(1, 5).neighbors
+    assert grid.spot(1, 4) in grid.spot(1, 5).neighbors
+
+    print("Test passed: spots are views into the state buffer.")
+
+def test_clear_and_reset():
+    grid = Grid(3, 30)
+    for index, state in enumerate([START, BARRIER, OPEN, CLOSED, PATH]):
+        grid.set_state(index, state)
+    grid.clear_path()
+    assert list(grid.state[:5]) == [START, BARRIER, EMPTY, EMPTY, EMPTY]
+    grid.reset()
+    assert list(grid.state[:5]) == [EMPTY, BARRIER, EMPTY, EMPTY, EMPTY]
+    grid.reset(clear_barriers=True)
+    assert not any(grid.state)
+
+    print("Test passed: clearing keeps barriers unless asked otherwise.")
+
+test_memory_per_cell()
+test_spot_views()
+test_clear_and_reset()
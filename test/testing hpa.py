@@ -0,0 +1,71 @@
+'''Tests for hierarchical A*: paths must be valid and close to optimal, and updating a cluster after an edit must give the same graph as building it from scratch.'''
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, BARRIER, EMPTY
+from algorithms.a_star import a_star_search
+from algorithms.hpa import HierarchicalMap
+from benchmarks.maps import random_obstacles, maze, rooms
+
+def check_path(grid_map, path, start, end):
+    assert path[0] == start and path[-1] == end
+    for (row1, col1), (row2, col2) in zip(path, path[1:]):
+        assert abs(row1 - row2) + abs(col1 - col2) == 1
+        assert not grid_map.is_blocked(row2 * grid_map.cols + col2)
+
+def test_near_optimal_paths():
+    for seed in range(10):
+        rng = random.Random(seed)
+        size = rng.randint(5, 60)
+        for cells in (random_obstacles(size, seed, density=0.25), maze(size, seed), rooms(size, seed, 6)):
+            grid_map = GridMap(cells, size, size)
+            hierarchy = HierarchicalMap(grid_map, cluster_size=rng.randint(2, 10))
+            free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+            for _ in range(10):
+                start, end = grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))
+                path, cost, _ = hierarchy.search(start, end)
+                optimal = a_star_search(grid_map, start, end).cost
+                assert (cost is None) == (optimal is None), f"seed {seed}: {start}->{end}"
+                if cost is not None:
+                    check_path(grid_map, path, start, end)
+                    assert optimal <= cost <= optimal * 1.5 + 4, f"seed {seed}: cost {cost} vs {optimal}"
+
+    print("Test passed: HPA* finds valid, near-optimal paths.")
+
+def test_edits_match_rebuild():
+    for seed in range(10):
+        rng = random.Random(seed)
+        size = 24
+        cells = random_obstacles(size, seed, density=0.2)
+        grid_map = GridMap(cells, size, size)
+        hierarchy = HierarchicalMap(grid_map, cluster_size=6)
+        for _ in range(40):
+            index = rng.randrange(size * size)
+            cells[index] = EMPTY if cells[index] == BARRIER else BARRIER
+            grid_map.changed(index)
+        fresh = HierarchicalMap(GridMap(bytes(cells), size, size), cluster_size=6)
+        assert hierarchy.entrances == fresh.entrances
+        assert hierarchy.links == fresh.links
+        assert hierarchy.intra == fresh.intra, f"seed {seed}"
+
+    print("Test passed: updating clusters after edits matches a full rebuild.")
+
+def test_fewer_expansions_on_long_queries():
+    size = 256
+    grid_map = GridMap(random_obstacles(size, 1, density=0.2), size, size)
+    hierarchy = HierarchicalMap(grid_map)
+    free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+    start, end = grid_map.position(free[0]), grid_map.position(free[-1])
+    _, cost, expansions = hierarchy.search(start, end)
+    flat = a_star_search(grid_map, start, end)
+    assert cost <= flat.cost * 1.1
+    assert expansions < flat.expansions / 3, f"{expansions} vs {flat.expansions}"
+
+    print("Test passed: a long HPA* query expands far fewer cells than A*.")
+
+test_near_optimal_paths()
+test_edits_match_rebuild()
+test_fewer_expansions_on_long_queries()
@@ -0,0 +1,99 @@
+'''Tests for Jump Point Search. The 4-connected mode is compared with BFS and the diagonal mode with a small 8-connected Dijkstra (no corner cutting) defined below.'''
+import heapq
+import math
+import os
+import random
+import sys
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap
+from algorithms.bfs import bfs_search
+from algorithms.jps import jps_search
+from benchmarks.maps import open_field, random_obstacles, maze, rooms
+
+def dijkstra_8(grid_map, start, end):
+    rows, cols = grid_map.rows, grid_map.cols
+    free = lambda row, col: 0 <= row < rows and 0 <= col < cols and not grid_map.is_blocked(row * cols + col)
+    distance = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        d, (row, col) = heapq.heappop(queue)
+        if (row, col) == end:
+            return d
+        if d > distance[(row, col)]:
+            continue
+        for d_row in (-1, 0, 1):
+            for d_col in (-1, 0, 1):
+                if (d_row or d_col) and free(row + d_row, col + d_col):
+                    if d_row and d_col and not (free(row + d_row, col) and free(row, col + d_col)):
+                        continue
+                    nd = d + (math.sqrt(2) if d_row and d_col else 1)
+                    if nd < distance.get((row + d_row, col + d_col), math.inf):
+                        distance[(row + d_row, col + d_col)] = nd
+                        heapq.heappush(queue, (nd, (row + d_row, col + d_col)))
+    return None
+
+def test_optimal_costs():
+    for seed in range(80):
+        rng = random.Random(seed)
+        size = rng.randint(2, 20)
+        for cells in (random_obstacles(size, seed, density=rng.random() * 0.4), maze(size, seed), rooms(size, seed, 4)):
+            grid_map = GridMap(cells, size, size)
+            free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+            start, end = grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))
+
+            path, cost, _ = jps_search(grid_map, start, end)
+            assert cost == bfs_search(grid_map, start, end).cost, f"4-connected JPS on seed {seed}"
+            if path is not None:
+                assert len(path) - 1 == cost
+
+            expected = dijkstra_8(grid_map, start, end)
+            _, cost, _ = jps_search(grid_map, start, end, diagonal=True)
+            assert (cost is None) == (expected is None) and (cost is None or abs(cost - expected) < 1e-9), \
+                f"8-connected JPS on seed {seed}: {cost} != {expected}"
+
+    print("Test passed: JPS finds optimal paths in both modes.")
+
+def test_open_map_expansions():
+    grid_map = GridMap(open_field(300), 300, 300)
+    path, cost, expansions = jps_search(grid_map, (5, 5), (290, 250))
+    assert cost == 530 and len(path) == 531
+    assert expansions < 10, f"{expansions} jump points expanded on an open map"
+
+    print("Test passed: JPS expands only a few jump points on an open map.")
+
+def test_terrain_refused():
+    costs = array("B", [1]) * 100
+    grid_map = GridMap(bytearray(100), 10, 10, costs)
+    assert jps_search(grid_map, (0, 0), (9, 9)).cost == 18, "an all-ones layer is the same as none"
+    costs[55] = 9
+    grid_map.changed(55)
+    for diagonal in (False, True):
+        try:
+            jps_search(grid_map, (0, 0), (9, 9), diagonal=diagonal)
+        except ValueError:
+            pass
+        else:
+            assert False, "JPS should refuse a map with terrain instead of ignoring it"
+
+    print("Test passed: JPS refuses maps with terrain.")
+
+def test_corner_cutting_refused():
+    grid_map = GridMap(bytearray(100), 10, 10, diagonal=True, corner_cutting=True)
+    try:
+        jps_search(grid_map, (0, 0), (9, 9))
+    except ValueError:
+        pass
+    else:
+        assert False, "JPS should refuse a map that allows corner cutting instead of ignoring it"
+    grid_map.set_movement(True, False)
+    assert abs(jps_search(grid_map, (0, 0), (9, 9)).cost - 9 * 2 ** 0.5) < 1e-9
+
+    print("Test passed: JPS refuses maps that allow corner cutting.")
+
+test_optimal_costs()
+test_open_map_expansions()
+test_terrain_refused()
+test_corner_cutting_refused()
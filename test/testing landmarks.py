@@ -0,0 +1,110 @@
+'''Tests for ALT: A* with landmark heuristics must stay optimal, expand fewer cells than A* on mazes and rooms, and persist its tables next to the map.'''
+import os
+import random
+import sys
+import tempfile
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, BARRIER
+from algorithms.a_star import a_star_search
+from algorithms.dijkstra import dijkstra_search
+from algorithms.landmarks import build_landmarks, landmarks_for, landmark_path, save_landmarks, load_landmarks
+from benchmarks.maps import maze, rooms, random_obstacles
+
+def queries(cells, size, count, seed):
+    rng = random.Random(seed)
+    free = [index for index in range(size * size) if cells[index] != BARRIER]
+    return [(divmod(rng.choice(free), size), divmod(rng.choice(free), size)) for _ in range(count)]
+
+def test_optimal_and_fewer_expansions():
+    size = 81
+    for name, cells in (("maze", maze(size, seed=1)), ("rooms", rooms(size, seed=1)),
+                        ("random", random_obstacles(size, seed=1, density=0.3))):
+        rng = random.Random(0)
+        for costs, diagonal in ((None, False), (array("B", (rng.choice((1, 1, 3, 9)) for _ in range(size * size))), False),
+                                (None, True)):
+            grid_map = GridMap(cells, size, size, costs, diagonal=diagonal, diagonal_cost=1)
+            landmarks = build_landmarks(grid_map)
+            assert landmarks.typecode == "H" and 0 < len(landmarks.landmarks) <= 8
+            plain = alt = 0
+            for start, end in queries(cells, size, 15, seed=2):
+                expected = dijkstra_search(grid_map, start, end).cost
+                result = a_star_search(grid_map, start, end, landmarks=landmarks)
+                assert result.cost == expected, f"{name}: {start} -> {end} cost {result.cost}, expected {expected}"
+                alt += result.expansions
+                plain += a_star_search(grid_map, start, end).expansions
+            assert alt < plain, f"{name}: ALT expanded {alt} cells, A* {plain}"
+
+    print("Test passed: ALT paths are optimal and expand fewer cells than A*.")
+
+def test_wide_distances():
+    # Costly terrain pushes the distances past 16 bits.
+    size = 40
+    costs = array("H", [1000]) * (size * size)
+    grid_map = GridMap(bytearray(size * size), size, size, costs)
+    landmarks = build_landmarks(grid_map, count=3)
+    assert landmarks.typecode == "I"
+    assert a_star_search(grid_map, (0, 0), (39, 39), landmarks=landmarks).cost == 78 * 1000
+
+    cells = bytearray(size * size)
+    cells[size:] = bytes([BARRIER]) * (size * size - size)
+    walled = GridMap(cells, size, size)
+    landmarks = build_landmarks(walled)
+    assert all(table[size * size - 1] == landmarks.unreachable for table in landmarks.tables)
+    assert a_star_search(walled, (0, 0), (0, 39), landmarks=landmarks).cost == 39
+
+    print("Test passed: long distances use uint32 and unreachable cells are marked.")
+
+def test_persistence():
+    size = 41
+    cells = maze(size, seed=5)
+    grid_map = GridMap(cells, size, size)
+    with tempfile.TemporaryDirectory() as directory:
+        map_path = os.path.join(directory, "maze.map")
+        built = landmarks_for(grid_map, map_path)
+        assert os.path.exists(landmark_path(map_path))
+        loaded = load_landmarks(landmark_path(map_path), grid_map)
+        assert loaded.landmarks == built.landmarks and loaded.tables == built.tables
+
+        for other in (GridMap(cells, size, size, diagonal=True, diagonal_cost=1), GridMap(maze(size, seed=6), size, size)):
+            try:
+                load_landmarks(landmark_path(map_path), other)
+            except ValueError:
+                pass
+            else:
+                assert False, "tables for another map or movement mode should be rejected"
+
+        with open(landmark_path(map_path), "r+b") as file:
+            file.truncate(100)
+        try:
+            load_landmarks(landmark_path(map_path), grid_map)
+        except ValueError:
+            pass
+        else:
+            assert False, "a truncated file should be rejected"
+        save_landmarks(landmark_path(map_path), built)
+
+    cells[size + 1] = BARRIER if cells[size + 1] != BARRIER else 0
+    grid_map.changed(size + 1)
+    try:
+        a_star_search(grid_map, (1, 1), (size - 2, size - 2), landmarks=built)
+    except ValueError:
+        pass
+    else:
+        assert False, "stale tables should be refused"
+    assert landmarks_for(grid_map) is not built
+
+    try:
+        build_landmarks(GridMap(cells, size, size, diagonal=True))
+    except ValueError:
+        pass
+    else:
+        assert False, "octile distances do not fit the integer tables"
+
+    print("Test passed: tables are saved next to the map and only loaded for the same map.")
+
+test_optimal_and_fewer_expansions()
+test_wide_distances()
+test_persistence()
@@ -0,0 +1,90 @@
+'''Tests for map files: MovingAI .map and packed maps must round-trip every barrier, reject broken files and open large maps quickly.'''
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import BARRIER, EMPTY, OPEN, PATH
+from components.grid import Grid
+from components.mapio import load_map, save_map, load_movingai, load_packed
+
+MOVINGAI = b"""type octile
+height 3
+width 5
+map
+..@TW
+GS.O.
+@...@
+"""
+
+def test_round_trips():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        for rows, cols in ((1, 1), (3, 5), (7, 9), (16, 16), (33, 2)):
+            states = bytearray(rng.choice((EMPTY, BARRIER, BARRIER, OPEN, PATH)) for _ in range(rows * cols))
+            barriers = bytearray(BARRIER if state == BARRIER else EMPTY for state in states)
+            for name in ("grid.map", "grid.pfmap", "grid.bin"):
+                path = os.path.join(directory, name)
+                save_map(path, states, rows, cols)
+                assert load_map(path) == (barriers, rows, cols), f"{name} {rows}x{cols}"
+        assert os.path.getsize(os.path.join(directory, "grid.pfmap")) == 16 + (33 * 2 + 7) // 8
+
+    print("Test passed: both formats keep exactly the barriers.")
+
+def test_movingai_terrain():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sample.map")
+        with open(path, "wb") as file:
+            file.write(MOVINGAI.replace(b"\n", b"\r\n"))
+        cells, rows, cols = load_movingai(path)
+        assert (rows, cols) == (3, 5)
+        assert cells == bytearray([0, 0, 1, 1, 1, 0, 0, 0, 1, 0, 1, 0, 0, 0, 1])
+
+        for broken in (MOVINGAI.replace(b"map\n", b""), MOVINGAI.replace(b"height 3", b"height 4"),
+                       MOVINGAI.replace(b"GS.O.", b"GS.O"), MOVINGAI.replace(b"GS.O.", b"GS.O?")):
+            with open(path, "wb") as file:
+                file.write(broken)
+            try:
+                load_movingai(path)
+            except ValueError:
+                pass
+            else:
+                assert False, f"{broken!r} should be rejected"
+
+        packed = os.path.join(directory, "sample.pfmap")
+        truncated = b"PFMAP1\n\0" + (5).to_bytes(4, "little") * 2 + b"\0"
+        for content in (b"", truncated, b"not a map file at all"):
+            with open(packed, "wb") as file:
+                file.write(content)
+            try:
+                load_packed(packed)
+            except ValueError:
+                pass
+            else:
+                assert False, f"{content!r} should be rejected"
+
+    print("Test passed: MovingAI terrain is read and broken files are rejected.")
+
+def test_open_large_map():
+    rows, cols = 2000, 2047
+    # A quarter of the cells are barriers: a random byte is one when its two low bits are both set.
+    cells = bytearray(random.Random(1).randbytes(rows * cols).translate(bytes(state & 3 == 3 for state in range(256))))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "random.pfmap")
+        save_map(path, cells, rows, cols)
+        start = time.perf_counter()
+        loaded, rows, cols = load_map(path)
+        grid = Grid(rows, 800, cols, loaded)
+        elapsed = time.perf_counter() - start
+    assert elapsed < 1, f"opening a {rows}x{cols} map took {elapsed:.2f} s"
+    assert grid.grid_map.cells == cells
+    assert grid.state[0] == cells[0] and grid.grid_map.rows == rows and grid.grid_map.cols == cols
+
+    print("Test passed: a 4-megacell map opens in well under a second.")
+
+test_round_trips()
+test_movingai_terrain()
+test_open_large_map()
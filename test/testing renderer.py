@@ -0,0 +1,78 @@
+'''Tests for the renderer's camera: clicks map to the cell under the cursor at any zoom, only visible cells are painted, and far zoom shows blocks of cells from a downsampled image. Runs headless on SDL's dummy video driver.'''
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import pygame
+from components.grid import Grid
+from components.renderer import Renderer, DETAIL_ZOOM
+from components.state import BARRIER, OPEN, PATH, PALETTE
+
+pygame.init()
+
+def test_fit_and_clicks():
+    win = pygame.display.set_mode((800, 800))
+    grid = Grid(50, 800)
+    renderer = Renderer(grid, win)
+    assert renderer.zoom == grid.gap == 16
+    assert renderer.cell_at((17, 33)) == grid.get_clicked_pos((17, 33)) == (1, 2)
+    grid.spot(1, 2).make_barrier()
+    renderer.draw()
+    assert win.get_at((20, 40))[:3] == PALETTE[BARRIER]
+
+    renderer.zoom_at((100, 300), 2.5)
+    assert renderer.cell_at((100, 300)) == (6, 18), "zooming should keep the cell under the cursor"
+    renderer.pan(-10000, 0)
+    assert renderer.cell_at((0, 300)) is None
+    renderer.fit()
+    assert renderer.cell_at((799, 799)) == (49, 49)
+
+    print("Test passed: window positions map to cells at every zoom and pan.")
+
+def test_culling():
+    win = pygame.display.set_mode((400, 400))
+    grid = Grid(1000, 400)
+    renderer = Renderer(grid, win)
+    renderer.zoom_at((0, 0), 20 / renderer.zoom)
+    assert renderer.zoom == 20 >= DETAIL_ZOOM
+    for index in range(0, 1000 * 1000, 997):
+        grid.set_state(index, BARRIER)
+    rows, cols = renderer._visible()
+    assert (len(rows), len(cols)) == (20, 20)
+    assert all(index // 1000 < 20 and index % 1000 < 20 for index in renderer._painted_cells(rows, cols))
+    renderer.draw()
+
+    grid.spot(500, 500).make_path()
+    grid.spot(3, 4).make_open()
+    renderer.draw()
+    assert not grid.dirty
+    assert win.get_at((3 * 20 + 5, 4 * 20 + 5))[:3] == PALETTE[OPEN]
+
+    print("Test passed: only the visible cells are painted.")
+
+def test_far_zoom_image():
+    win = pygame.display.set_mode((200, 200))
+    grid = Grid(1000, 200)
+    renderer = Renderer(grid, win)
+    renderer.draw()
+    assert renderer.zoom == 0.2 and renderer.block == 5 and renderer.image.get_size() == (200, 200)
+
+    grid.spot(12, 37).make_barrier()  # block (2, 7)
+    grid.spot(13, 36).make_path()  # the same block: the path wins
+    grid.spot(500, 999).make_barrier()  # block (100, 199)
+    renderer.draw()
+    assert renderer.image.get_at((2, 7))[:3] == PALETTE[PATH]
+    assert win.get_at((2, 7))[:3] == PALETTE[PATH]
+    assert win.get_at((100, 199))[:3] == PALETTE[BARRIER]
+
+    grid.reset(clear_barriers=True)
+    renderer.draw()
+    assert win.get_at((100, 199))[:3] != PALETTE[BARRIER], "a bulk change should rebuild the image"
+
+    print("Test passed: far zoom draws blocks of cells from a downsampled image.")
+
+test_fit_and_clicks()
+test_culling()
+test_far_zoom_image()
@@ -0,0 +1,118 @@
+'''Tests for search replay: a recording must match the search it came from, and playing it back must reach the same grid as the live visualizer, forwards and backwards, at any speed. Runs headless on SDL's dummy video driver.'''
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import pygame
+from algorithms.a_star import a_star_search
+from algorithms.jps import jps_search
+from algorithms.engine import run_visual
+from algorithms.stats import record, load_trace
+from benchmarks.maps import random_obstacles
+from components.grid import Grid
+from components.replay import Replay, BAR_HEIGHT
+from components.state import CLOSED
+
+pygame.init()
+
+def make_grid(size=40):
+    cells = random_obstacles(size, seed=3, density=0.25)
+    cells[0] = cells[-1] = 0
+    grid = Grid(size, 400, cells=cells)
+    start, end = grid.spot(0, 0), grid.spot(size - 1, size - 1)
+    start.make_start()
+    end.make_end()
+    return grid, start, end
+
+def test_record():
+    grid, start, end = make_grid()
+    for search, instrumented in ((a_star_search, True), (jps_search, False)):
+        events = []
+        expected = search(grid.grid_map, start.get_pos(), end.get_pos(), lambda index, state: events.append((index, state)))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "search.trace")
+            result, stats = record(search, grid.grid_map, start.get_pos(), end.get_pos(), instrumented, path)
+            assert result == expected and list(stats.events()) == events, search.__name__
+            assert stats.expansions == result.expansions and stats.search_ns > 0 and stats.draw_ns == 0
+            assert list(load_trace(path).events()) == events
+
+    print("Test passed: a recording holds the search's result and every event it reported.")
+
+def test_replay_matches_live():
+    win = pygame.display.set_mode((400, 400))
+    grid, start, end = make_grid()
+    initial = grid.state.tobytes()
+    run_visual(a_star_search, lambda: None, grid, start, end)
+    live = grid.state.tobytes()
+
+    grid.clear_path()
+    assert grid.state.tobytes() == initial
+    _, stats = record(a_star_search, grid.grid_map, start.get_pos(), end.get_pos(), True)
+    replay = Replay(grid, win, stats.indices, stats.states, (start.index, end.index))
+    assert 0 < len(replay) < len(stats.states), "the endpoints' events should be skipped"
+    replay.seek(len(replay))
+    assert grid.state.tobytes() == live
+    replay.seek(len(replay) // 3)
+    replay.seek(0)
+    assert grid.state.tobytes() == initial, "seeking back should undo every event"
+
+    replay.fps = 0
+    replay.speed = 7
+    frames = 0
+    while replay.playing:
+        replay.advance()
+        frames += 1
+    assert frames == -(-len(replay) // 7) and grid.state.tobytes() == live
+
+    print("Test passed: a replay ends where the live search did and rewinds to where it started.")
+
+def test_controls():
+    win = pygame.display.set_mode((400, 400))
+    grid, start, end = make_grid()
+    _, stats = record(a_star_search, grid.grid_map, start.get_pos(), end.get_pos())
+    replay = Replay(grid, win, stats.indices, stats.states, (start.index, end.index))
+
+    def key(key):
+        return replay.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    assert key(pygame.K_SPACE) and not replay.playing
+    assert key(pygame.K_PERIOD) and key(pygame.K_PERIOD) and key(pygame.K_COMMA) and replay.position == 1
+    assert key(pygame.K_RIGHTBRACKET) and replay.position == 1 + len(replay) // 10
+    assert key(pygame.K_END) and replay.position == len(replay)
+    assert key(pygame.K_SPACE) and replay.playing and replay.position == 0, "playing at the end should restart"
+    assert key(pygame.K_4) and replay.speed == 1000
+    assert not key(pygame.K_a), "other keys are left to the caller"
+
+    pygame.mouse.set_pos((200, 400 - BAR_HEIGHT // 2))
+    replay.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(200, 400 - BAR_HEIGHT // 2)))
+    if replay.scrubbing:
+        # The dummy driver does not always report mouse buttons; only check the seek when it does.
+        assert not replay.playing and replay.position == round(len(replay) / 2)
+    replay.handle_event(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=(200, 400 - BAR_HEIGHT // 2)))
+    assert not replay.scrubbing
+    replay.draw_bar()
+
+    assert key(pygame.K_ESCAPE) and replay.closed and replay.position == len(replay) and grid.redraw_all
+
+    print("Test passed: the replay keys step, jump, restart, change speed and close.")
+
+def test_walls_survive_stale_replay():
+    win = pygame.display.set_mode((400, 400))
+    grid, start, end = make_grid()
+    _, stats = record(a_star_search, grid.grid_map, start.get_pos(), end.get_pos())
+    explored = next(index for index, state in stats.events() if state == CLOSED and index != start.index)
+    grid.spot(*grid.grid_map.position(explored)).make_barrier()
+    replay = Replay(grid, win, stats.indices, stats.states, (start.index, end.index))
+    replay.close()
+    grid.clear_path()
+    assert grid.spot(*grid.grid_map.position(explored)).is_barrier(), "a replay should never erase a wall"
+
+    print("Test passed: walls drawn after a recording survive its replay.")
+
+test_record()
+test_replay_matches_live()
+test_controls()
+test_walls_survive_stale_replay()
@@ -0,0 +1,84 @@
+'''Tests for single-source shortest-path trees: every lookup must match a fresh Dijkstra search from the same source.'''
+import os
+import random
+import sys
+from array import array
+from math import isclose
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, BARRIER, PATH
+from algorithms.dijkstra import dijkstra_search
+from algorithms.shortest_path_tree import UNREACHABLE, shortest_path_tree
+from benchmarks.maps import random_obstacles, maze
+
+def test_matches_dijkstra():
+    for seed in range(20):
+        rng = random.Random(seed)
+        size = rng.randint(1, 15)
+        for cells in (random_obstacles(size, seed, density=0.3), maze(size, seed)):
+            grid_map = GridMap(cells, size, size)
+            free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+            if not free:
+                continue
+            start = grid_map.position(rng.choice(free))
+            tree = shortest_path_tree(grid_map, start)
+            for index in range(size * size):
+                end = grid_map.position(index)
+                if grid_map.is_blocked(index):
+                    assert tree.distance[index] == UNREACHABLE and tree.path_to(end) is None
+                    continue
+                expected = dijkstra_search(grid_map, start, end)
+                path, cost, expansions = tree.search(end)
+                assert cost == expected.cost and expansions == 0, f"seed {seed}, {start}->{end}"
+                if path is not None:
+                    assert path[0] == start and path[-1] == end and len(path) - 1 == cost
+                    for (row1, col1), (row2, col2) in zip(path, path[1:]):
+                        assert abs(row1 - row2) + abs(col1 - col2) == 1
+                        assert not grid_map.is_blocked(row2 * size + col2)
+
+    print("Test passed: shortest-path tree lookups match Dijkstra.")
+
+def test_lookup_reports_path_and_goes_stale():
+    grid_map = GridMap(bytearray(25), 5, 5)
+    tree = shortest_path_tree(grid_map, (0, 0))
+    seen = []
+    assert len(tree.path_to((4, 4), lambda index, state: seen.append(state))) == 9
+    assert seen == [PATH] * 7 and tree.expansions == 25
+
+    grid_map.cells[12] = BARRIER
+    grid_map.changed(12)
+    try:
+        tree.path_to((4, 4))
+    except ValueError:
+        pass
+    else:
+        assert False, "a tree built before an edit should refuse lookups"
+
+    print("Test passed: lookups report the path and refuse to run on an edited map.")
+
+def test_terrain_and_movement():
+    size = 20
+    rng = random.Random(3)
+    cells = random_obstacles(size, 5, density=0.2)
+    costs = array("B", (rng.choice((1, 2, 9)) for _ in range(size * size)))
+    for grid_map in (GridMap(cells, size, size, costs), GridMap(cells, size, size, diagonal=True),
+                     GridMap(cells, size, size, costs, diagonal=True, corner_cutting=True, diagonal_cost=1)):
+        start = grid_map.position(next(index for index in range(size * size) if not grid_map.is_blocked(index)))
+        tree = shortest_path_tree(grid_map, start)
+        for index in range(size * size):
+            expected = dijkstra_search(grid_map, start, grid_map.position(index)).cost
+            cost = tree.distance_to(grid_map.position(index))
+            assert (cost is None) == (expected is None) and (cost is None or isclose(cost, expected)), index
+
+    for diagonal_cost in (1, 1.0, 2.0):
+        grid_map = GridMap(bytearray(9), 3, 3, diagonal=True, diagonal_cost=diagonal_cost)
+        tree = shortest_path_tree(grid_map, (0, 0))
+        assert tree.distance.typecode == "q" and tree.distance_to((2, 2)) == 2 * diagonal_cost
+        assert tree.distance_to((2, 2)) == dijkstra_search(grid_map, (0, 0), (2, 2)).cost
+
+    print("Test passed: trees follow the map's terrain costs and movement mode.")
+
+test_matches_dijkstra()
+test_lookup_reports_path_and_goes_stale()
+test_terrain_and_movement()
@@ -0,0 +1,54 @@
+'''Tests for cold starts: headless modules must not import pygame, searches must only load when they are asked for, importing main must not open a window, and a batch worker must import what it needs within its budget.'''
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds a fresh interpreter may spend importing what a batch worker needs: the batch module and its search.
+# Only the import time the child measures itself is checked; process start-up depends on the machine's load.
+IMPORT_BUDGET = 1.0
+HEADLESS = ("algorithms.batch", "algorithms.engine", "algorithms.registry", "algorithms.stats", "components.grid",
+            "components.mapio", "components.terrain", "benchmarks.suite")
+
+def fresh(code):
+    """Runs `code` in a new interpreter from the repository root and returns what it prints as JSON."""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                            timeout=60, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def test_headless_imports():
+    for module in HEADLESS:
+        loaded = fresh(f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))")
+        assert "pygame" not in loaded, f"{module} should not import pygame"
+
+    loaded = fresh("import json, sys, algorithms.batch; from algorithms.registry import get_search; get_search('bfs');"
+                   "print(json.dumps(sorted(sys.modules)))")
+    assert "algorithms.bfs" in loaded
+    for other in ("algorithms.a_star", "algorithms.jps", "algorithms.hpa", "algorithms.landmarks", "algorithms.wavefront"):
+        assert other not in loaded, f"{other} should only be imported when it is selected"
+
+    print("Test passed: headless modules leave pygame alone and searches load on demand.")
+
+def test_main_import():
+    state = fresh("import json, sys, main; import pygame;"
+                  "print(json.dumps([pygame.display.get_init(), 'algorithms.landmarks' in sys.modules]))")
+    assert state == [False, False], "importing main should neither open a window nor load the searches"
+
+    print("Test passed: importing main has no side effects.")
+
+def test_worker_budget():
+    code = ("import json, time; began = time.perf_counter(); import algorithms.batch;"
+            "from algorithms.registry import get_search; get_search('a_star');"
+            "print(json.dumps(time.perf_counter() - began))")
+    imports = sorted(fresh(code) for _ in range(3))
+    print(f"Batch worker imports: {imports[1] * 1000:.0f} ms (median of 3)")
+    assert imports[1] < IMPORT_BUDGET, f"a batch worker spent {imports[1]:.2f} s importing, over the {IMPORT_BUDGET} s budget"
+
+    print("Test passed: a batch worker imports within its budget.")
+
+test_headless_imports()
+test_main_import()
+test_worker_budget()
@@ -0,0 +1,91 @@
+'''Tests for search instrumentation: A*, Dijkstra and BFS must count expansions the same way, fill in a SearchStats consistently, and round-trip their event traces.'''
+import os
+import random
+import sys
+import tempfile
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap, CLOSED
+from algorithms.a_star import a_star_search
+from algorithms.dijkstra import dijkstra_search
+from algorithms.bfs import bfs_search
+from algorithms.stats import SearchStats, load_trace
+from benchmarks.maps import random_obstacles
+
+SEARCHES = (a_star_search, dijkstra_search, bfs_search)
+
+def test_expansions_agree():
+    corridor = GridMap(bytearray(5), 1, 5)
+    grid_map = GridMap(bytearray(25), 5, 5)
+    for search in SEARCHES:
+        assert search(corridor, (0, 2), (0, 2)).expansions == 0, search.__name__
+        assert search(corridor, (0, 0), (0, 1)).expansions == 1, search.__name__
+        assert search(corridor, (0, 0), (0, 4)).expansions == 4, search.__name__
+        closed = []
+        result = search(grid_map, (0, 0), (4, 4), lambda index, state: state == CLOSED and closed.append(index))
+        assert result.expansions == len(closed), f"{search.__name__} should count the cells it closes"
+
+    print("Test passed: every search counts expanded cells, without the goal.")
+
+def test_counters():
+    size = 60
+    rng = random.Random(0)
+    cells = random_obstacles(size, seed=4, density=0.25)
+    cells[0] = cells[-1] = 0
+    costs = array("B", (rng.choice((1, 2, 5, 9)) for _ in range(size * size)))
+    for grid_map in (GridMap(cells, size, size), GridMap(cells, size, size, costs), GridMap(cells, size, size, diagonal=True)):
+        for search in SEARCHES:
+            stats = SearchStats()
+            events = []
+            result = search(grid_map, (0, 0), (size - 1, size - 1), lambda index, state: events.append(state), stats=stats)
+            assert result == search(grid_map, (0, 0), (size - 1, size - 1)), "stats must not change the result"
+            assert stats.expansions == result.expansions == events.count(CLOSED)
+            assert stats.pushes > stats.expansions and 0 < stats.max_frontier < stats.pushes
+            assert 0 <= stats.stale_pops <= stats.decrease_keys < stats.pushes
+            assert stats.search_ns > 0 and stats.draw_ns > 0
+            if search is bfs_search:
+                assert stats.decrease_keys == 0
+        if grid_map.costs is not None:
+            # A* expands by estimated total cost, so terrain makes it find cheaper ways to queued cells.
+            stats = SearchStats()
+            a_star_search(grid_map, (0, 0), (size - 1, size - 1), stats=stats)
+            assert stats.decrease_keys > 0 and stats.stale_pops > 0
+
+    total = SearchStats()
+    grid_map = GridMap(cells, size, size)
+    first = a_star_search(grid_map, (0, 0), (size - 1, size - 1), stats=total).expansions
+    second = a_star_search(grid_map, (size - 1, 0), (0, size - 1), stats=total).expansions
+    assert total.expansions == first + second and total.draw_ns == 0
+
+    print("Test passed: the counters agree with the search and with each other.")
+
+def test_trace_round_trip():
+    grid_map = GridMap(random_obstacles(30, seed=2, density=0.2), 30, 30)
+    stats = SearchStats(trace=True)
+    result = a_star_search(grid_map, (0, 0), (29, 29), stats=stats)
+    events = list(stats.events())
+    assert sum(state == CLOSED for _, state in events) == result.expansions
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "search.trace")
+        stats.export(path)
+        assert os.path.getsize(path) == 8 + 72 + 5 * len(events)
+        loaded = load_trace(path)
+        assert list(loaded.events()) == events and (loaded.rows, loaded.cols) == (30, 30)
+        assert (loaded.expansions, loaded.pushes, loaded.search_ns) == (stats.expansions, stats.pushes, stats.search_ns)
+
+        with open(path, "r+b") as file:
+            file.truncate(100)
+        try:
+            load_trace(path)
+        except ValueError:
+            pass
+        else:
+            assert False, "a truncated trace should be rejected"
+
+    print("Test passed: traces are written and read back event for event.")
+
+test_expansions_agree()
+test_counters()
+test_trace_round_trip()
@@ -0,0 +1,135 @@
+'''Tests for the terrain cost layer: Dijkstra and A* must find the cheapest path under it, and the layer must survive a save and load.'''
+import heapq
+import os
+import random
+import sys
+import tempfile
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap
+from algorithms.a_star import a_star_search
+from algorithms.dijkstra import dijkstra_search
+from algorithms.cache import PathCache
+from components.grid import Grid
+from components.terrain import MAGIC, HEADER, save_costs, load_costs
+from benchmarks.maps import random_obstacles
+
+def cheapest(grid_map, start, end):
+    '''Reference Dijkstra on a plain heap, stepping into a cell costs its terrain value.'''
+    source, target = grid_map.index(start), grid_map.index(end)
+    distance = {source: 0}
+    queue = [(0, source)]
+    while queue:
+        d, current = heapq.heappop(queue)
+        if current == target:
+            return d
+        if d > distance[current]:
+            continue
+        for neighbor in grid_map.neighbors(current):
+            nd = d + grid_map.costs[neighbor]
+            if nd < distance.get(neighbor, float("inf")):
+                distance[neighbor] = nd
+                heapq.heappush(queue, (nd, neighbor))
+    return None
+
+def test_cheapest_paths():
+    for seed in range(40):
+        rng = random.Random(seed)
+        size = rng.randint(2, 20)
+        typecode, top = ("H", 1000) if seed % 2 else ("B", rng.randint(1, 20))
+        costs = array(typecode, [rng.randint(1, top) for _ in range(size * size)])
+        grid_map = GridMap(random_obstacles(size, seed, density=0.2), size, size, costs)
+        free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+        start, end = grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))
+        expected = cheapest(grid_map, start, end)
+        for search in (dijkstra_search, a_star_search):
+            path, cost, _ = search(grid_map, start, end)
+            assert cost == expected, f"{search.__name__} on seed {seed}: {cost} != {expected}"
+            if path is not None:
+                assert cost == sum(costs[grid_map.index(position)] for position in path[1:])
+
+    print("Test passed: Dijkstra and A* find the cheapest path over terrain.")
+
+def test_grid_cost_edits():
+    grid = Grid(5, 100)
+    cache = PathCache(grid.grid_map)
+    assert cache.search("dijkstra", (0, 0), (0, 4)).cost == 4
+    for col in range(1, 4):
+        grid.spot(0, col).make_terrain(9)
+    assert grid.spot(0, 2).cost == 9 and 2 in grid.dirty
+    assert cache.search("dijkstra", (0, 0), (0, 4)).cost == 6, "the path should detour around the terrain"
+    grid.clear_costs()
+    assert cache.search("a_star", (0, 0), (0, 4)).cost == 4
+
+    print("Test passed: painting terrain on a Grid changes and invalidates the searches.")
+
+def test_cost_range_kept_up_to_date():
+    grid = Grid(5, 100)
+    assert grid.grid_map.cost_range() == (1, 1)
+    grid.spot(0, 1).make_terrain(9)
+    assert grid.grid_map.cost_range() == (1, 9), "the layer created by the first stroke should be seen"
+    grid.spot(0, 2).make_terrain(30)
+    grid.spot(0, 2).make_terrain(3)
+    low, high = grid.grid_map.cost_range()
+    assert low == 1 and high >= 9, "single edits may only widen the range"
+    assert grid.grid_map.cost_range() is grid.grid_map.cost_range(), "queries should not rescan the layer"
+    grid.set_costs(array("H", [500]) * 25)
+    assert grid.grid_map.cost_range() == (500, 500)
+    grid.clear_costs()
+    assert grid.grid_map.cost_range() == (1, 1)
+
+    print("Test passed: the cost range follows edits without rescanning the layer.")
+
+def test_wide_costs():
+    grid = Grid(3, 30)
+    grid.spot(1, 1).make_terrain(9)
+    grid.spot(0, 0).make_terrain(300)
+    assert grid.costs.typecode == "H" and grid.grid_map.costs.format == "H"
+    assert (grid.get_cost(0), grid.get_cost(4), grid.get_cost(8)) == (300, 9, 1)
+    assert grid.grid_map.cost_range() == (1, 300)
+    assert dijkstra_search(grid.grid_map, (0, 1), (0, 0)).cost == 300
+    for cost in (0, 65536):
+        try:
+            grid.set_cost(2, cost)
+        except ValueError:
+            pass
+        else:
+            assert False, f"a cost of {cost} should be rejected"
+
+    print("Test passed: the terrain layer widens to 16 bits for costs above 255.")
+
+def test_save_and_load():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "terrain.cost")
+        for typecode, top in (("B", 255), ("H", 65535)):
+            costs = array(typecode, [rng.randint(1, top) for _ in range(12)])
+            save_costs(path, costs, 3, 4)
+            assert load_costs(path) == (costs, 3, 4)
+        with open(path, "wb") as file:
+            file.write(b"not a cost file")
+        try:
+            load_costs(path)
+        except ValueError:
+            pass
+        else:
+            assert False, "a file without the header should be rejected"
+        for data in (MAGIC + b"B\1", MAGIC + HEADER.pack(b"d", 1, 1) + bytes(8)):
+            with open(path, "wb") as file:
+                file.write(data)
+            try:
+                load_costs(path)
+            except ValueError:
+                pass
+            else:
+                assert False, "a truncated header or an unknown typecode should be rejected"
+
+    print("Test passed: cost layers survive a save and load.")
+
+test_cheapest_paths()
+test_grid_cost_edits()
+test_cost_range_kept_up_to_date()
+test_wide_costs()
+test_save_and_load()
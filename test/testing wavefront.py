@@ -0,0 +1,62 @@
+'''Tests for the NumPy wavefront: the distance field must agree with BFS costs and the descended path must be a valid shortest path.'''
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.engine import GridMap
+from algorithms.bfs import bfs_search
+from algorithms.wavefront import UNREACHABLE, distance_field, wavefront_search
+from benchmarks.maps import random_obstacles, maze
+
+def test_distance_field_matches_bfs():
+    for seed in range(40):
+        rng = random.Random(seed)
+        rows, cols = rng.randint(1, 15), rng.randint(1, 15)
+        cells = bytearray(1 if rng.random() < 0.3 else 0 for _ in range(rows * cols))
+        grid_map = GridMap(cells, rows, cols)
+        free = [index for index in range(rows * cols) if not grid_map.is_blocked(index)]
+        if not free:
+            continue
+        start = grid_map.position(rng.choice(free))
+        field = distance_field(grid_map, start)
+        assert field.shape == (rows, cols)
+        for index in range(rows * cols):
+            position = grid_map.position(index)
+            expected = None if grid_map.is_blocked(index) else bfs_search(grid_map, start, position).cost
+            assert field[position] == (UNREACHABLE if expected is None else expected), f"seed {seed}, cell {position}"
+
+    print("Test passed: the wavefront distance field matches BFS.")
+
+def test_paths():
+    for seed in range(20):
+        rng = random.Random(seed)
+        size = rng.randint(2, 25)
+        for cells in (random_obstacles(size, seed, density=0.3), maze(size, seed)):
+            grid_map = GridMap(cells, size, size)
+            free = [index for index in range(size * size) if not grid_map.is_blocked(index)]
+            start, end = grid_map.position(rng.choice(free)), grid_map.position(rng.choice(free))
+            path, cost, _ = wavefront_search(grid_map, start, end)
+            assert cost == bfs_search(grid_map, start, end).cost
+            if path is None:
+                continue
+            assert path[0] == start and path[-1] == end and len(path) - 1 == cost
+            for (row1, col1), (row2, col2) in zip(path, path[1:]):
+                assert abs(row1 - row2) + abs(col1 - col2) == 1
+                assert not grid_map.is_blocked(row2 * size + col2)
+
+    print("Test passed: wavefront paths are valid shortest paths.")
+
+def test_blocked_start():
+    cells = bytearray(9)
+    cells[4] = 1
+    grid_map = GridMap(cells, 3, 3)
+    assert (distance_field(grid_map, (1, 1)) == UNREACHABLE).all()
+    assert wavefront_search(grid_map, (1, 1), (0, 0)) == (None, None, 0)
+
+    print("Test passed: a blocked start reaches nothing.")
+
+test_distance_field_matches_bfs()
+test_paths()
+test_blocked_start()